@@ -1,41 +1,52 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
 from PIL import Image
 import re
-import difflib
 from typing import List, Dict, Any, Optional
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 import io
 import base64
 import json
 import time
+from urllib.parse import quote
 from pydantic import BaseModel
 import logging
-from dotenv import load_dotenv
 import os
+from startup import load_env, check_credentials, Readiness
+from log_config import setup_logging, SAMPLED
+import image_analyzer
 from image_analyzer import ImageAnalyzer
+from score_history import ScoreHistoryStore, validate_game_date
+from image_catalog import ImageCatalog
+from thumbnail_cache import ThumbnailCache, parse_range_header
+from retention import RetentionPolicy, ArchiveStore, IOActivityGate, RetentionCompactor
+from ocr_batcher import OCRBatcher, use_batcher
+import metrics
+from metrics import span
+import ocr_deadline
+from ocr_deadline import request_deadline, DEFAULT_BUDGET_SECONDS
+from ocr_breaker import vision_breaker
+from local_ocr import get_local_engine
+from result_cache import result_cache
+from ocr_blocks import BlockTable
+from header_detector import header_detector
+from score_reader import score_reader
+from layout_cache import layout_cache
+from name_matcher import MIN_CONFIDENCE
+from name_scorers import create_scorer, DEFAULT_SCORER, NameScorer
+from club_members import ClubMemberStore, ClubDirectory, current_club, is_valid_club_id, split_club_prefix, DEFAULT_CLUB
 
-# .env 파일 로드
-load_dotenv()
+# .env 파일 로드 (프로세스당 1회)
+load_env()
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO)
+# 로깅 설정 (큐 기반 비동기 출력, 단계별 레벨은 BOWLING_LOG_LEVELS)
+setup_logging()
 logger = logging.getLogger(__name__)
 
-# 환경 변수 확인
-credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-if credentials_path:
-    # ~ 확장
-    credentials_path = os.path.expanduser(credentials_path)
-    logger.info(f"Google Cloud 인증 파일 경로: {credentials_path}")
-    if os.path.exists(credentials_path):
-        logger.info("Google Cloud 인증 파일이 존재합니다.")
-    else:
-        logger.warning("Google Cloud 인증 파일이 존재하지 않습니다.")
-else:
-    logger.warning("GOOGLE_APPLICATION_CREDENTIALS 환경 변수가 설정되지 않았습니다.")
-
 app = FastAPI(title="볼링 스코어보드 인식 API", version="1.0.0")
 
 # CORS 설정
@@ -48,15 +59,13 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
 # 데이터 모델
 class OCRRequest(BaseModel):
     image_data: str
     language: str = "kor+eng"
     preprocessing: str = "auto"
+    lane: Optional[int] = None
+    game_date: Optional[str] = None
 
 class ScoreData(BaseModel):
     original_name: str
@@ -84,6 +93,9 @@ class BowlingScoreRecognizer:
     def __init__(self):
         # 이미지 분석기 초기화
         self.image_analyzer = ImageAnalyzer("uploads")
+        # 이름 유사도 계산기 (BOWLING_NAME_SCORER, name_scorer_evaluation.py로 비교)
+        self.name_scorer = create_scorer(DEFAULT_SCORER)
+        logger.info("이름 유사도 계산기: %s", self.name_scorer.name)
         logger.info("BowlingScoreRecognizer 초기화 완료")
         
     def analyze_image(self, image: Image.Image, original_filename: str = None, preprocessing: str = "auto") -> Dict[str, Any]:
@@ -97,141 +109,102 @@ class BowlingScoreRecognizer:
             blocks = ocr_result['blocks']
             method = ocr_result.get('method', 'unknown')
             
-            logger.info(f"사용된 OCR 방법: {method}")
-            logger.info(f"OCR 텍스트: {text}")
-            logger.info(f"OCR 블록 수: {len(blocks)}")
+            logger.info("사용된 OCR 방법: %s", method)
+            logger.debug("OCR 텍스트: %s", text, extra=SAMPLED)
+            logger.info("OCR 블록 수: %s", len(blocks))
             
             # 블록들을 Y 좌표로 정렬 (위에서 아래로)
-            sorted_blocks = sorted(blocks, key=lambda x: x['bbox'][1])
-            logger.info(f"정렬된 블록 수: {len(sorted_blocks)}")
+            sorted_blocks = BlockTable.coerce(blocks).sorted_by(1)
+            logger.debug("정렬된 블록 수: %s", len(sorted_blocks))
             
             # 프레임 헤더 찾기 (1,2,3...10이 포함된 블록들)
-            frame_headers = []
-            for block in sorted_blocks:
-                text = block['text'].strip()
-                # 1-10 숫자가 포함된 블록 찾기
-                if any(str(i) in text for i in range(1, 11)):
-                    frame_headers.append(block)
-                    logger.info(f"프레임 헤더 발견: {text}")
-            
-            if not frame_headers:
+            header_mask = sorted_blocks.frame_digit_mask()
+            if not header_mask.any():
                 logger.warning("프레임 헤더를 찾을 수 없습니다.")
                 return []
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("프레임 헤더 발견: %s", [text for text, is_header in zip(sorted_blocks.texts, header_mask) if is_header])
             
             # 프레임 헤더의 Y 좌표 범위 계산
-            header_y_min = min(block['bbox'][1] for block in frame_headers)
-            header_y_max = max(block['bbox'][3] for block in frame_headers)
-            logger.info(f"헤더 Y 범위: {header_y_min} - {header_y_max}")
+            header_y_min = float(sorted_blocks.y1[header_mask].min())
+            header_y_max = float(sorted_blocks.y2[header_mask].max())
+            logger.info("헤더 Y 범위: %s - %s", header_y_min, header_y_max)
             
             # 헤더 아래의 데이터 블록들 찾기
-            data_blocks = []
-            for block in sorted_blocks:
-                if block['bbox'][1] > header_y_max:  # 헤더 아래에 있는 블록들
-                    data_blocks.append(block)
-                    logger.info(f"데이터 블록: {block['text']} at Y={block['bbox'][1]}")
+            data_blocks = sorted_blocks.take(sorted_blocks.y1 > header_y_max)
+            logger.debug("데이터 블록 수: %s", len(data_blocks))
             
             # 데이터 블록들을 행으로 그룹화
             rows = self._group_blocks_into_rows(data_blocks)
-            logger.info(f"분석된 행 수: {len(rows)}")
+            logger.info("분석된 행 수: %s", len(rows))
             
             parsed_data = []
             for row_idx, row_blocks in enumerate(rows):
-                if not row_blocks:
+                if not len(row_blocks):
                     continue
                 
                 # 행 블록들을 X 좌표로 정렬 (왼쪽에서 오른쪽으로)
-                sorted_row = sorted(row_blocks, key=lambda x: x['bbox'][0])
-                logger.info(f"행 {row_idx + 1} 블록들: {[b['text'] for b in sorted_row]}")
+                sorted_row = row_blocks.sorted_by(0)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("행 %s 블록들: %s", row_idx + 1, sorted_row.texts)
                 
                 if len(sorted_row) < 2:
                     continue
                 
                 # 첫 번째 블록 (이름)
-                name_block = sorted_row[0]
-                name_text = name_block['text'].strip()
+                name_text = sorted_row.texts[0].strip()
                 
                 # 마지막 블록 (총점)
-                total_score_block = sorted_row[-1]
-                total_score_text = total_score_block['text'].strip()
+                total_score_text = sorted_row.texts[-1].strip()
                 
                 # 총점이 숫자인지 확인
                 if not total_score_text.isdigit():
-                    logger.warning(f"총점이 숫자가 아님: {total_score_text}")
+                    logger.warning("총점이 숫자가 아님: %s", total_score_text)
                     continue
                 
                 # 중간 점수들 추출 (2번째부터 마지막-1까지)
                 frame_scores = []
-                for block in sorted_row[1:-1]:
-                    score_text = block['text'].strip()
+                for score_text in sorted_row.texts[1:-1]:
+                    score_text = score_text.strip()
                     if score_text.isdigit():
                         frame_scores.append(int(score_text))
                 
-                logger.info(f"이름: {name_text}, 프레임 점수: {frame_scores}, 총점: {total_score_text}")
+                logger.debug("이름: %s, 프레임 점수: %s, 총점: %s", name_text, frame_scores, total_score_text)
                 
                 parsed_item = {
                     'original_name': name_text,
                     'scores': frame_scores,
                     'total': int(total_score_text),
-                    'confidence': name_block['confidence']
+                    'confidence': float(sorted_row.confidences[0])
                 }
                 
                 parsed_data.append(parsed_item)
-                logger.info(f"파싱된 항목: {parsed_item}")
+                logger.debug("파싱된 항목: %s", parsed_item, extra=SAMPLED)
             
-            logger.info(f"최종 파싱된 데이터 수: {len(parsed_data)}")
+            logger.info("최종 파싱된 데이터 수: %s", len(parsed_data))
             return parsed_data
             
         except Exception as e:
-            logger.error(f"Scoreboard parsing error: {e}")
+            logger.error("Scoreboard parsing error: %s", e)
             import traceback
-            logger.error(f"스택 트레이스: {traceback.format_exc()}")
+            logger.error("스택 트레이스: %s", traceback.format_exc())
             return []
     
-    def _group_blocks_into_rows(self, blocks, y_tolerance=20):
+    def _group_blocks_into_rows(self, blocks, y_tolerance=20) -> List[BlockTable]:
         """블록들을 행으로 그룹화합니다."""
-        if not blocks:
-            return []
-        
-        # Y 좌표로 정렬
-        sorted_blocks = sorted(blocks, key=lambda x: x['bbox'][1])
-        
-        rows = []
-        current_row = []
-        current_y = None
-        
-        for block in sorted_blocks:
-            y_center = (block['bbox'][1] + block['bbox'][3]) / 2
-            
-            if current_y is None:
-                current_y = y_center
-                current_row.append(block)
-            elif abs(y_center - current_y) <= y_tolerance:
-                # 같은 행에 속함
-                current_row.append(block)
-            else:
-                # 새로운 행 시작
-                if current_row:
-                    rows.append(current_row)
-                current_row = [block]
-                current_y = y_center
-        
-        # 마지막 행 추가
-        if current_row:
-            rows.append(current_row)
-        
-        return rows
+        return BlockTable.coerce(blocks).group_rows(y_tolerance)
     
-    def match_names(self, parsed_data: List[Dict[str, Any]], member_list: List[str]) -> List[ScoreData]:
-        """이름 매칭"""
+    def match_names(self, parsed_data: List[Dict[str, Any]], member_list: List[str],
+                    scorer: Optional[NameScorer] = None) -> List[ScoreData]:
+        """이름 매칭 (스코어보드의 모든 이름을 한 번에 계산해 회원과 일대일 배정, scorer는 클럽별 계산기)"""
         try:
             matched_results = []
+            original_names = [data['original_name'] for data in parsed_data]
+            best_matches = (scorer or self.name_scorer).assign(original_names, member_list, MIN_CONFIDENCE)
             
-            for data in parsed_data:
-                original_name = data['original_name']
-                best_match = self.find_best_name_match(original_name, member_list)
-                
+            for data, best_match in zip(parsed_data, best_matches):
                 matched_results.append(ScoreData(
-                    original_name=original_name,
+                    original_name=data['original_name'],
                     matched_name=best_match['name'],
                     scores=data['scores'],
                     total=data['total'],
@@ -242,62 +215,279 @@ class BowlingScoreRecognizer:
             return matched_results
             
         except Exception as e:
-            logger.error(f"Name matching error: {e}")
+            logger.error("Name matching error: %s", e)
             return []
     
-    def find_best_name_match(self, target_name: str, member_list: List[str]) -> Dict[str, Any]:
-        """최적의 이름 매칭 찾기"""
+    def find_best_name_match(self, target_name: str, member_list: List[str],
+                             scorer: Optional[NameScorer] = None) -> Dict[str, Any]:
+        """최적의 이름 매칭 찾기 (신뢰도가 너무 낮으면 원본 이름 유지)"""
         try:
-            best_match = {'name': target_name, 'confidence': 0.0}
-            
-            for member_name in member_list:
-                # 기본 문자열 유사도
-                similarity = difflib.SequenceMatcher(None, target_name, member_name).ratio()
-                
-                # 한글 자모 분해 유사도
-                jamo_similarity = self.calculate_hangul_similarity(target_name, member_name)
-                
-                # 최종 유사도 (가중 평균)
-                final_similarity = (similarity * 0.6) + (jamo_similarity * 0.4)
-                
-                if final_similarity > best_match['confidence']:
-                    best_match = {'name': member_name, 'confidence': final_similarity}
-            
-            # 신뢰도가 너무 낮으면 원본 이름 유지
-            if best_match['confidence'] < 0.3:
-                best_match = {'name': target_name, 'confidence': 0.0}
-            
-            return best_match
+            return (scorer or self.name_scorer).best_matches([target_name], member_list, MIN_CONFIDENCE)[0]
             
         except Exception as e:
-            logger.error(f"Name matching error: {e}")
+            logger.error("Name matching error: %s", e)
             return {'name': target_name, 'confidence': 0.0}
     
-    def calculate_hangul_similarity(self, str1: str, str2: str) -> float:
-        """한글 자모 분해 기반 유사도 계산"""
-        try:
-            # 간단한 한글 유사도 계산 (초성, 중성, 종성 고려)
-            def decompose_hangul(char):
-                if '가' <= char <= '힣':
-                    code = ord(char) - ord('가')
-                    cho = code // 588
-                    jung = (code % 588) // 28
-                    jong = code % 28
-                    return f"{cho}_{jung}_{jong}"
-                return char
-            
-            decomposed1 = ''.join(decompose_hangul(c) for c in str1)
-            decomposed2 = ''.join(decompose_hangul(c) for c in str2)
-            
-            return difflib.SequenceMatcher(None, decomposed1, decomposed2).ratio()
-            
-        except Exception as e:
-            logger.error(f"Hangul similarity calculation error: {e}")
-            return 0.0
+    def top_name_matches(self, target_name: str, member_list: List[str], k: int = 5,
+                         scorer: Optional[NameScorer] = None) -> List[Dict[str, Any]]:
+        """후보 회원 상위 k명과 유사도"""
+        return [{'name': name, 'confidence': confidence}
+                for name, confidence in (scorer or self.name_scorer).candidates([target_name], member_list, k)[0]]
 
 # 전역 인식기 인스턴스
 recognizer = BowlingScoreRecognizer()
 
+# 업로드 이미지 인덱스
+image_catalog = ImageCatalog("uploads")
+
+# 썸네일 캐시 (nginx X-Accel-Redirect 사용 시 BOWLING_THUMBNAIL_ACCEL_PREFIX 설정)
+thumbnail_cache = ThumbnailCache(
+    {"uploads": "uploads", "analyzed": "analyzed"},
+    cache_dir="cache/thumbnails",
+    max_bytes=int(os.getenv("BOWLING_THUMBNAIL_CACHE_MB", "512")) * 1024 * 1024
+)
+THUMBNAIL_ACCEL_PREFIX = os.getenv("BOWLING_THUMBNAIL_ACCEL_PREFIX")
+if THUMBNAIL_ACCEL_PREFIX:
+    # nginx 내부 location의 alias가 이 경로와 같아야 함 (ssl-bowling.conf)
+    logger.info("썸네일 X-Accel-Redirect: %s -> %s/", THUMBNAIL_ACCEL_PREFIX, os.path.abspath(thumbnail_cache.cache_dir))
+
+# 게임 기록 저장소
+score_history = ScoreHistoryStore("history/score_history.db")
+
+# 클럽별 회원 목록 (기본 클럽은 MEMBER_NAMES, 매칭 구조는 클럽별로 필요할 때 구축)
+club_directory = ClubDirectory(ClubMemberStore("clubs/club_members.db"), MEMBER_NAMES,
+                               lambda: create_scorer(DEFAULT_SCORER))
+
+# 보관 정책 / 아카이브 (오래된 업로드·분석 이미지를 샤드로 이동)
+io_activity = IOActivityGate()
+archive_store = ArchiveStore(os.getenv("BOWLING_ARCHIVE_DIR", "archive"))
+
+def _on_archived(source: str, filename: str):
+    if source == "uploads":
+        image_catalog.remove(filename)
+
+retention_compactor = RetentionCompactor(
+    {"uploads": "uploads", "analyzed": "analyzed"},
+    archive_store,
+    policy=RetentionPolicy(),
+    activity=io_activity,
+    bytes_per_second=int(os.getenv("BOWLING_RETENTION_BYTES_PER_SEC", str(2 * 1024 * 1024))),
+    on_removed=_on_archived
+)
+
+# 실시간 인식 요청 경로 (처리 중에는 보관 작업이 대기)
+LIVE_IO_PATHS = ("/recognize-scoreboard", "/recognize-base64", "/recognize-batch", "/test-saved-image/")
+
+def request_budget_seconds(request: Request) -> float:
+    """요청 예산: 기본값(BOWLING_REQUEST_BUDGET_SECONDS), 클라이언트가 X-Request-Budget-Ms로 더 짧게 지정 가능"""
+    header = request.headers.get("x-request-budget-ms")
+    try:
+        return min(DEFAULT_BUDGET_SECONDS, float(header) / 1000) if header else DEFAULT_BUDGET_SECONDS
+    except ValueError:
+        return DEFAULT_BUDGET_SECONDS
+
+async def finish_trace_after_stream(body_iterator, trace, route: str, started: float):
+    """스트리밍 응답: 마지막 조각을 보낸 뒤(또는 연결이 끊긴 뒤) 요청 시간 기록"""
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        metrics.finish_request_trace(trace, route, time.perf_counter() - started)
+
+@app.middleware("http")
+async def track_live_io(request: Request, call_next):
+    """인식 요청 처리 중임을 보관 작업에 알림 + 단계별 시간 측정 (Server-Timing 헤더)"""
+    path = request.url.path
+    if not path.startswith(LIVE_IO_PATHS):
+        return await call_next(request)
+    
+    trace = metrics.start_request_trace()
+    started = time.perf_counter()
+    # 배치는 응답을 스트리밍하므로 예산을 이미지별로 적용 (recognize_batch_item)
+    streaming = path.startswith("/recognize-batch")
+    with io_activity.busy():
+        if streaming:
+            response = await call_next(request)
+        else:
+            with request_deadline(request_budget_seconds(request)):
+                response = await call_next(request)
+    if trace is not None:
+        route = next(prefix for prefix in LIVE_IO_PATHS if path.startswith(prefix))
+        if streaming:
+            # 이미지 처리는 스트림을 보내는 동안 진행되고 헤더는 이미 나간 뒤이므로 Server-Timing 없이 종료 시 기록
+            response.body_iterator = finish_trace_after_stream(response.body_iterator, trace, route, started)
+            return response
+        metrics.finish_request_trace(trace, route, time.perf_counter() - started)
+        response.headers["Server-Timing"] = trace.server_timing()
+    return response
+
+@app.middleware("http")
+async def select_club(request: Request, call_next):
+    """클럽 선택: /clubs/{club}/... 경로 접두사 또는 ?club= 파라미터 (없으면 기본 클럽)"""
+    club, path = split_club_prefix(request.url.path)
+    if club is not None:
+        request.scope["path"] = path
+        request.scope["raw_path"] = quote(path).encode()
+    club = club or request.query_params.get("club") or DEFAULT_CLUB
+    if not is_valid_club_id(club):
+        return JSONResponse(status_code=400, content={"detail": f"잘못된 클럽 ID입니다: {club}"})
+    token = current_club.set(club)
+    try:
+        return await call_next(request)
+    finally:
+        current_club.reset(token)
+
+# 시작 단계: 무거운 import, Vision 클라이언트 생성, OCR 예열 (완료 전까지 /ready는 503)
+readiness = Readiness()
+ocr_batcher: Optional[OCRBatcher] = None
+
+def _load_heavy_modules():
+    image_analyzer.cv2.__version__
+    image_analyzer.np.__version__
+    image_analyzer.vision.ImageAnnotatorClient
+
+def _create_ocr_client():
+    check_credentials()
+    if recognizer.image_analyzer.client is None and get_local_engine() is None:
+        raise RuntimeError("Vision 클라이언트를 만들 수 없고 로컬 OCR 엔진도 없습니다 (인증 정보 확인)")
+
+def _warm_up_ocr():
+    client = recognizer.image_analyzer.client
+    if client is None:
+        return
+    if os.getenv("BOWLING_WARMUP_OCR", "1") == "1" and getattr(client, "requires_warmup", True):
+        recognizer.image_analyzer.warm_up()
+
+def _start_ocr_batcher():
+    global ocr_batcher
+    if ocr_batcher is None and recognizer.image_analyzer.client is not None:
+        ocr_batcher = OCRBatcher(recognizer.image_analyzer.client)
+
+STARTUP_STEPS = [
+    ("imports", _load_heavy_modules),
+    ("directories", recognizer.image_analyzer.prepare),
+    ("ocr_client", _create_ocr_client),
+    ("ocr_warmup", _warm_up_ocr),
+    ("ocr_batcher", _start_ocr_batcher),
+]
+
+@app.on_event("startup")
+async def start_background_jobs():
+    readiness.start(STARTUP_STEPS)
+    retention_compactor.start()
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    retention_compactor.stop()
+
+def check_game_date(game_date: Optional[str]):
+    """요청의 게임 날짜 형식 검사 (잘못되면 400)"""
+    if game_date is not None:
+        try:
+            validate_game_date(game_date)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+def save_score_history(matched_data: List[ScoreData], filename: str, member_list: List[str], lane: Optional[int] = None,
+                       game_date: Optional[str] = None):
+    """인식 결과를 요청한 클럽의 게임 기록으로 저장 (실패해도 인식 응답에는 영향 없음)"""
+    try:
+        score_history.add_recognized_games(matched_data, member_list, game_date=game_date, lane=lane,
+                                           source_file=filename, club=current_club.get())
+    except Exception as e:
+        logger.error("게임 기록 저장 오류: %s", e)
+
+def build_recognition_response(analysis_result: Dict[str, Any], filename: str, lane: Optional[int] = None,
+                               game_date: Optional[str] = None) -> OCRResponse:
+    """영역 분석 결과 -> 이름 매칭, 기록 저장, 응답 생성 (인식 엔드포인트 공통)"""
+    # 스코어보드 영역 인식 확인
+    if not analysis_result.get('region_analysis'):
+        logger.warning("스코어보드 헤더(1-10) 인식 안됨")
+        return OCRResponse(
+            success=False,
+            data=[],
+            message="스코어보드 헤더(1-10) 인식 안됨"
+        )
+    
+    # region_analysis 결과 사용 - 이름과 점수 매칭 (부분 인식 지원)
+    region_data = analysis_result['region_analysis']
+    korean_names = region_data.get('name_part', {}).get('korean_names', [])
+    numbers = region_data.get('final_score', {}).get('numbers', [])
+    
+    logger.info("한글 이름: %s", korean_names)
+    logger.info("숫자 점수: %s", numbers)
+    
+    # 부분 인식 결과 생성 (이름과 점수 개수가 달라도 처리)
+    parsed_data = []
+    max_count = max(len(korean_names), len(numbers))
+    
+    for i in range(max_count):
+        name = korean_names[i] if i < len(korean_names) else ""
+        score = numbers[i] if i < len(numbers) else 0
+        
+        parsed_data.append({
+            'original_name': name,
+            'scores': [],  # 프레임별 점수는 별도 추출 필요
+            'total': score,
+            'confidence': 0.9 if name and score else 0.5
+        })
+    
+    logger.debug("부분 인식 결과: %s", parsed_data, extra=SAMPLED)
+    
+    # 이름 매칭 (요청한 클럽의 회원 목록)
+    with span("match_names"):
+        members, scorer = club_directory.matcher(current_club.get())
+        matched_data = recognizer.match_names(parsed_data, members, scorer=scorer)
+    
+    # 게임 기록 저장
+    save_score_history(matched_data, filename, members, lane=lane, game_date=game_date)
+    
+    readiness.mark_recognition()
+    
+    # 부분 인식 메시지 생성
+    name_count = len([d for d in parsed_data if d['original_name']])
+    score_count = len([d for d in parsed_data if d['total'] > 0])
+    total_count = len(parsed_data)
+    
+    if name_count == score_count == total_count:
+        message = f"{total_count}개의 스코어 데이터를 완전히 인식했습니다."
+    else:
+        message = f"부분 인식: 이름 {name_count}개, 점수 {score_count}개 (총 {total_count}개)"
+    
+    return OCRResponse(
+        success=True,
+        data=matched_data,
+        message=message
+    )
+
+# 배치 인식: 이미지별 파이프라인 병렬 실행 + Vision 요청 묶음 호출
+BATCH_MAX_IMAGES = 30
+batch_executor = ThreadPoolExecutor(max_workers=int(os.getenv("BOWLING_BATCH_WORKERS", "8")), thread_name_prefix="batch")
+
+def recognize_batch_item(index: int, original_name: str, image_data: bytes, filename: str, preprocessing: str,
+                         lane: Optional[int], game_date: Optional[str]) -> Dict[str, Any]:
+    """배치 중 이미지 1장 처리 (작업 스레드에서 실행)"""
+    try:
+        with use_batcher(ocr_batcher), request_deadline():
+            with span("decode"):
+                image = Image.open(io.BytesIO(image_data))
+                image.load()
+                if image.mode != 'RGB':
+                    image = image.convert('RGB')
+            
+            filepath = os.path.join("uploads", filename)
+            with span("save_upload"), image_catalog.saving(filename):
+                image.save(filepath, "JPEG", quality=95)
+            
+            analysis_result = recognizer.analyze_image(image, original_filename=filename, preprocessing=preprocessing)
+            response = build_recognition_response(analysis_result, filename, lane=lane, game_date=game_date)
+        return {"index": index, "filename": original_name, "saved_as": filename, **response.model_dump()}
+    
+    except Exception as e:
+        logger.error("Batch item recognition error (%s): %s", original_name, e)
+        return {"index": index, "filename": original_name, "success": False, "data": [],
+                "message": f"인식 처리 중 오류가 발생했습니다: {str(e)}"}
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """메인 페이지"""
@@ -305,25 +495,35 @@ async def root():
 
 @app.get("/members")
 async def get_members():
-    """등록된 회원 목록 조회"""
-    return {"members": MEMBER_NAMES}
+    """등록된 회원 목록 조회 (클럽: ?club= 또는 /clubs/{club}/members)"""
+    club = current_club.get()
+    return {"club": club, "members": club_directory.members(club)}
 
 @app.post("/members")
 async def add_member(member_name: str):
-    """새 회원 추가"""
-    if member_name not in MEMBER_NAMES:
-        MEMBER_NAMES.append(member_name)
-        return {"message": f"회원 '{member_name}'이 추가되었습니다.", "members": MEMBER_NAMES}
+    """새 회원 추가 (이름 매칭 배열/색인에 새 회원만 덧붙임)"""
+    club = current_club.get()
+    if club_directory.add_member(club, member_name):
+        return {"message": f"회원 '{member_name}'이 추가되었습니다.", "club": club, "members": club_directory.members(club)}
     else:
-        return {"message": f"회원 '{member_name}'은 이미 존재합니다.", "members": MEMBER_NAMES}
+        return {"message": f"회원 '{member_name}'은 이미 존재합니다.", "club": club, "members": club_directory.members(club)}
+
+@app.get("/clubs")
+async def list_clubs():
+    """회원이 등록된 클럽 목록과 클럽별 매칭 구조 메모리 상태"""
+    clubs = [DEFAULT_CLUB] + [club for club in club_directory.store.clubs() if club != DEFAULT_CLUB]
+    return {"clubs": clubs, "matchers": club_directory.stats()}
 
 @app.post("/recognize-scoreboard", response_model=OCRResponse)
 async def recognize_scoreboard(
     file: UploadFile = File(...),
     language: str = "kor+eng",
-    preprocessing: str = "auto"
+    preprocessing: str = "auto",
+    lane: Optional[int] = None,
+    game_date: Optional[str] = None
 ):
     """볼링 스코어보드 이미지 인식"""
+    check_game_date(game_date)
     try:
         # 파일 검증
         if not file.content_type.startswith('image/'):
@@ -331,205 +531,211 @@ async def recognize_scoreboard(
         
         # 이미지 로드
         image_data = await file.read()
-        image = Image.open(io.BytesIO(image_data))
-        
-        # RGB 변환
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+        with span("decode"):
+            image = Image.open(io.BytesIO(image_data))
+            image.load()
+            
+            # RGB 변환
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
         
         # 이미지 저장
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         filename = f"bowling_score_{timestamp}.jpg"
         filepath = os.path.join("uploads", filename)
-        image.save(filepath, "JPEG", quality=95)
-        logger.info(f"업로드된 이미지 저장: {filepath}")
+        with span("save_upload"), image_catalog.saving(filename):
+            image.save(filepath, "JPEG", quality=95)
+        logger.info("업로드된 이미지 저장: %s", filepath)
         
         # 이미지 분석 (전처리, OCR 포함)
         analysis_result = recognizer.analyze_image(image, original_filename=filename, preprocessing=preprocessing)
         ocr_result = analysis_result['ocr_result']
         saved_path = analysis_result['saved_path']
         
-        logger.info(f"이미지 저장 경로: {saved_path}")
-        
-        # 스코어보드 영역 인식 확인
-        if not analysis_result.get('region_analysis'):
-            logger.warning("스코어보드 헤더(1-10) 인식 안됨")
-            return OCRResponse(
-                success=False,
-                data=[],
-                message="스코어보드 헤더(1-10) 인식 안됨"
-            )
-        
-        # region_analysis 결과 사용 - 이름과 점수 매칭 (부분 인식 지원)
-        region_data = analysis_result['region_analysis']
-        korean_names = region_data.get('name_part', {}).get('korean_names', [])
-        numbers = region_data.get('final_score', {}).get('numbers', [])
-        
-        logger.info(f"한글 이름: {korean_names}")
-        logger.info(f"숫자 점수: {numbers}")
+        logger.debug("이미지 저장 경로: %s", saved_path)
         
-        # 부분 인식 결과 생성 (이름과 점수 개수가 달라도 처리)
-        parsed_data = []
-        max_count = max(len(korean_names), len(numbers))
-        
-        for i in range(max_count):
-            name = korean_names[i] if i < len(korean_names) else ""
-            score = numbers[i] if i < len(numbers) else 0
-            
-            parsed_data.append({
-                'original_name': name,
-                'scores': [],  # 프레임별 점수는 별도 추출 필요
-                'total': score,
-                'confidence': 0.9 if name and score else 0.5
-            })
-        
-        logger.info(f"부분 인식 결과: {parsed_data}")
-        
-        # 이름 매칭
-        matched_data = recognizer.match_names(parsed_data, MEMBER_NAMES)
-        
-        # 부분 인식 메시지 생성
-        name_count = len([d for d in parsed_data if d['original_name']])
-        score_count = len([d for d in parsed_data if d['total'] > 0])
-        total_count = len(parsed_data)
-        
-        if name_count == score_count == total_count:
-            message = f"{total_count}개의 스코어 데이터를 완전히 인식했습니다."
-        else:
-            message = f"부분 인식: 이름 {name_count}개, 점수 {score_count}개 (총 {total_count}개)"
-        
-        return OCRResponse(
-            success=True,
-            data=matched_data,
-            message=message
-        )
+        return build_recognition_response(analysis_result, filename, lane=lane, game_date=game_date)
         
     except Exception as e:
-        logger.error(f"Scoreboard recognition error: {e}")
+        logger.error("Scoreboard recognition error: %s", e)
         raise HTTPException(status_code=500, detail=f"인식 처리 중 오류가 발생했습니다: {str(e)}")
 
+@app.post("/recognize-batch")
+async def recognize_batch(
+    files: List[UploadFile] = File(...),
+    preprocessing: str = "auto",
+    lane: Optional[int] = None,
+    game_date: Optional[str] = None
+):
+    """여러 장의 스코어보드 이미지를 한 번에 인식 (완료되는 순서대로 NDJSON 스트리밍)"""
+    check_game_date(game_date)
+    if len(files) > BATCH_MAX_IMAGES:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {BATCH_MAX_IMAGES}장까지 업로드 가능합니다.")
+    for file in files:
+        if not file.content_type.startswith('image/'):
+            raise HTTPException(status_code=400, detail=f"이미지 파일만 업로드 가능합니다: {file.filename}")
+    
+    # 같은 초에 저장되므로 순번을 붙여 파일명 충돌 방지
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    jobs = []
+    for index, file in enumerate(files):
+        image_data = await file.read()
+        jobs.append((index, file.filename, image_data, f"bowling_score_{timestamp}_{index:02d}.jpg"))
+    logger.info("배치 인식 요청: %s장", len(jobs))
+    
+    async def stream_results():
+        loop = asyncio.get_running_loop()
+        with io_activity.busy():
+            futures = [
+                loop.run_in_executor(
+                    batch_executor,
+                    contextvars.copy_context().run,
+                    recognize_batch_item, index, original_name, image_data, filename, preprocessing, lane, game_date
+                )
+                for index, original_name, image_data, filename in jobs
+            ]
+            for completed in asyncio.as_completed(futures):
+                result = await completed
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @app.post("/recognize-base64", response_model=OCRResponse)
 async def recognize_scoreboard_base64(request: OCRRequest):
     """Base64 이미지 데이터로 스코어보드 인식"""
+    check_game_date(request.game_date)
     try:
         logger.info("Base64 인식 요청 받음")
-        logger.info(f"언어: {request.language}, 전처리: {request.preprocessing}")
-        logger.info(f"요청 헤더: {request.headers if hasattr(request, 'headers') else 'N/A'}")
+        logger.info("언어: %s, 전처리: %s", request.language, request.preprocessing)
         
         # Base64 디코딩
         if request.image_data.startswith('data:image'):
             image_data = request.image_data.split(',')[1]
-            logger.info("data:image 형식 감지됨")
+            logger.debug("data:image 형식 감지됨")
         else:
             image_data = request.image_data
-            logger.info("일반 Base64 형식 감지됨")
+            logger.debug("일반 Base64 형식 감지됨")
         
-        logger.info(f"Base64 데이터 길이: {len(image_data)}")
+        logger.debug("Base64 데이터 길이: %s", len(image_data))
         
         try:
-            image_bytes = base64.b64decode(image_data)
-            logger.info(f"이미지 바이트 크기: {len(image_bytes)}")
+            with span("decode"):
+                image_bytes = base64.b64decode(image_data)
+            logger.debug("이미지 바이트 크기: %s", len(image_bytes))
         except Exception as e:
-            logger.error(f"Base64 디코딩 오류: {e}")
+            logger.error("Base64 디코딩 오류: %s", e)
             raise HTTPException(status_code=400, detail="잘못된 Base64 데이터입니다.")
         
         try:
-            image = Image.open(io.BytesIO(image_bytes))
-            logger.info(f"이미지 로드 완료: {image.size}, 모드: {image.mode}")
+            with span("decode"):
+                image = Image.open(io.BytesIO(image_bytes))
+                image.load()
+            logger.info("이미지 로드 완료: %s, 모드: %s", image.size, image.mode)
         except Exception as e:
-            logger.error(f"이미지 로드 오류: {e}")
+            logger.error("이미지 로드 오류: %s", e)
             raise HTTPException(status_code=400, detail="이미지 파일을 읽을 수 없습니다.")
         
         # RGB 변환
         if image.mode != 'RGB':
             image = image.convert('RGB')
-            logger.info("RGB 변환 완료")
+            logger.debug("RGB 변환 완료")
         
         # 이미지 저장
-        logger.info("이미지 분석 시작")
+        logger.debug("이미지 분석 시작")
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         filename = f"bowling_score_{timestamp}.jpg"
         filepath = os.path.join("uploads", filename)
-        image.save(filepath, "JPEG", quality=95)
-        logger.info(f"업로드된 이미지 저장: {filepath}")
+        with span("save_upload"), image_catalog.saving(filename):
+            image.save(filepath, "JPEG", quality=95)
+        logger.info("업로드된 이미지 저장: %s", filepath)
         
         # 이미지 분석 (전처리, OCR 포함)
         analysis_result = recognizer.analyze_image(image, original_filename=filename, preprocessing=request.preprocessing)
         ocr_result = analysis_result['ocr_result']
         saved_path = analysis_result['saved_path']
-        logger.info(f"이미지 저장 경로: {saved_path}")
-        logger.info(f"OCR 결과: {ocr_result['full_text'][:100]}...")
-        
-        # 스코어보드 영역 인식 확인
-        if not analysis_result.get('region_analysis'):
-            logger.warning("스코어보드 헤더(1-10) 인식 안됨")
-            return OCRResponse(
-                success=False,
-                data=[],
-                message="스코어보드 헤더(1-10) 인식 안됨"
-            )
-        
-        # region_analysis 결과 사용 - 이름과 점수 매칭 (부분 인식 지원)
-        region_data = analysis_result['region_analysis']
-        korean_names = region_data.get('name_part', {}).get('korean_names', [])
-        numbers = region_data.get('final_score', {}).get('numbers', [])
-        
-        logger.info(f"한글 이름: {korean_names}")
-        logger.info(f"숫자 점수: {numbers}")
-        
-        # 부분 인식 결과 생성 (이름과 점수 개수가 달라도 처리)
-        parsed_data = []
-        max_count = max(len(korean_names), len(numbers))
-        
-        for i in range(max_count):
-            name = korean_names[i] if i < len(korean_names) else ""
-            score = numbers[i] if i < len(numbers) else 0
-            
-            parsed_data.append({
-                'original_name': name,
-                'scores': [],  # 프레임별 점수는 별도 추출 필요
-                'total': score,
-                'confidence': 0.9 if name and score else 0.5
-            })
+        logger.debug("이미지 저장 경로: %s", saved_path)
+        logger.debug("OCR 결과: %.100s...", ocr_result['full_text'], extra=SAMPLED)
         
-        logger.info(f"부분 인식 결과: {parsed_data}")
-        logger.info(f"파싱된 데이터 수: {len(parsed_data)}")
-        
-        # 이름 매칭
-        logger.info("이름 매칭 시작")
-        matched_data = recognizer.match_names(parsed_data, MEMBER_NAMES)
-        logger.info(f"매칭된 데이터 수: {len(matched_data)}")
-        
-        # 부분 인식 메시지 생성
-        name_count = len([d for d in parsed_data if d['original_name']])
-        score_count = len([d for d in parsed_data if d['total'] > 0])
-        total_count = len(parsed_data)
-        
-        if name_count == score_count == total_count:
-            message = f"{total_count}개의 스코어 데이터를 완전히 인식했습니다."
-        else:
-            message = f"부분 인식: 이름 {name_count}개, 점수 {score_count}개 (총 {total_count}개)"
-        
-        logger.info("인식 완료")
-        return OCRResponse(
-            success=True,
-            data=matched_data,
-            message=message
-        )
+        return build_recognition_response(analysis_result, filename, lane=request.lane, game_date=request.game_date)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Base64 recognition error: {e}")
-        logger.error(f"오류 타입: {type(e)}")
+        logger.error("Base64 recognition error: %s", e)
+        logger.error("오류 타입: %s", type(e))
         import traceback
-        logger.error(f"스택 트레이스: {traceback.format_exc()}")
+        logger.error("스택 트레이스: %s", traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"인식 처리 중 오류가 발생했습니다: {str(e)}")
 
 @app.get("/health")
 async def health_check():
     """서버 상태 확인"""
-    return {"status": "healthy", "message": "볼링 스코어보드 인식 서버가 정상 작동 중입니다."}
+    return {
+        "status": "healthy",
+        "message": "볼링 스코어보드 인식 서버가 정상 작동 중입니다.",
+        "ocr": {
+            "remote": "vision" if recognizer.image_analyzer.client is not None else None,
+            "breaker": vision_breaker.status(),
+        },
+    }
+
+@app.get("/ready")
+async def readiness_check():
+    """준비 상태 확인 (OCR 예열 완료 시 200, 그 전에는 503)"""
+    status = readiness.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@app.get("/history/leaderboard")
+async def get_leaderboard(order_by: str = "average", limit: int = 10, min_games: int = 1):
+    """클럽 리더보드 조회 (평균 또는 최고점 기준)"""
+    try:
+        return {"leaderboard": score_history.get_leaderboard(order_by=order_by, limit=limit, min_games=min_games,
+                                                             club=current_club.get())}
+    except Exception as e:
+        logger.error("Leaderboard error: %s", e)
+        raise HTTPException(status_code=500, detail=f"리더보드 조회 중 오류가 발생했습니다: {str(e)}")
+
+@app.get("/history/members/{member_name}")
+async def get_member_history(member_name: str, limit: int = 20, before_date: Optional[str] = None):
+    """회원별 통계 및 최근 게임 기록 조회"""
+    try:
+        club = current_club.get()
+        stats = score_history.get_member_stats(member_name, club=club)
+        if stats is None:
+            raise HTTPException(status_code=404, detail=f"기록이 없는 회원입니다: {member_name}")
+        games = score_history.get_member_history(member_name, limit=limit, before_date=before_date, club=club)
+        return {"stats": stats, "games": games}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Member history error: %s", e)
+        raise HTTPException(status_code=500, detail=f"회원 기록 조회 중 오류가 발생했습니다: {str(e)}")
+
+@app.get("/history/export.csv")
+async def export_history_csv():
+    """클럽의 전체 게임 기록 CSV 스트리밍 내보내기"""
+    return StreamingResponse(
+        score_history.iter_export_csv(club=current_club.get()),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": "attachment; filename=score_history.csv"}
+    )
+
+metrics.registry.register_collector(ocr_deadline.collect_metrics)
+metrics.registry.register_collector(vision_breaker.collect_metrics)
+metrics.registry.register_collector(club_directory.collect_metrics)
+if result_cache is not None:
+    metrics.registry.register_collector(result_cache.collect_metrics)
+if header_detector is not None:
+    metrics.registry.register_collector(header_detector.collect_metrics)
+if score_reader is not None:
+    metrics.registry.register_collector(score_reader.collect_metrics)
+if layout_cache is not None:
+    metrics.registry.register_collector(layout_cache.collect_metrics)
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 메트릭"""
+    return Response(content=metrics.registry.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/test-saved-image/{filename}")
 async def test_saved_image(filename: str):
@@ -563,7 +769,9 @@ async def test_saved_image(filename: str):
             )
         
         # 이름 매칭
-        matched_data = recognizer.match_names(parsed_data, MEMBER_NAMES)
+        with span("match_names"):
+            members, scorer = club_directory.matcher(current_club.get())
+            matched_data = recognizer.match_names(parsed_data, members, scorer=scorer)
         
         return OCRResponse(
             success=True,
@@ -572,38 +780,98 @@ async def test_saved_image(filename: str):
         )
         
     except Exception as e:
-        logger.error(f"Saved image test error: {e}")
+        logger.error("Saved image test error: %s", e)
         raise HTTPException(status_code=500, detail=f"저장된 이미지 테스트 중 오류가 발생했습니다: {str(e)}")
 
+@app.get("/thumbnails/{source}/{filename}")
+async def get_thumbnail(source: str, filename: str, request: Request, size: int = 320, format: str = "webp"):
+    """업로드/분석 이미지 썸네일 (크기 단계별 캐시, ETag/Range 지원)"""
+    try:
+        thumb = thumbnail_cache.get(source, filename, size=size, fmt=format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Thumbnail error: %s", e)
+        raise HTTPException(status_code=500, detail=f"썸네일 생성 중 오류가 발생했습니다: {str(e)}")
+    
+    if thumb is None:
+        raise HTTPException(status_code=404, detail=f"파일을 찾을 수 없습니다: {source}/{filename}")
+    
+    headers = {
+        "ETag": thumb["etag"],
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Accept-Ranges": "bytes",
+    }
+    if request.headers.get("if-none-match") == thumb["etag"]:
+        return Response(status_code=304, headers=headers)
+    
+    # nginx가 캐시 파일을 직접 전송 (Range 처리도 nginx가 담당)
+    if THUMBNAIL_ACCEL_PREFIX:
+        headers["X-Accel-Redirect"] = THUMBNAIL_ACCEL_PREFIX + thumb["cache_name"]
+        return Response(status_code=200, headers=headers, media_type=thumb["media_type"])
+    
+    try:
+        with open(thumb["path"], "rb") as f:
+            content = f.read()
+    except FileNotFoundError:
+        # get()과 open() 사이에 LRU로 지워진 경우: 다시 생성
+        thumb = thumbnail_cache.get(source, filename, size=size, fmt=format)
+        if thumb is None:
+            raise HTTPException(status_code=404, detail=f"파일을 찾을 수 없습니다: {source}/{filename}")
+        with open(thumb["path"], "rb") as f:
+            content = f.read()
+    
+    try:
+        byte_range = parse_range_header(request.headers.get("range"), len(content))
+    except ValueError:
+        headers["Content-Range"] = f"bytes */{len(content)}"
+        return Response(status_code=416, headers=headers)
+    
+    if byte_range is not None and request.headers.get("if-range", thumb["etag"]) == thumb["etag"]:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+        return Response(content=content[start:end + 1], status_code=206, headers=headers, media_type=thumb["media_type"])
+    
+    return Response(content=content, headers=headers, media_type=thumb["media_type"])
+
+@app.get("/archive/{source}/{filename}")
+async def get_archived_file(source: str, filename: str):
+    """아카이브 샤드에 보관된 이미지 조회"""
+    data = archive_store.read(source, filename)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"아카이브에 없는 파일입니다: {source}/{filename}")
+    return Response(content=data, media_type="image/jpeg")
+
+@app.get("/retention/status")
+async def retention_status():
+    """보관 정책 / 아카이브 상태"""
+    return {
+        "policy": retention_compactor.policy.to_dict(),
+        "archive": archive_store.stats(),
+        "last_run": retention_compactor.last_run
+    }
+
 @app.get("/list-saved-images")
-async def list_saved_images():
-    """저장된 이미지 목록 조회"""
+async def list_saved_images(limit: int = 100, cursor: Optional[str] = None,
+                            date_from: Optional[str] = None, date_to: Optional[str] = None):
+    """저장된 이미지 목록 조회 (인덱스 기반, 커서 페이지네이션)"""
+    if limit <= 0:
+        raise HTTPException(status_code=400, detail=f"limit은 1 이상이어야 합니다: {limit}")
     try:
-        import os
-        upload_dir = "uploads"
-        if not os.path.exists(upload_dir):
-            return {"images": []}
-        
-        images = []
-        for filename in os.listdir(upload_dir):
-            if filename.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp')):
-                filepath = os.path.join(upload_dir, filename)
-                stat = os.stat(filepath)
-                images.append({
-                    "filename": filename,
-                    "size": stat.st_size,
-                    "modified": stat.st_mtime
-                })
-        
-        # 수정 시간 역순으로 정렬
-        images.sort(key=lambda x: x["modified"], reverse=True)
-        
-        return {"images": images}
+        return image_catalog.list_images(limit=limit, cursor=cursor, date_from=date_from, date_to=date_to)
         
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"잘못된 커서입니다: {cursor}")
     except Exception as e:
-        logger.error(f"List saved images error: {e}")
+        logger.error("List saved images error: %s", e)
         raise HTTPException(status_code=500, detail=f"저장된 이미지 목록 조회 중 오류가 발생했습니다: {str(e)}")
 
+@app.post("/list-saved-images/rescan")
+async def rescan_saved_images():
+    """이미지 인덱스 강제 재스캔 (외부에서 파일을 정리한 경우)"""
+    result = image_catalog.rescan(force=True)
+    return {"message": "이미지 인덱스를 재스캔했습니다.", **result, "total": image_catalog.count()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("bowling:app", host="0.0.0.0", port=8091, reload=True)
\ No newline at end of file
@@ -0,0 +1,205 @@
+import contextvars
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Callable, Tuple
+
+from name_scorers import NameScorer, memo_metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLUB = "default"
+CLUB_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# 현재 요청의 클럽 (?club= 또는 /clubs/{club}/... 경로로 지정, 미들웨어에서 설정)
+current_club: contextvars.ContextVar[str] = contextvars.ContextVar("bowling_club", default=DEFAULT_CLUB)
+
+
+def is_valid_club_id(club: str) -> bool:
+    return bool(CLUB_ID_PATTERN.match(club))
+
+
+def split_club_prefix(path: str) -> Tuple[Optional[str], str]:
+    """/clubs/{club}/recognize-scoreboard -> ("{club}", "/recognize-scoreboard"), 접두사가 없으면 (None, path)
+
+    뒤에 경로가 없는 /clubs/{club}은 접두사로 보지 않음 (그대로 라우팅되어 404, / 로 바꾸지 않음)
+    """
+    if not path.startswith("/clubs/"):
+        return None, path
+    club, separator, rest = path[len("/clubs/"):].partition("/")
+    if not separator:
+        return None, path
+    return club, "/" + rest
+
+
+class ClubMemberStore:
+    """클럽별 회원 목록 저장소 (SQLite, 기본 클럽은 bowling.py의 MEMBER_NAMES를 그대로 사용)"""
+
+    def __init__(self, db_path: str = "clubs/club_members.db"):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS club_members (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    club TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    added_at REAL NOT NULL,
+                    UNIQUE (club, name)
+                )
+            """)
+        logger.info("ClubMemberStore 초기화 완료: %s", db_path)
+
+    def list_members(self, club: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT name FROM club_members WHERE club = ? ORDER BY id", (club,)).fetchall()
+        return [row[0] for row in rows]
+
+    def add_member(self, club: str, name: str) -> bool:
+        """추가되면 True, 이미 있으면 False"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO club_members (club, name, added_at) VALUES (?, ?, ?)", (club, name, time.time())
+            )
+        return cursor.rowcount > 0
+
+    def clubs(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT club FROM club_members ORDER BY club").fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ClubDirectory:
+    """클럽별 회원 목록과 이름 매칭 구조
+
+    클럽의 회원 목록과 계산기(배열, 색인, 메모)는 처음 쓸 때 만들고, 전체 메모리 사용량이
+    예산(BOWLING_CLUB_MEMORY_MB)을 넘으면 가장 오래 쓰지 않은 클럽부터 메모리에서 내립니다.
+    내린 클럽은 다음 요청 때 저장소에서 다시 불러옵니다.
+    """
+
+    def __init__(self, store: ClubMemberStore, default_members: List[str],
+                 scorer_factory: Callable[[], NameScorer],
+                 budget_bytes: int = int(os.getenv("BOWLING_CLUB_MEMORY_MB", "256")) * 1024 * 1024):
+        self.store = store
+        self.default_members = default_members
+        self.scorer_factory = scorer_factory
+        self.budget_bytes = budget_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+        # 내려간 클럽의 메모 통계도 누적해서 보고
+        self._retired_memo = {"hits": 0, "misses": 0}
+
+    def _entry(self, club: str) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._entries.get(club)
+            if entry is not None:
+                self._entries.move_to_end(club)
+                return entry
+        # 저장소 조회는 잠금 밖에서 (동시에 같은 클럽을 불러오면 먼저 등록된 쪽 사용)
+        members = self.default_members if club == DEFAULT_CLUB else self.store.list_members(club)
+        entry = {"members": members, "scorer": self.scorer_factory(), "bytes": 0, "lock": threading.Lock()}
+        with self._lock:
+            existing = self._entries.get(club)
+            if existing is not None:
+                self._entries.move_to_end(club)
+                return existing
+            self._entries[club] = entry
+            self.loads += 1
+        logger.info("클럽 회원 목록 로드: %s (%s명)", club, len(members))
+        return entry
+
+    @staticmethod
+    def _estimate_bytes(entry: Dict[str, Any]) -> int:
+        members = entry["members"]
+        return (entry["scorer"].memory_bytes() + sys.getsizeof(members)
+                + sum(sys.getsizeof(name) for name in members))
+
+    def _evict_over_budget(self, keep: str):
+        with self._lock:
+            total = sum(entry["bytes"] for entry in self._entries.values())
+            while total > self.budget_bytes and len(self._entries) > 1:
+                club = next(iter(self._entries))
+                if club == keep:
+                    self._entries.move_to_end(club)
+                    club = next(iter(self._entries))
+                entry = self._entries.pop(club)
+                total -= entry["bytes"]
+                self.evictions += 1
+                stats = entry["scorer"].memo.stats()
+                self._retired_memo["hits"] += stats["hits"]
+                self._retired_memo["misses"] += stats["misses"]
+                logger.info("클럽 매칭 구조 해제 (메모리 예산 초과): %s (%.1f MB)", club, entry["bytes"] / 1024 / 1024)
+
+    def members(self, club: str) -> List[str]:
+        return self._entry(club)["members"]
+
+    def matcher(self, club: str) -> Tuple[List[str], NameScorer]:
+        """클럽 회원 목록과 준비된 계산기 (필요하면 이때 구축하고 메모리 예산 확인)"""
+        entry = self._entry(club)
+        with entry["lock"]:
+            entry["scorer"].prepare(entry["members"])
+            entry["bytes"] = self._estimate_bytes(entry)
+        self._evict_over_budget(keep=club)
+        return entry["members"], entry["scorer"]
+
+    def add_member(self, club: str, name: str) -> bool:
+        """회원 추가 (이미 있으면 False). 메모리에 올라와 있는 클럽은 배열/색인에 새 이름만 덧붙임"""
+        entry = self._entry(club)
+        with entry["lock"]:
+            if name in entry["members"]:
+                return False
+            if club != DEFAULT_CLUB and not self.store.add_member(club, name):
+                return False
+            entry["members"].append(name)
+            entry["scorer"].members_updated()
+        self.matcher(club)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = list(self._entries.items())
+            retired = dict(self._retired_memo)
+        memo = {"entries": 0, "bytes": 0, "hits": retired["hits"], "misses": retired["misses"]}
+        for _, entry in entries:
+            stats = entry["scorer"].memo.stats()
+            for key in ("entries", "bytes", "hits", "misses"):
+                memo[key] += stats[key]
+        lookups = memo["hits"] + memo["misses"]
+        memo["hit_ratio"] = memo["hits"] / lookups if lookups else 0.0
+        return {
+            "loaded_clubs": [club for club, _ in entries],
+            "bytes": sum(entry["bytes"] for _, entry in entries),
+            "budget_bytes": self.budget_bytes,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "memo": memo,
+        }
+
+    def collect_metrics(self):
+        """/metrics 수집기"""
+        stats = self.stats()
+        return [
+            ("bowling_club_matchers_loaded", "gauge", "Clubs with name-matching structures in memory", None,
+             len(stats["loaded_clubs"])),
+            ("bowling_club_matchers_bytes", "gauge", "Approximate memory held by per-club matching structures", None,
+             stats["bytes"]),
+            ("bowling_club_matcher_loads_total", "counter", "Per-club matching structure loads", None, stats["loads"]),
+            ("bowling_club_matcher_evictions_total", "counter", "Per-club matching structures evicted over budget",
+             None, stats["evictions"]),
+        ] + memo_metrics(stats["memo"])
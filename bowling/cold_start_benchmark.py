@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+콜드 스타트 측정
+서버 프로세스를 새로 띄워 프로세스 시작부터
+  1) /health 응답 (요청 수신 시작)
+  2) /ready 200 (OCR 예열 완료)
+  3) 첫 인식 응답 (time-to-first-successful-recognition)
+까지 걸린 시간을 여러 번 재서 중앙값을 출력합니다.
+
+사용법:
+  python cold_start_benchmark.py --runs 5                      # 실제 Vision (인증 필요)
+  python cold_start_benchmark.py --ocr-mode replay --runs 5    # 가짜 OCR (네트워크 불필요)
+  python cold_start_benchmark.py --image ../uploads/bowling_score_20250805_122228.jpg
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import tempfile
+import subprocess
+import http.client
+from typing import Dict, Optional
+
+from load_test import BOWLING_DIR, RequestBuilder, _free_port, synthetic_images
+
+
+def _get_status(port: int, path: str) -> Optional[int]:
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    except OSError:
+        return None
+
+
+def measure_once(image: bytes, ocr_mode: str, timeout: float) -> Dict[str, Optional[float]]:
+    work_dir = tempfile.mkdtemp(prefix="bowling_cold_")
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({"BOWLING_OCR_MODE": ocr_mode, "BOWLING_LOG_LEVEL": "WARNING",
+                "BOWLING_OCR_CASSETTE_DIR": os.path.join(work_dir, "cassettes")})
+    command = [sys.executable, "-m", "uvicorn", "bowling:app", "--app-dir", BOWLING_DIR,
+               "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    result: Dict[str, Optional[float]] = {"listening": None, "ready": None, "first_recognition": None}
+
+    with open(os.path.join(work_dir, "server.log"), "wb") as log_file:
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=work_dir, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+        try:
+            deadline = started + timeout
+            while time.perf_counter() < deadline and process.poll() is None:
+                if result["listening"] is None and _get_status(port, "/health") == 200:
+                    result["listening"] = time.perf_counter() - started
+                if result["listening"] is not None and _get_status(port, "/ready") == 200:
+                    result["ready"] = time.perf_counter() - started
+                    break
+                time.sleep(0.02)
+
+            # 준비 여부와 관계없이 첫 인식 요청 (준비 전이면 요청 경로에서 지연 초기화)
+            path, body, content_type = RequestBuilder([image]).build("scoreboard", 0)
+            while time.perf_counter() < deadline and process.poll() is None:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+                connection.request("POST", path, body=body, headers={"Content-Type": content_type})
+                response = connection.getresponse()
+                payload = json.loads(response.read() or b"{}")
+                if response.status == 200:
+                    result["first_recognition"] = time.perf_counter() - started
+                    result["recognized"] = bool(payload.get("success"))
+                    break
+                time.sleep(0.1)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="볼링 서비스 콜드 스타트 측정")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--image", default=None, help="인식할 이미지 (기본: 합성 점수판 1장)")
+    parser.add_argument("--ocr-mode", choices=("live", "replay"), default="live")
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    if args.image:
+        with open(args.image, "rb") as f:
+            image = f.read()
+    else:
+        image = synthetic_images(1, tempfile.mkdtemp(prefix="bowling_cold_img_"))[0]
+
+    runs = []
+    for run in range(args.runs):
+        result = measure_once(image, args.ocr_mode, args.timeout)
+        runs.append(result)
+        print(f"#{run + 1}: " + ", ".join(
+            f"{key}={value:.2f}s" if isinstance(value, float) else f"{key}={value}" for key, value in result.items()))
+
+    print("\n중앙값:")
+    for key in ("listening", "ready", "first_recognition"):
+        values = [run[key] for run in runs if run.get(key) is not None]
+        print(f"  {key:<18} {statistics.median(values):.2f}s" if values else f"  {key:<18} -")
+
+
+if __name__ == "__main__":
+    main()
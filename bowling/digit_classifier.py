@@ -0,0 +1,175 @@
+import logging
+import os
+import threading
+from typing import Dict, Any, List, Tuple
+
+from startup import lazy_import
+
+logger = logging.getLogger(__name__)
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+DIGIT_MODEL_DIR = os.getenv("BOWLING_DIGIT_MODEL_DIR", "models")
+GLYPH_WIDTH = 12
+GLYPH_HEIGHT = 16
+
+
+def binarize(gray):
+    """Otsu 이진화 (전처리된 이진 이미지는 그대로)"""
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return binary
+
+
+def find_glyphs(mask, min_height: float, max_height: float) -> Dict[str, Any]:
+    """흰 글자 마스크에서 숫자 크기의 연결 요소 찾기
+
+    반환: x, y, w, h (NumPy 배열)와 요소별 글자 마스크 목록 (x 오름차순),
+    wide: 숫자 높이지만 너무 넓어 뺀 요소의 (x, y, w, h) 배열 (붙어 버린 글자 '15' 등)
+    """
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    x, y, w, h, area = (stats[1:, i] for i in range(5))
+    sized = (h >= min_height) & (h <= max_height) & (area >= w * h * 0.12)
+    keep = sized & (w <= h * 1.2) & (w * 12 >= h)
+    ids = np.flatnonzero(keep)
+    ids = ids[np.argsort(x[ids], kind="stable")]
+    crops = [labels[y[i]:y[i] + h[i], x[i]:x[i] + w[i]] == i + 1 for i in ids.tolist()]
+    wide = np.flatnonzero(sized & (w > h * 1.2) & (w <= h * 4))
+    return {"x": x[ids], "y": y[ids], "w": w[ids], "h": h[ids], "crops": crops,
+            "wide": stats[1:, :4][wide]}
+
+
+def group_glyphs(glyphs: Dict[str, Any], keep=None) -> List[List[int]]:
+    """x 순서의 글자를 같은 줄, 비슷한 높이, 좁은 간격이면 한 토큰('10', '187' 등)으로 묶음 (글자 인덱스 목록)
+
+    토큰의 줄/높이 기준은 첫 글자, keep이 False인 글자는 건너뜀
+    """
+    x, y, w, h = (glyphs[key].tolist() for key in ("x", "y", "w", "h"))
+    tokens: List[List[int]] = []
+    open_tokens: List[Tuple[List[int], float]] = []  # (토큰, 오른쪽 끝)
+    for i in range(len(x)):
+        if keep is not None and not keep[i]:
+            continue
+        center = y[i] + h[i] / 2
+        # x가 커지기만 하므로 오른쪽 끝에서 너무 멀어진 토큰은 닫음
+        open_tokens = [(token, right) for token, right in open_tokens if x[i] - right <= h[token[0]] * 0.6]
+        for index, (token, right) in enumerate(open_tokens):
+            first = token[0]
+            if (abs(center - (y[first] + h[first] / 2)) <= h[first] * 0.25 and 0.75 <= h[i] / h[first] <= 1.33
+                    and x[i] - right >= -h[first] * 0.1):
+                token.append(i)
+                open_tokens[index] = (token, x[i] + w[i])
+                break
+        else:
+            tokens.append([i])
+            open_tokens.append((tokens[-1], x[i] + w[i]))
+    return tokens
+
+
+def pixel_features(crops: List[Any]):
+    """글자 마스크를 비율을 유지해 12x16 칸 가운데에 맞춘 뒤 평균을 빼고 L2 정규화한 픽셀 벡터 (N x 192, 내적 = 상관계수)"""
+    features = np.zeros((len(crops), GLYPH_HEIGHT, GLYPH_WIDTH), dtype=np.float32)
+    for index, crop in enumerate(crops):
+        height, width = crop.shape
+        scale = min(GLYPH_WIDTH / width, GLYPH_HEIGHT / height)
+        new_width, new_height = max(1, round(width * scale)), max(1, round(height * scale))
+        resized = cv2.resize(crop.astype(np.float32), (new_width, new_height), interpolation=cv2.INTER_AREA)
+        top, left = (GLYPH_HEIGHT - new_height) // 2, (GLYPH_WIDTH - new_width) // 2
+        features[index, top:top + new_height, left:left + new_width] = resized
+    features = features.reshape(len(crops), -1)
+    features -= features.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return features / np.maximum(norms, 1e-6)
+
+
+class DigitClassifier:
+    """숫자 글자 최근접 분류기 (정규화 픽셀 벡터 상관계수)
+
+    원격 OCR이 확인한 글자를 숫자별로 최대 per_class개까지 모아 npz 파일에 저장하고,
+    숫자별로 오래된 것부터 교체합니다. 숫자마다 가장 가까운 샘플과의 상관계수를 구해 가장 높은 숫자를 고르고,
+    신뢰도는 1위와 2위 숫자의 차이(margin_scale 이상이면 1.0)입니다.
+    """
+
+    def __init__(self, path: str, per_class: int = int(os.getenv("BOWLING_DIGIT_SAMPLES_PER_CLASS", "200")),
+                 min_similarity: float = 0.5, margin_scale: float = 0.15):
+        self.path = path
+        self.per_class = per_class
+        self.min_similarity = min_similarity
+        self.margin_scale = margin_scale
+        self._lock = threading.Lock()
+        self._features = None
+        self._labels = None
+        self._loaded = False
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        self._features = np.zeros((0, GLYPH_WIDTH * GLYPH_HEIGHT), dtype=np.float32)
+        self._labels = np.zeros(0, dtype=np.int8)
+        if os.path.exists(self.path):
+            try:
+                with np.load(self.path) as data:
+                    self._features, self._labels = data["features"], data["labels"]
+                logger.info("숫자 샘플 로드: %s (%s개)", self.path, len(self._labels))
+            except Exception as e:
+                logger.warning("숫자 샘플 파일을 읽을 수 없습니다 (%s): %s", self.path, e)
+
+    def _save(self):
+        model_dir = os.path.dirname(self.path)
+        if model_dir:
+            os.makedirs(model_dir, exist_ok=True)
+        temp_path = self.path + ".tmp.npz"
+        np.savez(temp_path, features=self._features, labels=self._labels)
+        os.replace(temp_path, self.path)
+
+    def counts(self) -> List[int]:
+        """숫자(0-9)별 샘플 수"""
+        with self._lock:
+            self._load()
+            return np.bincount(self._labels.astype(np.int64), minlength=10).tolist()
+
+    def ready(self, min_per_class: int, digits: str = "0123456789") -> bool:
+        counts = self.counts()
+        return all(counts[int(digit)] >= min_per_class for digit in digits)
+
+    def add(self, features, labels) -> int:
+        """확인된 글자 추가 후 저장 (추가한 개수)"""
+        added = len(labels)
+        if not added:
+            return 0
+        with self._lock:
+            self._load()
+            features = np.concatenate((self._features, np.asarray(features, dtype=np.float32)))
+            labels = np.concatenate((self._labels, np.asarray(labels, dtype=np.int8)))
+            keep = np.ones(len(labels), dtype=bool)
+            for digit in np.unique(labels).tolist():
+                indices = np.flatnonzero(labels == digit)
+                if len(indices) > self.per_class:
+                    keep[indices[:-self.per_class]] = False
+            self._features, self._labels = features[keep], labels[keep]
+            try:
+                self._save()
+            except OSError as e:
+                logger.warning("숫자 샘플 저장 실패 (%s): %s", self.path, e)
+        return added
+
+    def classify(self, features) -> Tuple[Any, Any]:
+        """(숫자 배열, 신뢰도 배열), 샘플이 없거나 어느 숫자와도 닮지 않으면 숫자 -1 / 신뢰도 0"""
+        with self._lock:
+            self._load()
+            samples, sample_labels = self._features, self._labels
+        count = len(features)
+        if not len(sample_labels) or not count:
+            return np.full(count, -1, dtype=np.int64), np.zeros(count, dtype=np.float64)
+        similarities = features @ samples.T
+        class_best = np.full((count, 10), -1.0)
+        for digit in np.unique(sample_labels).tolist():
+            class_best[:, digit] = similarities[:, sample_labels == digit].max(axis=1)
+        ranked = np.sort(class_best, axis=1)
+        digits = class_best.argmax(axis=1)
+        confidences = np.clip((ranked[:, -1] - ranked[:, -2]) / self.margin_scale, 0.0, 1.0)
+        unknown = ranked[:, -1] < self.min_similarity
+        digits[unknown] = -1
+        confidences[unknown] = 0.0
+        return digits, confidences
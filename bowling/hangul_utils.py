@@ -1 +1,68 @@
- 
\ No newline at end of file
+"""
+한글 자모 분해 유틸리티 (외부 라이브러리 없이)
+"""
+
+from typing import List, Tuple, Optional
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHO_COUNT, JUNG_COUNT, JONG_COUNT = 19, 21, 28
+
+# 자모 정수 코드: 초성 1~19, 중성 20~40, 종성 41~67 (종성 없음은 코드 없음)
+CHO_OFFSET = 1
+JUNG_OFFSET = CHO_OFFSET + CHO_COUNT
+JONG_OFFSET = JUNG_OFFSET + JUNG_COUNT - 1
+JAMO_CODE_COUNT = JONG_OFFSET + JONG_COUNT
+
+
+def is_hangul_syllable(char: str) -> bool:
+    return HANGUL_BASE <= ord(char) <= HANGUL_LAST
+
+
+def decompose_syllable(char: str) -> Optional[Tuple[int, int, int]]:
+    """완성형 한글 한 글자 -> (초성, 중성, 종성) 인덱스, 한글이 아니면 None"""
+    if not is_hangul_syllable(char):
+        return None
+    code = ord(char) - HANGUL_BASE
+    return code // (JUNG_COUNT * JONG_COUNT), (code % (JUNG_COUNT * JONG_COUNT)) // JONG_COUNT, code % JONG_COUNT
+
+
+def compose_syllable(cho: int, jung: int, jong: int = 0) -> str:
+    return chr(HANGUL_BASE + (cho * JUNG_COUNT + jung) * JONG_COUNT + jong)
+
+
+def jamo_codes(text: str) -> List[int]:
+    """문자열 -> 자모 정수 코드 목록 (한글이 아닌 글자는 -ord(char))"""
+    codes = []
+    for char in text:
+        parts = decompose_syllable(char)
+        if parts is None:
+            codes.append(-ord(char))
+            continue
+        cho, jung, jong = parts
+        codes.append(CHO_OFFSET + cho)
+        codes.append(JUNG_OFFSET + jung)
+        if jong:
+            codes.append(JONG_OFFSET + jong)
+    return codes
+
+
+def to_jamo_string(text: str) -> str:
+    """첫가끝 자모 문자열로 분해 (jamo.h2j와 같은 결과)"""
+    result = []
+    for char in text:
+        parts = decompose_syllable(char)
+        if parts is None:
+            result.append(char)
+            continue
+        cho, jung, jong = parts
+        result.append(chr(0x1100 + cho))
+        result.append(chr(0x1161 + jung))
+        if jong:
+            result.append(chr(0x11A7 + jong))
+    return "".join(result)
+
+
+def normalize_name(text: str) -> str:
+    """OCR 이름 정규화 (공백 제거)"""
+    return "".join(text.split())
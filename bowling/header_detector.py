@@ -0,0 +1,179 @@
+import logging
+import os
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from PIL import Image
+
+from startup import lazy_import
+from ocr_blocks import BlockTable
+from digit_classifier import DigitClassifier, DIGIT_MODEL_DIR, binarize, find_glyphs, group_glyphs, pixel_features
+
+logger = logging.getLogger(__name__)
+
+np = lazy_import("numpy")
+
+# 헤더 후보로 볼 이미지 내 연결 요소 수 상한 (잡음이 많은 사진은 원격 스캔)
+MAX_GLYPHS = 1500
+# 토큰에 넣을 글자의 최소 신뢰도 (1위/2위 숫자 차이가 거의 없으면 버림)
+MIN_GLYPH_CONFIDENCE = 0.2
+
+
+class LocalHeaderDetector:
+    """1-10 프레임 헤더 로컬 감지기
+
+    이진화한 이미지의 연결 요소 중 숫자 크기인 것을 학습한 글자 샘플과 비교해 읽고, 가까운 글자를 묶어 '10' 같은 토큰을 만든 뒤
+    1부터 10까지 같은 줄에서 오른쪽으로 이어지는 토큰을 찾습니다. 결과는 _detect_numbers_only와 같은 BlockTable.
+    신뢰도 = 헤더 토큰의 평균 글자 신뢰도 x 프레임 간격 규칙성 (한 줄에 1-10이 고른 간격으로 이어지는 것 자체가 강한 근거).
+
+    모니터 글꼴 샘플은 원격 스캔에서 1-10 패턴이 확인될 때마다 그 박스 안의 글자로 학습하고,
+    숫자(0-9)마다 min_samples개가 모이기 전까지는 신뢰도 0 (항상 원격 스캔)입니다.
+    """
+
+    def __init__(self, classifier: Optional[DigitClassifier] = None,
+                 min_confidence: float = float(os.getenv("BOWLING_LOCAL_HEADER_MIN_CONFIDENCE", "0.8")),
+                 min_samples: int = int(os.getenv("BOWLING_LOCAL_HEADER_MIN_SAMPLES", "5"))):
+        self.classifier = classifier or DigitClassifier(os.path.join(DIGIT_MODEL_DIR, "header_digits.npz"))
+        self.min_confidence = min_confidence
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self.local_scans = 0
+        self.remote_scans = 0
+        self.learned = 0
+
+    # ---- 감지 ----
+    def detect(self, image: Image.Image) -> Tuple[Optional[BlockTable], float]:
+        """(헤더 블록, 신뢰도), 헤더를 못 찾으면 (None, 0.0)"""
+        if not self.classifier.ready(self.min_samples):
+            return None, 0.0
+        binary = binarize(np.asarray(image.convert("L")))
+        height = binary.shape[0]
+        best, best_confidence = None, 0.0
+        # 밝은 글자/어두운 글자 모두 시도
+        for mask in (binary, 255 - binary):
+            glyphs = find_glyphs(mask, max(6, height * 0.01), height * 0.12)
+            if not len(glyphs["x"]) or len(glyphs["x"]) > MAX_GLYPHS:
+                continue
+            digits, confidences = self.classifier.classify(pixel_features(glyphs["crops"]))
+            header, confidence = self._find_header(self._tokens(glyphs, digits, confidences))
+            if header is not None and confidence > best_confidence:
+                best, best_confidence = header, confidence
+        return best, best_confidence
+
+    @staticmethod
+    def _tokens(glyphs: Dict[str, Any], digits, confidences) -> List[Dict[str, Any]]:
+        """숫자로 읽힌 글자를 토큰으로 묶고 1-10인 것만 (토큰 신뢰도 = 가장 약한 글자)"""
+        x, y, w, h = (glyphs[key].tolist() for key in ("x", "y", "w", "h"))
+        digits, confidences = digits.tolist(), confidences.tolist()
+        keep = [digit >= 0 and confidence >= MIN_GLYPH_CONFIDENCE for digit, confidence in zip(digits, confidences)]
+        frames = {str(frame) for frame in range(1, 11)}
+        tokens = []
+        for token in group_glyphs(glyphs, keep):
+            text = "".join(str(digits[i]) for i in token)
+            if text not in frames:
+                continue
+            first = token[0]
+            tokens.append({"text": text, "x1": x[first], "y1": min(y[i] for i in token),
+                           "x2": x[token[-1]] + w[token[-1]], "y2": max(y[i] + h[i] for i in token),
+                           "cy": y[first] + h[first] / 2, "h": h[first],
+                           "confidence": min(confidences[i] for i in token)})
+        return tokens
+
+    def _find_header(self, tokens: List[Dict[str, Any]]) -> Tuple[Optional[BlockTable], float]:
+        """'1' 토큰마다 같은 줄 오른쪽으로 2..10을 이어 보고 가장 신뢰도 높은 헤더"""
+        by_value: Dict[int, List[Dict[str, Any]]] = {}
+        for token in tokens:
+            by_value.setdefault(int(token["text"]), []).append(token)
+        best, best_confidence = None, 0.0
+        for start in by_value.get(1, []):
+            chain = [start]
+            for frame in range(2, 11):
+                prev = chain[-1]
+                # 기울어진 사진도 따라가도록 직전 토큰 기준으로 줄을 판단
+                candidates = [token for token in by_value.get(frame, [])
+                              if token["x1"] > prev["x1"] and abs(token["cy"] - prev["cy"]) <= prev["h"] * 0.5
+                              and 0.7 <= token["h"] / prev["h"] <= 1.43]
+                if not candidates:
+                    break
+                chain.append(min(candidates, key=lambda token: token["x1"]))
+            if len(chain) < 10:
+                continue
+            centers = np.array([(token["x1"] + token["x2"]) / 2 for token in chain])
+            gaps = np.diff(centers)
+            variation = float(gaps.std() / gaps.mean()) if gaps.mean() > 0 else 1.0
+            regularity = 1.0 if variation <= 0.2 else max(0.0, 1.0 - (variation - 0.2) * 5)
+            confidence = sum(token["confidence"] for token in chain) / len(chain) * regularity
+            if confidence > best_confidence:
+                best_confidence = confidence
+                best = BlockTable([token["text"] for token in chain],
+                                  np.array([[token["x1"], token["y1"], token["x2"], token["y2"]] for token in chain],
+                                           dtype=np.float64),
+                                  np.array([token["confidence"] for token in chain], dtype=np.float64))
+        return best, best_confidence
+
+    # ---- 학습 ----
+    def learn(self, image: Image.Image, pattern: BlockTable) -> int:
+        """원격 스캔으로 확인된 1-10 헤더 박스 안의 글자를 샘플로 추가 (추가한 글자 수)"""
+        try:
+            binary = binarize(np.asarray(image.convert("L")))
+            box_heights = pattern.y2 - pattern.y1
+            pad = int(box_heights.max() * 0.5)
+            left, top = max(0, int(pattern.x1.min()) - pad), max(0, int(pattern.y1.min()) - pad)
+            right, bottom = int(pattern.x2.max()) + pad, int(pattern.y2.max()) + pad
+            best_features, best_labels = None, []
+            for mask in (binary, 255 - binary):
+                region = np.ascontiguousarray(mask[top:bottom, left:right])
+                glyphs = find_glyphs(region, float(np.median(box_heights)) * 0.5, float(box_heights.max()) * 1.5)
+                centers_x = glyphs["x"] + glyphs["w"] / 2 + left
+                centers_y = glyphs["y"] + glyphs["h"] / 2 + top
+                crops, labels = [], []
+                for text, (x1, y1, x2, y2) in zip(pattern.texts, pattern.boxes.tolist()):
+                    inside = np.flatnonzero((centers_x >= x1) & (centers_x <= x2)
+                                            & (centers_y >= y1) & (centers_y <= y2))
+                    # 박스 안 글자 수가 텍스트 길이와 같을 때만 (x 순서 = 글자 순서)
+                    if len(inside) == len(text):
+                        crops.extend(glyphs["crops"][i] for i in inside.tolist())
+                        labels.extend(int(char) for char in text)
+                if len(labels) > len(best_labels):
+                    best_features, best_labels = crops, labels
+            # 헤더 글자(1,0,2..9 = 11개) 대부분이 맞아야 학습 (극성/박스가 어긋난 사진은 제외)
+            if len(best_labels) < 9:
+                return 0
+            added = self.classifier.add(pixel_features(best_features), best_labels)
+            with self._lock:
+                self.learned += added
+            return added
+        except Exception as e:
+            logger.warning("헤더 숫자 학습 실패: %s", e)
+            return 0
+
+    # ---- 통계 ----
+    def record(self, local: bool):
+        with self._lock:
+            if local:
+                self.local_scans += 1
+            else:
+                self.remote_scans += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {"local_scans": self.local_scans, "remote_scans": self.remote_scans, "learned": self.learned}
+        stats["samples"] = sum(self.classifier.counts())
+        return stats
+
+    def collect_metrics(self):
+        """/metrics 수집기"""
+        stats = self.stats()
+        return [
+            ("bowling_header_scans_total", "counter", "Frame-header scans by detector", {"detector": "local"},
+             stats["local_scans"]),
+            ("bowling_header_scans_total", "counter", "Frame-header scans by detector", {"detector": "remote"},
+             stats["remote_scans"]),
+            ("bowling_header_digit_samples", "gauge", "Stored monitor-font digit samples for the local detector",
+             None, stats["samples"]),
+            ("bowling_header_digits_learned_total", "counter", "Digit samples learned from confirmed remote scans",
+             None, stats["learned"]),
+        ]
+
+
+header_detector = LocalHeaderDetector() if os.getenv("BOWLING_LOCAL_HEADER", "1") == "1" else None
@@ -1,73 +1,158 @@
 import logging
 from PIL import Image, ImageEnhance, ImageFilter
-import cv2
-import numpy as np
 import io
 import os
+import threading
+import time
 from datetime import datetime
 from typing import Dict, Any, List, Optional
-from google.cloud import vision
-from dotenv import load_dotenv
+from startup import load_env, lazy_import
+from metrics import span, ocr_span
+from log_config import SAMPLED
+from ocr_batcher import current_batcher
+from ocr_cassette import wrap_client
+from ocr_deadline import call_with_deadline, keepalive_channel_options, is_retryable, OCRDeadlineExceeded
+from ocr_breaker import vision_breaker
+from local_ocr import get_local_engine
+from result_cache import result_cache as default_result_cache, region_fingerprint
+from ocr_blocks import BlockTable, BlockTableBuilder
+from header_detector import header_detector as default_header_detector
+from score_reader import score_reader as default_score_reader
+from layout_cache import layout_cache as default_layout_cache, layout_signature
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO)
+# 로깅 설정은 실행 진입점(bowling.py의 setup_logging)에서 담당
+# 단계별 레벨 조정용 하위 로거: image_analyzer.ocr (Vision 호출), image_analyzer.region (좌표 계산)
 logger = logging.getLogger(__name__)
+ocr_logger = logging.getLogger(f"{__name__}.ocr")
+region_logger = logging.getLogger(f"{__name__}.region")
 
-# .env 파일 로드 (부모 폴더에서)
-load_dotenv("../.env")
-
-# 환경 변수 확인
-credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-if credentials_path:
-    # ~ 확장
-    credentials_path = os.path.expanduser(credentials_path)
-    logger.info(f"Google Cloud 인증 파일 경로: {credentials_path}")
-    if os.path.exists(credentials_path):
-        logger.info("Google Cloud 인증 파일이 존재합니다.")
-    else:
-        logger.warning("Google Cloud 인증 파일이 존재하지 않습니다.")
-else:
-    logger.warning("GOOGLE_APPLICATION_CREDENTIALS 환경 변수가 설정되지 않았습니다.")
+# 무거운 의존성은 첫 사용 시점에 로드 (서비스 시작 단계의 예열에서 미리 로드)
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+vision = lazy_import("google.cloud.vision")
 
 class ImageAnalyzer:
     """이미지 분석을 담당하는 클래스"""
     
-    def __init__(self, upload_dir: str = "uploads"):
-        # 환경 변수 로드
-        load_dotenv("../.env")
+    def __init__(self, upload_dir: str = "uploads", client=None, breaker=None, result_cache=None,
+                 header_detector=None, score_reader=None, layout_cache=None):
+        # Vision 클라이언트는 첫 사용(또는 시작 단계 예열) 때 생성
+        # 외부에서 주입한 클라이언트 우선 (테스트/벤치마크용)
+        self._client = client
+        self._client_ready = False
+        self._client_lock = threading.Lock()
+        # 원격 OCR이 느리거나 실패하면 로컬 OCR(PaddleOCR)로 전환
+        self.breaker = breaker or vision_breaker
+        # 같은 모니터를 연달아 찍은 사진은 영역 인식 결과 재사용 (BOWLING_RESULT_CACHE=0이면 끔)
+        self.result_cache = result_cache if result_cache is not None else default_result_cache
+        # 1-10 프레임 헤더를 로컬에서 먼저 찾고, 신뢰도가 낮을 때만 원격 숫자 스캔 (BOWLING_LOCAL_HEADER=0이면 끔)
+        self.header_detector = header_detector if header_detector is not None else default_header_detector
+        # 총점 칸도 로컬 숫자 인식을 먼저 시도 (BOWLING_LOCAL_SCORE=0이면 끔)
+        self.score_reader = score_reader if score_reader is not None else default_score_reader
+        # 같은 볼링장/각도의 사진은 검증된 스코어보드 배치 재사용 (BOWLING_LAYOUT_CACHE=0이면 끔)
+        self.layout_cache = layout_cache if layout_cache is not None else default_layout_cache
         
-        # Google Cloud Vision API 클라이언트 초기화 (timeout 30초 설정)
+        self.upload_dir = upload_dir
+        self.analyzed_dir = "analyzed"
+        self._dirs_ready = False
+    
+    def _create_client(self):
+        """Google Cloud Vision API 클라이언트 생성"""
+        load_env()
         credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
         if credentials_path:
             credentials_path = os.path.expanduser(credentials_path)
             if os.path.exists(credentials_path):
                 os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = credentials_path
-                # timeout 30초로 설정
-                from google.api_core import client_options
-                client_options_obj = client_options.ClientOptions(
-                    api_endpoint="vision.googleapis.com",
-                    api_audience=None,
-                    quota_project_id=None,
-                    api_key=None,
-                    scopes=None
-                )
-                self.client = vision.ImageAnnotatorClient(client_options=client_options_obj)
-            else:
-                self.client = None
-        else:
-            self.client = None
-        
-        # 업로드 디렉토리 생성
-        self.upload_dir = upload_dir
-        os.makedirs(upload_dir, exist_ok=True)
+                return self._create_grpc_client()
+        return None
+    
+    def _create_grpc_client(self):
+        """keepalive 채널을 쓰는 Vision 클라이언트 (호출 마감은 호출마다 timeout으로 지정)"""
+        from google.api_core import client_options
+        client_options_obj = client_options.ClientOptions(api_endpoint="vision.googleapis.com")
+        try:
+            from google.cloud.vision_v1.services.image_annotator.transports import ImageAnnotatorGrpcTransport
+            channel = ImageAnnotatorGrpcTransport.create_channel(options=keepalive_channel_options())
+            return vision.ImageAnnotatorClient(transport=ImageAnnotatorGrpcTransport(channel=channel))
+        except Exception as e:
+            logger.warning("keepalive 채널 생성 실패, 기본 채널 사용: %s", e)
+            return vision.ImageAnnotatorClient(client_options=client_options_obj)
+    
+    @property
+    def client(self):
+        if not self._client_ready:
+            with self._client_lock:
+                if not self._client_ready:
+                    client = self._client if self._client is not None else self._create_client()
+                    # BOWLING_OCR_MODE=record/replay: 요청/응답 카세트 기록 또는 오프라인 재생
+                    self._client = wrap_client(client)
+                    self._client_ready = True
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+        self._client_ready = True
+    
+    def prepare(self):
+        """업로드/분석 결과 디렉토리 생성 (최초 1회)"""
+        if not self._dirs_ready:
+            os.makedirs(self.upload_dir, exist_ok=True)
+            os.makedirs(self.analyzed_dir, exist_ok=True)
+            self._dirs_ready = True
+    
+    def warm_up(self):
+        """작은 이미지로 Vision 호출 1회 (인증 토큰 발급, 채널 연결을 요청 전에 끝냄)"""
+        image = Image.new("RGB", (64, 32), "white")
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        self._call_vision("text_detection", vision.Image(content=buffer.getvalue()))
+    
+    def _call_vision(self, method: str, image_vision):
+        """Vision API 호출 공통 진입점 (호출별 시간 측정, 요청 예산 내 재시도/헤지, 회로 차단 시 로컬 OCR)"""
+        client = self.client
+        if client is None or not self.breaker.allow_request():
+            return self._call_local(method, image_vision)
         
-        # 분석 결과 저장 디렉토리 생성
-        self.analyzed_dir = "analyzed"
-        os.makedirs(self.analyzed_dir, exist_ok=True)
+        started = time.monotonic()
+        try:
+            with ocr_span(method):
+                response = self._call_remote(client, method, image_vision)
+        except Exception as e:
+            backend_failure = is_retryable(e) or isinstance(e, OCRDeadlineExceeded)
+            self.breaker.record(not backend_failure, time.monotonic() - started)
+            if backend_failure and get_local_engine() is not None:
+                ocr_logger.warning("Vision %s 실패, 로컬 OCR로 대체: %s", method, e)
+                return self._call_local(method, image_vision)
+            raise
+        self.breaker.record(True, time.monotonic() - started)
+        return response
+    
+    def _call_remote(self, client, method: str, image_vision):
+        # 배치 인식 중이면 다른 이미지 요청과 묶어서 호출 (배치 요청은 헤지하지 않음)
+        batcher = current_batcher()
+        if batcher is not None:
+            return call_with_deadline(method, lambda timeout: batcher.call(method, image_vision, timeout=timeout),
+                                      hedge=False)
+        vision_method = getattr(client, method)
+        # 재시도는 call_with_deadline이 예산 안에서 담당하므로 클라이언트 기본 재시도는 끔
+        return call_with_deadline(method, lambda timeout: vision_method(image=image_vision, timeout=timeout,
+                                                                        retry=None))
+    
+    def _call_local(self, method: str, image_vision):
+        """로컬 OCR 엔진으로 같은 형식의 응답 생성"""
+        engine = get_local_engine()
+        if engine is None:
+            raise RuntimeError("원격 OCR을 사용할 수 없고 로컬 OCR 엔진도 없습니다.")
+        self.breaker.record_fallback()
+        with ocr_span(f"local_{method}"):
+            return getattr(engine, method)(image=image_vision)
     
     def save_uploaded_image(self, image: Image.Image, filename: str = None) -> str:
         """업로드된 이미지 저장 (웹페이지용) - 더 이상 사용하지 않음"""
         try:
+            self.prepare()
             # 항상 bowling_score_ 형식으로 강제 저장
             import time
             timestamp = time.strftime("%Y%m%d_%H%M%S")
@@ -76,12 +161,12 @@ class ImageAnalyzer:
             # uploads 폴더에 저장
             filepath = os.path.join(self.upload_dir, filename)
             image.save(filepath, "JPEG", quality=95)
-            logger.info(f"업로드된 이미지 저장: {filepath}")
+            logger.info("업로드된 이미지 저장: %s", filepath)
             
             return filename
             
         except Exception as e:
-            logger.error(f"이미지 저장 오류: {e}")
+            logger.error("이미지 저장 오류: %s", e)
             return ""
     
     def preprocess_image(self, image: Image.Image, method: str = "auto") -> Image.Image:
@@ -105,7 +190,7 @@ class ImageAnalyzer:
             processed_image = Image.fromarray(binary)
             return processed_image
         except Exception as e:
-            logger.error(f"이미지 전처리 오류: {e}")
+            logger.error("이미지 전처리 오류: %s", e)
             return image
 
     def apply_score_postprocess(self, image: Image.Image) -> Image.Image:
@@ -137,30 +222,69 @@ class ImageAnalyzer:
             
             return Image.fromarray(cleaned)
         except Exception as e:
-            logger.error(f"score_part 후처리 오류: {e}")
+            logger.error("score_part 후처리 오류: %s", e)
             return image
 
     def extract_text_with_positions(self, image: Image.Image, lang: str = "kor+eng") -> Dict[str, Any]:
         """텍스트와 위치 정보 추출 - 숫자 우선 감지 방식"""
         try:
-            # PIL Image를 bytes로 변환
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format='PNG')
-            img_byte_arr = img_byte_arr.getvalue()
-            
-            # Vision API 요청 생성
-            image_vision = vision.Image(content=img_byte_arr)
-            
-            # 1단계: 숫자 우선 감지 (빠른 스캔)
-            number_blocks = self._detect_numbers_only(image_vision)
-            
-            # 2단계: 스코어보드 영역 확정
-            scoreboard_region = self._identify_scoreboard_region(number_blocks, image.size)
-            if scoreboard_region:
-                # 해당 영역만 정밀 분석
-                return self._analyze_scoreboard_region(image, scoreboard_region)
+            # 0단계: 검증된 볼링장 배치가 있으면 헤더 감지/영역 계산 (전체 이미지 인코딩 포함) 생략
+            layout_info = None
+            layout = None
+            if self.layout_cache is not None:
+                with span("layout_cache"):
+                    signature = layout_signature(image)
+                    layout = self.layout_cache.lookup(image, signature)
+            
+            if layout is not None:
+                scoreboard_region = layout['region']
+                layout_info = {'hit': True, 'key': layout['key']}
             else:
-                return self._analyze_full_image(image_vision)
+                # PIL Image를 bytes로 변환
+                img_byte_arr = io.BytesIO()
+                image.save(img_byte_arr, format='PNG')
+                img_byte_arr = img_byte_arr.getvalue()
+                
+                # Vision API 요청 생성
+                image_vision = vision.Image(content=img_byte_arr)
+                
+                # 1단계: 숫자 우선 감지 (로컬 헤더 감지, 신뢰도가 낮으면 빠른 원격 스캔)
+                with span("header_scan"):
+                    number_blocks = self._detect_header_numbers(image, image_vision)
+                
+                # 2단계: 스코어보드 영역 확정
+                with span("region_identify"):
+                    scoreboard_region = self._identify_scoreboard_region(number_blocks, image.size)
+                
+                # 인식 결과가 완전하면 analyze_image에서 배치 저장
+                if scoreboard_region and self.layout_cache is not None:
+                    pattern = self._find_consecutive_1_to_10(number_blocks)
+                    if pattern is not None:
+                        header_box = (float(pattern.x1.min()), float(pattern.y1.min()),
+                                      float(pattern.x2.max()), float(pattern.y2.max()))
+                        layout_info = {'hit': False, 'signature': signature, 'header_box': header_box,
+                                       'region': scoreboard_region}
+            
+            # 근접 중복 사진이면 캐시된 결과 사용 (영역 OCR 생략)
+            fingerprint = None
+            if scoreboard_region and self.result_cache is not None:
+                with span("result_cache"):
+                    fingerprint = region_fingerprint(image, scoreboard_region)
+                    cached = self.result_cache.lookup(fingerprint)
+                if cached is not None:
+                    return {**cached['ocr_result'], 'result_cache': {'hit': True, 'source': cached['source'],
+                                                                     'region_analysis': cached['region_analysis']},
+                            'layout_cache': layout_info}
+            with span("scoreboard_ocr"):
+                if scoreboard_region:
+                    # 해당 영역만 정밀 분석
+                    ocr_result = self._analyze_scoreboard_region(image, scoreboard_region)
+                    if fingerprint is not None:
+                        ocr_result['result_cache'] = {'hit': False, 'fingerprint': fingerprint}
+                    ocr_result['layout_cache'] = layout_info
+                    return ocr_result
+                else:
+                    return self._analyze_full_image(image_vision)
             
         except Exception as e:
             return {'full_text': '', 'blocks': [], 'method': 'error'}
@@ -173,14 +297,14 @@ class ImageAnalyzer:
             name_filename = f"{original_filename}_name_part.jpg"
             name_filepath = os.path.join(self.analyzed_dir, name_filename)
             name_image.save(name_filepath, "JPEG", quality=95)
-            logger.info(f"이름 영역 이미지 저장: {name_filepath}")
+            logger.info("이름 영역 이미지 저장: %s", name_filepath)
             # 기존 스코어 영역 (전처리 적용)
             score_image = processed_image.crop((region['total_x1'], region['total_y1'], region['total_x2'], region['total_y2']))
             score_image = self.apply_score_postprocess(score_image)
             score_filename = f"{original_filename}_score_part.jpg"
             score_filepath = os.path.join(self.analyzed_dir, score_filename)
             score_image.save(score_filepath, "JPEG", quality=95)
-            logger.info(f"스코어 영역 이미지 저장 (전처리): {score_filepath}")
+            logger.info("스코어 영역 이미지 저장 (전처리): %s", score_filepath)
             
             # 새로운 스코어 영역 (전처리 없음) - name_part와 동일한 Y좌표 사용
             score_x1 = region['total_x2']  # 546
@@ -192,39 +316,39 @@ class ImageAnalyzer:
             score_filename2 = f"{original_filename}_score_part2.jpg"
             score_filepath2 = os.path.join(self.analyzed_dir, score_filename2)
             score_image2.save(score_filepath2, "JPEG", quality=95)
-            logger.info(f"스코어 영역 이미지 저장 (전처리 없음): {score_filepath2}")
+            logger.info("스코어 영역 이미지 저장 (전처리 없음): %s", score_filepath2)
             # 이름 분석
             name_result = self._analyze_korean_text(name_image)
             korean_names = self._extract_korean_names(name_result)
             name_count = len(korean_names)
             
             # score_part2 먼저 시도 (전처리 없음)
-            score_result2 = self._analyze_numbers_only(score_image2)
+            score_result2 = self._read_score_numbers(score_image2, name_count)
             numbers2 = self._extract_numbers(score_result2)
             numbers2_count = len(numbers2) if numbers2 else 0
             
-            logger.info(f"이름 개수: {name_count}, score_part2 개수: {numbers2_count}")
+            logger.info("이름 개수: %s, score_part2 개수: %s", name_count, numbers2_count)
             
             # score_part2에서 숫자 개수가 이름 개수와 같으면 바로 사용 (score_part 확인 안함)
             if numbers2_count == name_count and numbers2:
                 final_numbers = numbers2
                 final_score_result = score_result2
                 final_score_filepath = score_filepath2
-                logger.info(f"score_part2 사용 (이름 {name_count}명, 숫자 {numbers2_count}개 완벽 매칭) - score_part 확인 안함")
+                logger.info("score_part2 사용 (이름 %s명, 숫자 %s개 완벽 매칭) - score_part 확인 안함", name_count, numbers2_count)
             else:
                 # score_part2가 매칭 안 되면 score_part 시도
-                score_result = self._analyze_numbers_only(score_image)
+                score_result = self._read_score_numbers(score_image, name_count)
                 numbers = self._extract_numbers(score_result)
                 numbers_count = len(numbers) if numbers else 0
                 
-                logger.info(f"score_part 개수: {numbers_count}")
+                logger.info("score_part 개수: %s", numbers_count)
                 
                 # 복잡한 점수 매칭 로직 (기존 방식)
                 if numbers_count == name_count and numbers:
                     final_numbers = numbers
                     final_score_result = score_result
                     final_score_filepath = score_filepath
-                    logger.info(f"score_part 사용 (이름 {name_count}명, 숫자 {numbers_count}개 완벽 매칭)")
+                    logger.info("score_part 사용 (이름 %s명, 숫자 %s개 완벽 매칭)", name_count, numbers_count)
                 
                 # 둘 다 사람 수보다 적게 나온 경우
                 elif numbers2_count < name_count and numbers_count < name_count:
@@ -233,12 +357,12 @@ class ImageAnalyzer:
                         final_numbers = numbers2
                         final_score_result = score_result2
                         final_score_filepath = score_filepath2
-                        logger.info(f"score_part2 선택 (개수 우선: {numbers2_count} > {numbers_count})")
+                        logger.info("score_part2 선택 (개수 우선: %s > %s)", numbers2_count, numbers_count)
                     elif numbers_count > numbers2_count:
                         final_numbers = numbers
                         final_score_result = score_result
                         final_score_filepath = score_filepath
-                        logger.info(f"score_part 선택 (개수 우선: {numbers_count} > {numbers2_count})")
+                        logger.info("score_part 선택 (개수 우선: %s > %s)", numbers_count, numbers2_count)
                     else:
                         # 개수가 같으면 합계가 높은 걸 선택
                         sum2 = sum(numbers2) if numbers2 else 0
@@ -247,12 +371,12 @@ class ImageAnalyzer:
                             final_numbers = numbers2
                             final_score_result = score_result2
                             final_score_filepath = score_filepath2
-                            logger.info(f"score_part2 선택 (합계 우선: {sum2} >= {sum1})")
+                            logger.info("score_part2 선택 (합계 우선: %s >= %s)", sum2, sum1)
                         else:
                             final_numbers = numbers
                             final_score_result = score_result
                             final_score_filepath = score_filepath
-                            logger.info(f"score_part 선택 (합계 우선: {sum1} > {sum2})")
+                            logger.info("score_part 선택 (합계 우선: %s > %s)", sum1, sum2)
                 
                 # 하나는 사람 수보다 많고 하나는 적은 경우
                 elif (numbers2_count > name_count and numbers_count < name_count) or (numbers2_count < name_count and numbers_count > name_count):
@@ -260,12 +384,12 @@ class ImageAnalyzer:
                         final_numbers = numbers2[:name_count]
                         final_score_result = score_result2
                         final_score_filepath = score_filepath2
-                        logger.info(f"score_part2 사용 (앞에서 {name_count}개 선택)")
+                        logger.info("score_part2 사용 (앞에서 %s개 선택)", name_count)
                     else:
                         final_numbers = numbers[:name_count]
                         final_score_result = score_result
                         final_score_filepath = score_filepath
-                        logger.info(f"score_part 사용 (앞에서 {name_count}개 선택)")
+                        logger.info("score_part 사용 (앞에서 %s개 선택)", name_count)
                 
                 # 둘 다 사람 수보다 많은 경우
                 elif numbers2_count > name_count and numbers_count > name_count:
@@ -273,25 +397,22 @@ class ImageAnalyzer:
                         final_numbers = numbers2[:name_count]
                         final_score_result = score_result2
                         final_score_filepath = score_filepath2
-                        logger.info(f"score_part2 선택 (개수 적음: {numbers2_count} <= {numbers_count})")
+                        logger.info("score_part2 선택 (개수 적음: %s <= %s)", numbers2_count, numbers_count)
                     else:
                         final_numbers = numbers[:name_count]
                         final_score_result = score_result
                         final_score_filepath = score_filepath
-                        logger.info(f"score_part 선택 (개수 적음: {numbers_count} < {numbers2_count})")
+                        logger.info("score_part 선택 (개수 적음: %s < %s)", numbers_count, numbers2_count)
                 
                 # 기본값
                 else:
                     final_numbers = numbers2 if numbers2 else numbers
                     final_score_result = score_result2 if numbers2 else score_result
                     final_score_filepath = score_filepath2 if numbers2 else score_filepath
-                    logger.info(f"기본값 사용 (이름 {name_count}명, 숫자 {len(final_numbers)}개)")
+                    logger.info("기본값 사용 (이름 %s명, 숫자 %s개)", name_count, len(final_numbers))
             
-            logger.info(f"=== 분석 결과 ===")
-            logger.info(f"한글 이름 리스트: {korean_names}")
-            logger.info(f"숫자 리스트 (전처리): {numbers}")
-            logger.info(f"숫자 리스트 (전처리 없음): {numbers2}")
-            logger.info(f"최종 사용 숫자 리스트: {final_numbers}")
+            logger.info("영역 분석 결과 - 이름: %s, 숫자(전처리): %s, 숫자(전처리 없음): %s, 최종: %s",
+                        korean_names, numbers, numbers2, final_numbers)
             
             return {
                 'name_part': {
@@ -316,7 +437,7 @@ class ImageAnalyzer:
                 }
             }
         except Exception as e:
-            logger.error(f"save_and_analyze_regions 오류: {e}")
+            logger.error("save_and_analyze_regions 오류: %s", e)
             return {}
     
     def _extract_korean_names(self, text: str) -> List[str]:
@@ -357,53 +478,73 @@ class ImageAnalyzer:
     def _analyze_korean_text(self, image: Image.Image) -> str:
         """한글 텍스트 전용 분석"""
         try:
-            logger.info("한글 텍스트 분석 시작")
+            ocr_logger.debug("한글 텍스트 분석 시작")
             
             # Vision API 요청 생성
             img_byte_arr = io.BytesIO()
             image.save(img_byte_arr, format='PNG')
             img_byte_arr = img_byte_arr.getvalue()
-            logger.info(f"이미지 바이트 변환 완료: {len(img_byte_arr)} bytes")
+            ocr_logger.debug("이미지 바이트 변환 완료: %s bytes", len(img_byte_arr))
             
             image_vision = vision.Image(content=img_byte_arr)
-            logger.info("Vision API 이미지 객체 생성 완료")
+            ocr_logger.debug("Vision API 이미지 객체 생성 완료")
             
             # 한글 텍스트 감지
-            logger.info("Google Cloud Vision API text_detection 호출 시작...")
-            response = self.client.text_detection(image=image_vision)
-            logger.info("Google Cloud Vision API text_detection 호출 완료")
+            ocr_logger.debug("Google Cloud Vision API text_detection 호출 시작...")
+            response = self._call_vision("text_detection", image_vision)
+            ocr_logger.debug("Google Cloud Vision API text_detection 호출 완료")
             
             if response.text_annotations:
                 # 첫 번째는 전체 텍스트
                 full_text = response.text_annotations[0].description
-                logger.info(f"한글 텍스트 분석 결과: {full_text[:100]}...")
+                ocr_logger.debug("한글 텍스트 분석 결과: %.100s...", full_text, extra=SAMPLED)
                 return full_text
             else:
                 logger.warning("한글 텍스트 분석 결과 없음")
                 return ""
                 
         except Exception as e:
-            logger.error(f"한글 텍스트 분석 오류: {e}")
+            logger.error("한글 텍스트 분석 오류: %s", e)
             return ""
     
+    def _read_score_numbers(self, image: Image.Image, expected_count: int) -> str:
+        """총점 칸 숫자 (로컬 인식 신뢰도가 기준 이상이고 개수가 이름 수와 같으면 원격 호출 생략)"""
+        reader = self.score_reader
+        if reader is None or not expected_count:
+            return self._analyze_numbers_only(image)
+        with span("local_score"):
+            numbers, confidence = reader.read(image)
+        if len(numbers) == expected_count and confidence >= reader.min_confidence:
+            reader.record(local=True)
+            logger.info("로컬 총점 인식 사용: %s (신뢰도 %.2f)", numbers, confidence)
+            return " ".join(str(number) for number in numbers)
+        reader.record(local=False)
+        
+        result = self._analyze_numbers_only(image)
+        # 원격 결과가 이름 수와 맞으면(검증됨) 그 글자로 로컬 인식기 학습
+        numbers = self._extract_numbers(result)
+        if len(numbers) == expected_count:
+            reader.learn(image, numbers)
+        return result
+    
     def _analyze_numbers_only(self, image: Image.Image) -> str:
         """숫자 전용 분석"""
         try:
-            logger.info("숫자 분석 시작")
+            ocr_logger.debug("숫자 분석 시작")
             
             # Vision API 요청 생성
             img_byte_arr = io.BytesIO()
             image.save(img_byte_arr, format='PNG')
             img_byte_arr = img_byte_arr.getvalue()
-            logger.info(f"숫자 분석 이미지 바이트 변환 완료: {len(img_byte_arr)} bytes")
+            ocr_logger.debug("숫자 분석 이미지 바이트 변환 완료: %s bytes", len(img_byte_arr))
             
             image_vision = vision.Image(content=img_byte_arr)
-            logger.info("숫자 분석 Vision API 이미지 객체 생성 완료")
+            ocr_logger.debug("숫자 분석 Vision API 이미지 객체 생성 완료")
             
             # 숫자만 감지
-            logger.info("Google Cloud Vision API 숫자 분석 호출 시작...")
-            response = self.client.text_detection(image=image_vision)
-            logger.info("Google Cloud Vision API 숫자 분석 호출 완료")
+            ocr_logger.debug("Google Cloud Vision API 숫자 분석 호출 시작...")
+            response = self._call_vision("text_detection", image_vision)
+            ocr_logger.debug("Google Cloud Vision API 숫자 분석 호출 완료")
             
             numbers = []
             if response.text_annotations:
@@ -414,89 +555,81 @@ class ImageAnalyzer:
                         numbers.append(text)
             
             result = " ".join(numbers)
-            logger.info(f"숫자 분석 결과: {result}")
+            logger.info("숫자 분석 결과: %s", result)
             return result
                 
         except Exception as e:
-            logger.error(f"숫자 분석 오류: {e}")
+            logger.error("숫자 분석 오류: %s", e)
             return ""
     
-    def _detect_numbers_only(self, image_vision) -> List[Dict]:
+    def _detect_header_numbers(self, image: Image.Image, image_vision) -> BlockTable:
+        """프레임 헤더 숫자 감지 (로컬 감지기 신뢰도가 기준 이상이면 원격 호출 생략)"""
+        detector = self.header_detector
+        if detector is not None:
+            with span("local_header"):
+                header_blocks, confidence = detector.detect(image)
+            if header_blocks is not None and confidence >= detector.min_confidence:
+                detector.record(local=True)
+                region_logger.info("로컬 헤더 감지 사용 (신뢰도 %.2f)", confidence)
+                return header_blocks
+            detector.record(local=False)
+            region_logger.debug("로컬 헤더 신뢰도 낮음 (%.2f), 원격 스캔", confidence)
+        
+        number_blocks = self._detect_numbers_only(image_vision)
+        # 원격 스캔에서 1-10 패턴이 확인되면 그 글자로 로컬 감지기 학습
+        if detector is not None:
+            pattern = self._find_consecutive_1_to_10(number_blocks)
+            if pattern is not None:
+                detector.learn(image, pattern)
+        return number_blocks
+    
+    def _detect_numbers_only(self, image_vision) -> BlockTable:
         """숫자만 감지 (빠른 스캔)"""
         try:
-            logger.info("숫자 감지 (빠른 스캔) 시작")
+            ocr_logger.debug("숫자 감지 (빠른 스캔) 시작")
             # 숫자만 감지하는 빠른 API 호출
-            logger.info("Google Cloud Vision API 숫자 감지 호출 시작...")
-            response = self.client.text_detection(image=image_vision)
-            logger.info("Google Cloud Vision API 숫자 감지 호출 완료")
+            ocr_logger.debug("Google Cloud Vision API 숫자 감지 호출 시작...")
+            response = self._call_vision("text_detection", image_vision)
+            ocr_logger.debug("Google Cloud Vision API 숫자 감지 호출 완료")
             
-            number_blocks = []
+            builder = BlockTableBuilder()
             if response.text_annotations:
                 for annotation in response.text_annotations[1:]:  # 첫 번째는 전체 텍스트
                     text = annotation.description.strip()
                     # 숫자만 필터링 (1-10 범위)
                     if text.isdigit() and 1 <= int(text) <= 10:
-                        vertices = annotation.bounding_poly.vertices
-                        if len(vertices) >= 4:
-                            x_coords = [vertex.x for vertex in vertices]
-                            y_coords = [vertex.y for vertex in vertices]
-                            bbox_rect = [min(x_coords), min(y_coords), max(x_coords), max(y_coords)]
-                            number_blocks.append({
-                                'text': text,
-                                'bbox': bbox_rect,
-                                'confidence': annotation.confidence if hasattr(annotation, 'confidence') else 0.8
-                            })
-                            print(f"숫자 감지: {text} at ({bbox_rect[0]}, {bbox_rect[1]}, {bbox_rect[2]}, {bbox_rect[3]})")
-            
-            print(f"감지된 숫자 블록 수: {len(number_blocks)}")
+                        confidence = annotation.confidence if hasattr(annotation, 'confidence') else 0.8
+                        builder.append(text, confidence, annotation.bounding_poly.vertices)
+            
+            number_blocks = builder.build()
+            if region_logger.isEnabledFor(logging.DEBUG):
+                region_logger.debug("숫자 감지: %s", list(zip(number_blocks.texts, number_blocks.boxes.tolist())))
+            region_logger.info("감지된 숫자 블록 수: %s", len(number_blocks))
             return number_blocks
             
         except Exception as e:
-            return []
+            return BlockTable.empty()
     
-    def _calculate_scoreboard_slope(self, consecutive_pattern: List[Dict]) -> dict:
+    def _calculate_scoreboard_slope(self, consecutive_pattern: BlockTable) -> dict:
         """1-10 프레임의 기울기와 높이 변화 계산"""
         try:
-            if len(consecutive_pattern) < 2:
+            # 프레임 중심점의 선형 회귀 (기울기)와 1/10프레임 높이
+            fit = BlockTable.coerce(consecutive_pattern).line_fit()
+            if fit is None:
                 return {"slope": 0.0, "height_change": 0.0, "perspective_factor": 0.0}
             
-            # 각 프레임의 중심점과 높이 계산
-            centers = []
-            heights = []
-            for block in consecutive_pattern:
-                bbox = block['bbox']
-                center_x = (bbox[0] + bbox[2]) / 2
-                center_y = (bbox[1] + bbox[3]) / 2
-                height = bbox[3] - bbox[1]  # 높이
-                centers.append((center_x, center_y))
-                heights.append(height)
-            
-            # 선형 회귀로 기울기 계산
-            x_coords = [center[0] for center in centers]
-            y_coords = [center[1] for center in centers]
-            
-            n = len(centers)
-            if n < 2:
-                return {"slope": 0.0, "height_change": 0.0, "perspective_factor": 0.0}
-            
-            sum_x = sum(x_coords)
-            sum_y = sum(y_coords)
-            sum_xy = sum(x * y for x, y in zip(x_coords, y_coords))
-            sum_x2 = sum(x * x for x in x_coords)
-            
-            # 기울기 계산
-            slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
+            slope = fit["slope"]
             
             # 높이 변화 계산 (원근감)
-            first_height = heights[0]  # 1프레임 높이
-            last_height = heights[-1]  # 10프레임 높이
+            first_height = fit["first_height"]  # 1프레임 높이
+            last_height = fit["last_height"]  # 10프레임 높이
             height_change = last_height - first_height
             
             # 원근감 계수 (높이 변화율)
-            total_width = x_coords[-1] - x_coords[0]
+            total_width = fit["width"]
             perspective_factor = height_change / total_width if total_width > 0 else 0.0
             
-            logger.info(f"스코어보드 기울기: {slope:.4f}, 높이 변화: {height_change:.2f}, 원근감 계수: {perspective_factor:.4f}")
+            region_logger.debug("스코어보드 기울기: %.4f, 높이 변화: %.2f, 원근감 계수: %.4f", slope, height_change, perspective_factor)
             
             return {
                 "slope": slope,
@@ -507,7 +640,7 @@ class ImageAnalyzer:
             }
             
         except Exception as e:
-            logger.error(f"기울기 계산 오류: {e}")
+            logger.error("기울기 계산 오류: %s", e)
             return {"slope": 0.0, "height_change": 0.0, "perspective_factor": 0.0}
     
     def _calculate_tilted_region(self, frame_1: Dict, frame_10: Dict, scoreboard_width: int, 
@@ -543,7 +676,7 @@ class ImageAnalyzer:
                     adjusted_y1 += perspective_adjustment
                     adjusted_y2 += perspective_adjustment
                     
-                    logger.info(f"이름 영역 3D 변환: 기울기={slope:.4f}, 원근감={perspective_factor:.4f}")
+                    region_logger.debug("이름 영역 3D 변환: 기울기=%.4f, 원근감=%.4f", slope, perspective_factor)
                     return (base_x1, adjusted_y1, base_x2, adjusted_y2)
                 else:
                     return (base_x1, base_y1, base_x2, base_y2)
@@ -566,7 +699,7 @@ class ImageAnalyzer:
                     adjusted_y1 += perspective_adjustment
                     adjusted_y2 += perspective_adjustment
                     
-                    logger.info(f"스코어 영역 3D 변환: 기울기={slope:.4f}, 원근감={perspective_factor:.4f}")
+                    region_logger.debug("스코어 영역 3D 변환: 기울기=%.4f, 원근감=%.4f", slope, perspective_factor)
                     return (base_x1, adjusted_y1, base_x2, adjusted_y2)
                 else:
                     return (base_x1, base_y1, base_x2, base_y2)
@@ -574,7 +707,7 @@ class ImageAnalyzer:
             return (0, 0, 0, 0)
             
         except Exception as e:
-            logger.error(f"3D 영역 계산 오류: {e}")
+            logger.error("3D 영역 계산 오류: %s", e)
             # 오류 시 기본값 반환
             if region_type == "name":
                 return (max(0, frame_1_left - int(scoreboard_width * 0.3)), 
@@ -585,9 +718,10 @@ class ImageAnalyzer:
                        frame_10_right + gap_half, 
                        frame_10_bottom + int(scoreboard_width * 0.5))
     
-    def _identify_scoreboard_region(self, number_blocks: List[Dict], image_size) -> Optional[Dict]:
+    def _identify_scoreboard_region(self, number_blocks: BlockTable, image_size) -> Optional[Dict]:
         """스코어보드 영역 식별 (인식된 순서대로 1-10 패턴 찾기)"""
         try:
+            number_blocks = BlockTable.coerce(number_blocks)
             if len(number_blocks) < 5:  # 최소 5개 숫자 필요
                 return None
             
@@ -599,25 +733,15 @@ class ImageAnalyzer:
                         frame_1 = consecutive_pattern[0]  # 첫 번째가 1
                         frame_10 = consecutive_pattern[-1]  # 마지막이 10
                         
-                        # 9와 10 사이의 간격 계산
-                        frame_9 = None
-                        for block in consecutive_pattern:
-                            if block['text'] == '9':
-                                frame_9 = block
-                                break
-                        
-                        # 9와 10 사이 간격의 절반 계산
-                        if frame_9:
-                            gap_half = (frame_10['bbox'][0] - frame_9['bbox'][2]) / 2
-                        else:
-                            # 9가 없으면 기본값 사용
-                            gap_half = 30
+                        # 9와 10 사이 간격의 절반 계산 (패턴의 9번째가 9)
+                        frame_9 = consecutive_pattern[8]
+                        gap_half = (frame_10['bbox'][0] - frame_9['bbox'][2]) / 2
                         
                         # 프레임 헤더 영역 계산 (1-10 프레임 범위)
                         frame_1_left = frame_1['bbox'][0]    # 1프레임 왼쪽 경계
                         frame_10_right = frame_10['bbox'][2]  # 10프레임 오른쪽 경계
-                        header_top = min(block['bbox'][1] for block in consecutive_pattern)    # 헤더 최상단
-                        header_bottom = max(block['bbox'][3] for block in consecutive_pattern)  # 헤더 최하단
+                        header_top = float(consecutive_pattern.y1.min())    # 헤더 최상단
+                        header_bottom = float(consecutive_pattern.y2.max())  # 헤더 최하단
                         
                         # 스코어보드 전체 너비 (1-10 프레임 범위)
                         scoreboard_width = frame_10_right - frame_1_left
@@ -654,105 +778,86 @@ class ImageAnalyzer:
                             'total_x1': total_x1,
                             'total_x2': total_x2,
                             'total_y1': total_y1,
-                            'total_y2': total_y2
+                            'total_y2': total_y2,
+                            'slope': slope_info.get("slope", 0.0)
                         }
                         
-                        print(f"=== 좌표 정보 ===")
-                        print(f"1-10 영역: ({frame_1_left}, {header_top}, {frame_10_right}, {header_bottom})")
-                        print(f"이름 영역: ({name_x1}, {name_y1}, {name_x2}, {name_y2})")
-                        print(f"스코어 영역: ({total_x1}, {total_y1}, {total_x2}, {total_y2})")
+                        region_logger.debug(
+                            "좌표 정보 - 1-10 영역: (%s, %s, %s, %s), 이름 영역: (%s, %s, %s, %s), 스코어 영역: (%s, %s, %s, %s)",
+                            frame_1_left, header_top, frame_10_right, header_bottom,
+                            name_x1, name_y1, name_x2, name_y2,
+                            total_x1, total_y1, total_x2, total_y2
+                        )
                         
                         return region
             
             return None
             
         except Exception as e:
-            logger.error(f"스코어보드 영역 식별 오류: {e}")
+            logger.error("스코어보드 영역 식별 오류: %s", e)
             return None
     
-    def _find_consecutive_1_to_10(self, sorted_blocks: List[Dict]) -> Optional[List[Dict]]:
+    def _find_consecutive_1_to_10(self, sorted_blocks: BlockTable) -> Optional[BlockTable]:
         """인식된 순서대로 1-10 패턴 찾기 (중간 빠진 숫자는 다른 위치에서 찾기)"""
         try:
+            sorted_blocks = BlockTable.coerce(sorted_blocks)
             if len(sorted_blocks) < 10:
                 return None
             
             # 1-10 범위의 숫자만 필터링 (인식된 순서 유지)
-            valid_blocks = [block for block in sorted_blocks if 1 <= int(block['text']) <= 10]
+            values = sorted_blocks.values
+            valid_blocks = sorted_blocks.take((values >= 1) & (values <= 10))
             if len(valid_blocks) < 10:
                 return None
             
-            print(f"인식된 순서: {[block['text'] for block in valid_blocks]}")
+            if region_logger.isEnabledFor(logging.DEBUG):
+                region_logger.debug("인식된 순서: %s", valid_blocks.texts)
+            
+            # 순차 탐색은 열을 파이썬 리스트로 꺼내서 (블록 dict 없이)
+            values = valid_blocks.values.tolist()
+            left = valid_blocks.x1.tolist()
+            right = valid_blocks.x2.tolist()
+            count = len(values)
             
             # 1을 찾을 때까지 스킵
-            start_idx = 0
-            for i, block in enumerate(valid_blocks):
-                if block['text'] == '1':
-                    start_idx = i
-                    break
-            else:
+            if 1 not in values:
                 return None  # 1을 찾지 못함
+            start_idx = values.index(1)
             
             # 1부터 시작해서 순차적으로 찾기
-            pattern = [valid_blocks[start_idx]]
+            pattern = [start_idx]
             current_idx = start_idx + 1
             
             for target_num in range(2, 11):
+                box_left = left[pattern[-1]]  # 이전 숫자 왼쪽 경계
                 found = False
                 
-                # 현재 위치부터 순서대로 찾기
-                for i in range(current_idx, len(valid_blocks)):
-                    if valid_blocks[i]['text'] == str(target_num):
-                        # 이전 숫자와 현재 숫자 사이의 박스에 target_num이 들어있는지 확인
-                        prev_block = pattern[-1]
-                        current_block = valid_blocks[i]
-                        
-                        # 박스 범위 계산 (이전 숫자 왼쪽 ~ 현재 숫자 오른쪽)
-                        box_left = prev_block['bbox'][0]
-                        box_right = current_block['bbox'][2]
-                        
-                        # target_num이 박스 안에 있는지 확인
-                        if (current_block['bbox'][0] >= box_left and 
-                            current_block['bbox'][2] <= box_right):
-                            pattern.append(current_block)
-                            current_idx = i + 1
-                            found = True
-                            break
+                # 현재 위치부터 순서대로: 이전 숫자 왼쪽 경계보다 오른쪽에 있는 첫 target_num
+                for i in range(current_idx, count):
+                    if values[i] == target_num and left[i] >= box_left:
+                        pattern.append(i)
+                        current_idx = i + 1
+                        found = True
+                        break
                 
-                # 순서대로 못 찾았으면, 다른 위치에서 찾기
+                # 순서대로 못 찾았으면, 다른 위치에서 찾기 (이전 숫자 왼쪽 ~ 다음 숫자 오른쪽 박스 안)
                 if not found:
-                    for i, block in enumerate(valid_blocks):
-                        if block['text'] == str(target_num):
-                            # 이전 숫자와 다음 숫자 사이의 박스에 있는지 확인
-                            prev_block = pattern[-1]
-                            next_target = target_num + 1
-                            
-                            # 다음 숫자 찾기
-                            next_block = None
-                            for j in range(current_idx, len(valid_blocks)):
-                                if valid_blocks[j]['text'] == str(next_target):
-                                    next_block = valid_blocks[j]
-                                    break
-                            
-                            if next_block:
-                                # 박스 범위 계산 (이전 숫자 왼쪽 ~ 다음 숫자 오른쪽)
-                                box_left = prev_block['bbox'][0]
-                                box_right = next_block['bbox'][2]
-                                
-                                # target_num이 박스 안에 있는지 확인
-                                if (block['bbox'][0] >= box_left and 
-                                    block['bbox'][2] <= box_right):
-                                    pattern.append(block)
-                                    found = True
-                                    break
+                    next_idx = next((j for j in range(current_idx, count) if values[j] == target_num + 1), None)
+                    if next_idx is not None:
+                        box_right = right[next_idx]
+                        for i in range(count):
+                            if values[i] == target_num and left[i] >= box_left and right[i] <= box_right:
+                                pattern.append(i)
+                                found = True
+                                break
                 
                 if not found:
                     break
             
             # 1-10이 모두 찾아졌으면 성공
             if len(pattern) == 10:
-                numbers = [int(block['text']) for block in pattern]
-                print(f"1-10 순차 패턴 발견: {numbers}")
-                return pattern
+                region_logger.debug("1-10 순차 패턴 발견: %s", [values[i] for i in pattern])
+                return valid_blocks.take(pattern)
             
             return None
             
@@ -797,51 +902,46 @@ class ImageAnalyzer:
         except Exception as e:
             return {'full_text': '', 'blocks': [], 'method': 'error'}
     
-    def _analyze_full_image(self, image_vision: vision.Image) -> Dict[str, Any]:
+    def _analyze_full_image(self, image_vision: "vision.Image") -> Dict[str, Any]:
         """전체 이미지 정밀 분석 (기존 방식)"""
         try:
-            logger.info("전체 이미지 정밀 분석 시작")
+            ocr_logger.debug("전체 이미지 정밀 분석 시작")
             
-            # 방법 1: 일반 텍스트 감지 (타임아웃 없음)
+            # 방법 1: 일반 텍스트 감지 (요청 예산 내 타임아웃/재시도)
             text_response = None
             try:
-                logger.info("Google Cloud Vision API text_detection 호출 시작...")
-                text_response = self.client.text_detection(image=image_vision)
-                logger.info("Google Cloud Vision API text_detection 호출 완료")
+                ocr_logger.debug("Google Cloud Vision API text_detection 호출 시작...")
+                text_response = self._call_vision("text_detection", image_vision)
+                ocr_logger.debug("Google Cloud Vision API text_detection 호출 완료")
             except Exception as e:
-                logger.error(f"text_detection 오류: {e}")
+                logger.error("text_detection 오류: %s", e)
                 text_response = None
             
-            # 방법 2: 문서 텍스트 감지 (타임아웃 없음)
+            # 방법 2: 문서 텍스트 감지 (요청 예산 내 타임아웃/재시도)
             doc_response = None
             try:
-                logger.info("Google Cloud Vision API document_text_detection 호출 시작...")
-                doc_response = self.client.document_text_detection(image=image_vision)
-                logger.info("Google Cloud Vision API document_text_detection 호출 완료")
+                ocr_logger.debug("Google Cloud Vision API document_text_detection 호출 시작...")
+                doc_response = self._call_vision("document_text_detection", image_vision)
+                ocr_logger.debug("Google Cloud Vision API document_text_detection 호출 완료")
             except Exception as e:
-                logger.error(f"document_text_detection 오류: {e}")
+                logger.error("document_text_detection 오류: %s", e)
                 doc_response = None
             
             # 두 방법의 결과 비교
-            text_blocks = []
-            doc_blocks = []
+            text_blocks = BlockTableBuilder()
+            doc_blocks = BlockTableBuilder()
             
             # 방법 1 결과 처리
             if text_response and text_response.text_annotations:
                 text_full_text = text_response.text_annotations[0].description
-                logger.info(f"방법 1 전체 텍스트: {text_full_text}")
+                ocr_logger.debug("방법 1 전체 텍스트: %s", text_full_text, extra=SAMPLED)
                 
                 for annotation in text_response.text_annotations[1:]:
                     text = annotation.description.strip()
                     confidence = annotation.confidence if hasattr(annotation, 'confidence') else 0.8
                     
                     if text and confidence > 0.3:
-                        vertices = annotation.bounding_poly.vertices
-                        if len(vertices) >= 4:
-                            x_coords = [vertex.x for vertex in vertices]
-                            y_coords = [vertex.y for vertex in vertices]
-                            bbox_rect = [min(x_coords), min(y_coords), max(x_coords), max(y_coords)]
-                            text_blocks.append({'text': text, 'confidence': confidence, 'bbox': bbox_rect})
+                        text_blocks.append(text, confidence, annotation.bounding_poly.vertices)
             
             # 방법 2 결과 처리
             if doc_response and doc_response.full_text_annotation:
@@ -851,16 +951,12 @@ class ImageAnalyzer:
                     for block in page.blocks:
                         for paragraph in block.paragraphs:
                             for word in paragraph.words:
-                                word_text = ''.join([symbol.text for symbol in word.symbols])
+                                symbols = word.symbols
+                                word_text = ''.join([symbol.text for symbol in symbols])
                                 
                                 if word_text.strip():
-                                    vertices = word.bounding_box.vertices
-                                    if len(vertices) >= 4:
-                                        x_coords = [vertex.x for vertex in vertices]
-                                        y_coords = [vertex.y for vertex in vertices]
-                                        bbox_rect = [min(x_coords), min(y_coords), max(x_coords), max(y_coords)]
-                                        confidence = sum(symbol.confidence for symbol in word.symbols) / len(word.symbols) if word.symbols else 0.8
-                                        doc_blocks.append({'text': word_text, 'confidence': confidence, 'bbox': bbox_rect})
+                                    confidence = sum(symbol.confidence for symbol in symbols) / len(symbols) if symbols else 0.8
+                                    doc_blocks.append(word_text, confidence, word.bounding_box.vertices)
             
             # 두 방법 모두 실패한 경우
             if not text_blocks and not doc_blocks:
@@ -874,22 +970,30 @@ class ImageAnalyzer:
             if len(doc_blocks) >= len(text_blocks):
                 return {
                     'full_text': doc_full_text if doc_response and doc_response.full_text_annotation else '',
-                    'blocks': doc_blocks,
+                    'blocks': doc_blocks.build(),
                     'method': 'document_detection'
                 }
             else:
                 return {
                     'full_text': text_full_text if text_response and text_response.text_annotations else '',
-                    'blocks': text_blocks,
+                    'blocks': text_blocks.build(),
                     'method': 'text_detection'
                 }
             
         except Exception as e:
             return {'full_text': '', 'blocks': [], 'method': 'error'}
     
+    @staticmethod
+    def _is_complete_region_analysis(region_analysis: Dict[str, Any]) -> bool:
+        names = region_analysis.get('name_part', {}).get('korean_names', [])
+        numbers = region_analysis.get('final_score', {}).get('numbers', [])
+        return bool(names) and len(names) == len(numbers)
+    
     def analyze_image(self, image: Image.Image, original_filename: str = None, preprocessing: str = "auto") -> Dict[str, Any]:
         """이미지 분석 전체 과정"""
         try:
+            self.prepare()
+            
             # 파일명 처리
             if original_filename:
                 # 파일 경로가 전달된 경우
@@ -905,24 +1009,44 @@ class ImageAnalyzer:
                 timestamp = time.strftime("%Y%m%d_%H%M%S")
                 filename = f"bowling_score_{timestamp}.jpg"
             
-            logger.info(f"analyze_image 호출됨 - filename: {filename}")
+            logger.info("analyze_image 호출됨 - filename: %s", filename)
             
             # 이미지 전처리
-            processed_image = self.preprocess_image(image, preprocessing)
+            with span("preprocess"):
+                processed_image = self.preprocess_image(image, preprocessing)
             
             # 전처리된 이미지 저장
             preprocessing_filename = f"{filename}_preprocessing.jpg"
             preprocessing_filepath = os.path.join(self.analyzed_dir, preprocessing_filename)
-            processed_image.save(preprocessing_filepath, "JPEG", quality=95)
-            logger.info(f"전처리된 이미지 저장: {preprocessing_filepath}")
+            with span("save_debug"):
+                processed_image.save(preprocessing_filepath, "JPEG", quality=95)
+            logger.info("전처리된 이미지 저장: %s", preprocessing_filepath)
             
             # OCR 수행
             ocr_result = self.extract_text_with_positions(processed_image)
             
             # 스코어보드 영역이 발견된 경우 영역별 분석 수행
             region_analysis = None
-            if ocr_result.get('method') != 'error' and 'scoreboard_region' in ocr_result:
-                region_analysis = self.save_and_analyze_regions(processed_image, ocr_result['scoreboard_region'], filename)
+            cache_info = ocr_result.pop('result_cache', None)
+            layout_info = ocr_result.pop('layout_cache', None)
+            if cache_info and cache_info['hit']:
+                region_analysis = cache_info['region_analysis']
+                logger.info("근접 중복 사진: %s 의 인식 결과 재사용", cache_info['source'])
+            elif ocr_result.get('method') != 'error' and 'scoreboard_region' in ocr_result:
+                with span("region_ocr"):
+                    region_analysis = self.save_and_analyze_regions(processed_image, ocr_result['scoreboard_region'], filename)
+                # 이름과 총점이 모두 인식된 결과만 캐시
+                if cache_info and region_analysis and self._is_complete_region_analysis(region_analysis):
+                    self.result_cache.store(cache_info['fingerprint'], filename, ocr_result, region_analysis)
+            
+            # 배치 캐시: 재사용한 배치는 결과로 검증, 새 배치는 인식이 완전할 때만 저장
+            if layout_info is not None:
+                complete = bool(region_analysis) and self._is_complete_region_analysis(region_analysis)
+                if layout_info['hit']:
+                    self.layout_cache.confirm(layout_info['key'], complete)
+                elif complete:
+                    self.layout_cache.store(layout_info['signature'], processed_image, layout_info['header_box'],
+                                            layout_info['region'], filename)
             
             return {
                 'saved_path': filename,
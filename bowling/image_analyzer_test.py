@@ -2,6 +2,9 @@
 """
 이미지 분석기 테스트 스크립트
 업로드 폴더의 이미지들을 테스트하여 image_analyzer.py의 기능을 검증합니다.
+
+오프라인 실행: BOWLING_OCR_MODE=record 로 한 번 실행해 cassettes/ 에 Vision 응답을 기록한 뒤
+BOWLING_OCR_MODE=replay (지연 주입: BOWLING_OCR_REPLAY_LATENCY_MS="평균,지터,시드") 로 재실행합니다.
 """
 
 import os
@@ -14,6 +17,15 @@ from datetime import datetime
 
 # image_analyzer 모듈 import
 from image_analyzer import ImageAnalyzer
+from image_catalog import ImageCatalog
+from ocr_blocks import BlockTable
+
+
+def to_json(value):
+    """OCR 블록 테이블은 블록 dict 목록으로 저장"""
+    if isinstance(value, BlockTable):
+        return value.to_dicts()
+    raise TypeError(f"JSON으로 저장할 수 없는 값: {type(value).__name__}")
 
 # 로깅 설정
 logging.basicConfig(
@@ -28,6 +40,7 @@ class ImageAnalyzerTester:
     def __init__(self, upload_dir: str = "uploads"):
         self.upload_dir = upload_dir
         self.analyzer = ImageAnalyzer(upload_dir)
+        self.catalog = ImageCatalog(upload_dir)
         logger.info(f"ImageAnalyzerTester 초기화 완료. 업로드 디렉토리: {upload_dir}")
     
     def list_uploaded_images(self) -> List[Dict]:
@@ -37,20 +50,17 @@ class ImageAnalyzerTester:
                 logger.warning(f"업로드 디렉토리가 존재하지 않습니다: {self.upload_dir}")
                 return []
             
+            # 인덱스에서 수정 시간 역순으로 페이지 단위 조회
             images = []
-            for filename in os.listdir(self.upload_dir):
-                if filename.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp')):
-                    filepath = os.path.join(self.upload_dir, filename)
-                    stat = os.stat(filepath)
-                    images.append({
-                        "filename": filename,
-                        "filepath": filepath,
-                        "size": stat.st_size,
-                        "modified": stat.st_mtime
-                    })
-            
-            # 수정 시간 역순으로 정렬
-            images.sort(key=lambda x: x["modified"], reverse=True)
+            cursor = None
+            while True:
+                page = self.catalog.list_images(limit=500, cursor=cursor)
+                for image in page["images"]:
+                    image["filepath"] = os.path.join(self.upload_dir, image["filename"])
+                    images.append(image)
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
             
             logger.info(f"업로드된 이미지 수: {len(images)}")
             return images
@@ -152,7 +162,7 @@ class ImageAnalyzerTester:
                 output_file = f"test_results_{timestamp}.json"
             
             with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
+                json.dump(results, f, ensure_ascii=False, indent=2, default=to_json)
             
             logger.info(f"테스트 결과 저장됨: {output_file}")
             return output_file
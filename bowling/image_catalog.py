@@ -0,0 +1,194 @@
+import logging
+import sqlite3
+import threading
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class ImageCatalog:
+    """업로드 이미지 메타데이터 인덱스 (SQLite)
+
+    이미지를 저장할 때 saving()/add()로 인덱스를 갱신하고, 목록 조회는 인덱스만 사용합니다.
+    외부에서 파일이 추가/삭제된 경우 디렉토리 mtime이 바뀌었을 때만 rescan()이
+    scandir 한 번으로 차이만 반영합니다.
+    """
+
+    def __init__(self, upload_dir: str = "uploads", db_path: str = None):
+        self.upload_dir = upload_dir
+        os.makedirs(upload_dir, exist_ok=True)
+        self.db_path = db_path or os.path.join(upload_dir, ".catalog.db")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_schema()
+        self.rescan()
+        logger.info("ImageCatalog 초기화 완료: %s", self.db_path)
+
+    def _init_schema(self):
+        """테이블/인덱스 생성"""
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS images (
+                    filename TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    modified REAL NOT NULL,
+                    modified_date TEXT NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_images_modified ON images (modified DESC, filename DESC)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_images_date ON images (modified_date)"
+            )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS catalog_state (
+                    key TEXT PRIMARY KEY,
+                    value REAL NOT NULL
+                )
+            """)
+
+    def _dir_mtime(self) -> float:
+        try:
+            return os.stat(self.upload_dir).st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def _set_dir_mtime(self, mtime: float):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO catalog_state (key, value) VALUES ('dir_mtime', ?)", (mtime,)
+        )
+
+    def _get_dir_mtime(self) -> Optional[float]:
+        row = self._conn.execute("SELECT value FROM catalog_state WHERE key = 'dir_mtime'").fetchone()
+        return row["value"] if row else None
+
+    @staticmethod
+    def _row_values(filename: str, size: int, modified: float) -> Tuple[str, int, float, str]:
+        modified_date = datetime.fromtimestamp(modified).strftime("%Y-%m-%d")
+        return (filename, size, modified, modified_date)
+
+    def add(self, filename: str, dir_mtime_before: Optional[float] = None):
+        """저장된 이미지 1건을 인덱스에 반영 (쓰기 직후 호출)
+
+        dir_mtime_before: 쓰기 직전 디렉토리 mtime. 저장된 재스캔 기준 시각이 그때 최신이었으면
+        이번 쓰기 말고는 바뀐 것이 없으므로 기준 시각을 지금 mtime으로 올려 다음 목록 조회의 재스캔을 생략합니다.
+        최신이 아니었으면(마지막 재스캔 이후 외부 변경) 그대로 두어 다음 목록 조회 때 차이를 재스캔합니다.
+        """
+        try:
+            stat = os.stat(os.path.join(self.upload_dir, filename))
+            dir_mtime = self._dir_mtime()
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO images (filename, size, modified, modified_date) VALUES (?, ?, ?, ?)",
+                    self._row_values(filename, stat.st_size, stat.st_mtime)
+                )
+                if dir_mtime_before is not None and self._get_dir_mtime() == dir_mtime_before:
+                    self._set_dir_mtime(dir_mtime)
+        except Exception as e:
+            logger.error("이미지 인덱스 추가 오류: %s", e)
+
+    @contextmanager
+    def saving(self, filename: str):
+        """with 블록 안에서 filename을 저장하면 끝난 뒤 인덱스에 반영 (저장 실패 시 반영하지 않음)"""
+        dir_mtime_before = self._dir_mtime()
+        yield
+        self.add(filename, dir_mtime_before)
+
+    def remove(self, filename: str):
+        """삭제된 이미지를 인덱스에서 제거"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM images WHERE filename = ?", (filename,))
+
+    def rescan(self, force: bool = False) -> Dict[str, int]:
+        """디렉토리 변경분만 인덱스에 반영 (mtime이 그대로면 stat 1회로 끝남)"""
+        try:
+            dir_mtime = self._dir_mtime()
+            with self._lock:
+                if not force and self._get_dir_mtime() == dir_mtime:
+                    return {"added": 0, "removed": 0}
+
+                indexed = {row["filename"] for row in self._conn.execute("SELECT filename FROM images")}
+                on_disk = {}
+                with os.scandir(self.upload_dir) as entries:
+                    for entry in entries:
+                        if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                            on_disk[entry.name] = entry
+
+                new_names = on_disk.keys() - indexed
+                removed_names = indexed - on_disk.keys()
+                new_rows = []
+                for name in new_names:
+                    stat = on_disk[name].stat()
+                    new_rows.append(self._row_values(name, stat.st_size, stat.st_mtime))
+
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO images (filename, size, modified, modified_date) VALUES (?, ?, ?, ?)",
+                        new_rows
+                    )
+                    self._conn.executemany(
+                        "DELETE FROM images WHERE filename = ?", [(name,) for name in removed_names]
+                    )
+                    self._set_dir_mtime(dir_mtime)
+
+            if new_rows or removed_names:
+                logger.info("이미지 인덱스 재스캔: 추가 %s건, 삭제 %s건", len(new_rows), len(removed_names))
+            return {"added": len(new_rows), "removed": len(removed_names)}
+
+        except Exception as e:
+            logger.error("이미지 인덱스 재스캔 오류: %s", e)
+            return {"added": 0, "removed": 0}
+
+    @staticmethod
+    def encode_cursor(image: Dict[str, Any]) -> str:
+        return f"{image['modified']!r}:{image['filename']}"
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[float, str]:
+        modified, filename = cursor.split(":", 1)
+        return float(modified), filename
+
+    def list_images(self, limit: int = 100, cursor: str = None, date_from: str = None,
+                    date_to: str = None) -> Dict[str, Any]:
+        """수정 시간 역순 목록 (키셋 커서 페이지네이션, 날짜 필터: YYYY-MM-DD)"""
+        if limit <= 0:
+            raise ValueError(f"limit은 1 이상이어야 합니다: {limit}")
+        self.rescan()
+
+        query = "SELECT filename, size, modified FROM images WHERE 1 = 1"
+        params: list = []
+        if cursor:
+            cursor_modified, cursor_filename = self.decode_cursor(cursor)
+            query += " AND (modified < ? OR (modified = ? AND filename < ?))"
+            params.extend([cursor_modified, cursor_modified, cursor_filename])
+        if date_from:
+            query += " AND modified_date >= ?"
+            params.append(date_from)
+        if date_to:
+            query += " AND modified_date <= ?"
+            params.append(date_to)
+        query += " ORDER BY modified DESC, filename DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        images = [dict(row) for row in rows[:limit]]
+        next_cursor = self.encode_cursor(images[-1]) if len(rows) > limit else None
+        return {"images": images, "next_cursor": next_cursor}
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,291 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional, Dict, Any, List, Tuple
+
+from PIL import Image
+
+from startup import lazy_import
+from result_cache import hamming
+
+logger = logging.getLogger(__name__)
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+# 헤더 띠 템플릿 높이 (검증 비용을 이미지 해상도와 무관하게 유지)
+TEMPLATE_HEIGHT = 24
+# 평행 이동만 반영하는 영역 좌표 키
+X_KEYS = ("x1", "x2", "header_x1", "header_x2", "name_x1", "name_x2", "total_x1", "total_x2")
+Y_KEYS = ("y1", "y2", "name_y1", "name_y2", "total_y1", "total_y2")
+
+
+def layout_signature(image: Image.Image) -> Dict[str, Any]:
+    """조회용 대략 서명: 이미지 크기 + 16x12 저해상도 엣지 지문(192비트, 중앙값 기준)"""
+    pixels = np.asarray(image.convert("L").resize((65, 49), Image.BILINEAR), dtype=np.float32)
+    gx = np.abs(pixels[:-1, 1:] - pixels[:-1, :-1])
+    gy = np.abs(pixels[1:, :-1] - pixels[:-1, :-1])
+    edges = (gx + gy).reshape(12, 4, 16, 4).mean(axis=(1, 3))
+    bits = (edges > np.median(edges)).flatten()
+    return {'size': list(image.size), 'edges': int("".join("1" if bit else "0" for bit in bits), 2)}
+
+
+def _band(image: Image.Image, box: Tuple[int, int, int, int], scale: float):
+    """회색조로 잘라 scale배 축소한 float32 배열"""
+    crop = image.crop(box).convert("L")
+    width, height = crop.size
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return np.asarray(crop.resize(size, Image.BILINEAR), dtype=np.float32)
+
+
+class LayoutCache:
+    """볼링장별 스코어보드 배치(영역 좌표) 재사용
+
+    같은 볼링장 모니터를 비슷한 각도로 찍으면 _identify_scoreboard_region 결과가 매주 거의 같으므로,
+    이미지 크기가 같고 엣지 지문이 가까운 항목을 찾은 뒤 저장해 둔 1-10 헤더 띠 템플릿을 주변에서 정규화 상관으로 찾아
+    (max_shift 비율 안의 평행 이동 허용) min_score 이상이면 이동량만큼 옮긴 영역을 돌려줍니다 (헤더 감지/영역 계산 생략).
+
+    검증(템플릿 불일치, 재사용한 영역의 인식 결과 불완전)에 max_failures번 연속 실패하거나
+    max_age_days 동안 쓰이지 않은 항목은 버립니다. 재시작 후에도 쓰도록 npz 파일에 저장합니다.
+    """
+
+    def __init__(self, path: str = os.getenv("BOWLING_LAYOUT_CACHE_PATH", "models/layouts.npz"),
+                 max_entries: int = int(os.getenv("BOWLING_LAYOUT_CACHE_SIZE", "32")),
+                 radius: int = int(os.getenv("BOWLING_LAYOUT_CACHE_RADIUS", "40")),
+                 min_score: float = float(os.getenv("BOWLING_LAYOUT_CACHE_MIN_SCORE", "0.7")),
+                 max_failures: int = int(os.getenv("BOWLING_LAYOUT_CACHE_MAX_FAILURES", "3")),
+                 max_age_days: float = float(os.getenv("BOWLING_LAYOUT_CACHE_MAX_AGE_DAYS", "60")),
+                 max_shift: float = 0.03):
+        self.path = path
+        self.max_entries = max_entries
+        self.radius = radius
+        self.min_score = min_score
+        self.max_failures = max_failures
+        self.max_age_seconds = max_age_days * 86400
+        self.max_shift = max_shift
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._version = 0  # 항목이 바뀔 때마다 증가 (늦게 도착한 옛 스냅샷이 새 파일을 덮어쓰지 않도록)
+        self._written = 0
+        self._loaded = False
+        self._counter = 0
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    # ---- 저장 ----
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                for meta in json.loads(str(data["meta"])):
+                    meta['template'] = data[f"template_{meta['key']}"]
+                    self._entries[meta['key']] = meta
+                    self._counter = max(self._counter, int(meta['key']))
+            logger.info("배치 캐시 로드: %s (%s개)", self.path, len(self._entries))
+        except Exception as e:
+            logger.warning("배치 캐시 파일을 읽을 수 없습니다 (%s): %s", self.path, e)
+
+    def _snapshot(self) -> Tuple[int, str, Dict[str, Any]]:
+        """저장할 내용 (잠금 안에서 호출): (버전, 메타 JSON, 템플릿)"""
+        self._version += 1
+        meta = [{key: value for key, value in entry.items() if key != 'template'} for entry in self._entries.values()]
+        templates = {f"template_{key}": entry['template'] for key, entry in self._entries.items()}
+        return self._version, json.dumps(meta, default=float), templates
+
+    def _save(self, snapshot: Optional[Tuple[int, str, Dict[str, Any]]]):
+        """스냅샷을 파일에 기록 (잠금 밖에서 호출, 조회를 막지 않음)"""
+        if snapshot is None:
+            return
+        version, meta, templates = snapshot
+        with self._save_lock:
+            if version <= self._written:
+                return
+            cache_dir = os.path.dirname(self.path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            temp_path = self.path + ".tmp.npz"
+            try:
+                np.savez(temp_path, meta=np.array(meta), **templates)
+                os.replace(temp_path, self.path)
+                self._written = version
+            except OSError as e:
+                logger.warning("배치 캐시 저장 실패 (%s): %s", self.path, e)
+
+    def _evict(self, key: str, reason: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.evicted += 1
+            logger.info("배치 캐시 항목 제거 (%s): %s", reason, entry['source'])
+
+    def _fail(self, entry: Dict[str, Any]):
+        entry['failures'] += 1
+        if entry['failures'] >= self.max_failures:
+            self._evict(entry['key'], "검증 연속 실패")
+
+    # ---- 조회 ----
+    def _verify(self, image: Image.Image, entry: Dict[str, Any]) -> Tuple[float, float, float]:
+        """(상관계수, dx, dy): 헤더 띠 템플릿을 저장 위치 주변에서 찾음"""
+        x1, y1, x2, y2 = entry['band']
+        width, height = image.size
+        margin_x, margin_y = int(width * self.max_shift), int(height * self.max_shift)
+        left, top = max(0, x1 - margin_x), max(0, y1 - margin_y)
+        right, bottom = min(width, x2 + margin_x), min(height, y2 + margin_y)
+        template = entry['template']
+        window = _band(image, (left, top, right, bottom), entry['scale'])
+        if window.shape[0] < template.shape[0] or window.shape[1] < template.shape[1]:
+            return 0.0, 0.0, 0.0
+        result = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (match_x, match_y) = cv2.minMaxLoc(result)
+        return float(score), left + match_x / entry['scale'] - x1, top + match_y / entry['scale'] - y1
+
+    def _candidates(self, signature: Dict[str, Any], now: float) -> List[Tuple[int, Dict[str, Any]]]:
+        """크기가 같고 엣지 거리가 반경 안인 항목 (가까운 순, 잠금 안에서 호출)"""
+        candidates = []
+        for entry in self._entries.values():
+            if entry['size'] != signature['size'] or now - entry['last_used'] > self.max_age_seconds:
+                continue
+            distance = hamming(signature['edges'], entry['edges'])
+            if distance <= self.radius:
+                candidates.append((distance, entry))
+        candidates.sort(key=lambda candidate: candidate[0])
+        return candidates
+
+    def lookup(self, image: Image.Image, signature: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """검증된 배치 {'key', 'source', 'region'(이동 반영), 'score'}, 없으면 None
+
+        후보 선택과 상태 갱신만 잠금 안에서 하고, 템플릿 검증(matchTemplate)과 파일 저장은 잠금 밖에서 합니다
+        (항목의 템플릿/띠 좌표는 만든 뒤 바뀌지 않음).
+        """
+        now = time.time()
+        with self._lock:
+            self._load()
+            candidates = self._candidates(signature, now)
+        failed = []
+        for distance, entry in candidates:
+            score, dx, dy = self._verify(image, entry)
+            if score < self.min_score:
+                failed.append(entry)
+                logger.debug("배치 캐시 검증 실패: %s (상관 %.2f)", entry['source'], score)
+                continue
+            # 사용 시각은 하루에 한 번만 파일에 반영 (적중 경로에서 매번 쓰지 않음), 실패 횟수는 confirm에서 정리
+            snapshot = None
+            with self._lock:
+                self.rejected += len(failed)
+                self.hits += 1
+                stale = now - entry['last_used'] > 86400
+                entry['last_used'] = max(entry['last_used'], now)
+                if stale and entry['key'] in self._entries:
+                    snapshot = self._snapshot()
+            self._save(snapshot)
+            region = dict(entry['region'])
+            for key in X_KEYS:
+                region[key] = region[key] + dx
+            for key in Y_KEYS:
+                region[key] = region[key] + dy
+            logger.info("배치 캐시 적중: %s (엣지 거리 %s, 상관 %.2f, 이동 %.0f,%.0f)",
+                        entry['source'], distance, score, dx, dy)
+            return {'key': entry['key'], 'source': entry['source'], 'region': region, 'score': score}
+        snapshot = None
+        with self._lock:
+            self.rejected += len(failed)
+            self.misses += 1
+            # 어느 배치로도 설명되지 않을 때만 가장 가까운 항목의 실패로 셈 (다른 볼링장 사진이면 그쪽 항목이 적중)
+            if failed and failed[0]['key'] in self._entries:
+                self._fail(failed[0])
+                snapshot = self._snapshot()
+        self._save(snapshot)
+        return None
+
+    # ---- 갱신 ----
+    def store(self, signature: Dict[str, Any], image: Image.Image, header_box: Tuple[float, float, float, float],
+              region: Dict[str, Any], source: str):
+        """인식이 완전했던 사진의 배치 저장 (이 사진에서 템플릿이 맞는 기존 항목 = 같은 배치는 교체)"""
+        try:
+            width, height = image.size
+            x1, y1, x2, y2 = header_box
+            pad = (y2 - y1) * 0.5
+            band = (max(0, int(x1 - pad)), max(0, int(y1 - pad)), min(width, int(x2 + pad)), min(height, int(y2 + pad)))
+            scale = min(1.0, TEMPLATE_HEIGHT / max(1, band[3] - band[1]))
+            template = _band(image, band, scale)
+        except Exception as e:
+            logger.warning("배치 캐시 템플릿 생성 실패: %s", e)
+            return
+        now = time.time()
+        with self._lock:
+            self._load()
+            candidates = self._candidates(signature, now)
+        replaced = [entry['key'] for _, entry in candidates if self._verify(image, entry)[0] >= self.min_score]
+        with self._lock:
+            for key in replaced:
+                self._evict(key, "새 배치로 교체")
+            for key, entry in list(self._entries.items()):
+                if now - entry['last_used'] > self.max_age_seconds:
+                    self._evict(key, "오래 쓰지 않음")
+            self._counter += 1
+            key = f"{self._counter}"
+            self._entries[key] = {
+                'key': key,
+                'source': source,
+                'size': signature['size'],
+                'edges': signature['edges'],
+                'band': list(band),
+                'scale': scale,
+                'template': template,
+                'region': region,
+                'created': now,
+                'last_used': now,
+                'failures': 0,
+            }
+            while len(self._entries) > self.max_entries:
+                oldest = min(self._entries.values(), key=lambda entry: entry['last_used'])
+                self._evict(oldest['key'], "최대 항목 수 초과")
+            snapshot = self._snapshot()
+        self._save(snapshot)
+
+    def confirm(self, key: str, valid: bool):
+        """재사용한 배치의 인식 결과 반영 (이름 수와 총점 수가 맞지 않으면 실패로 셈)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (valid and not entry['failures']):
+                return
+            if valid:
+                entry['failures'] = 0
+            else:
+                self.rejected += 1
+                self._fail(entry)
+            snapshot = self._snapshot()
+        self._save(snapshot)
+
+    # ---- 통계 ----
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "rejected": self.rejected, "evicted": self.evicted}
+
+    def collect_metrics(self):
+        """/metrics 수집기"""
+        stats = self.stats()
+        return [
+            ("bowling_layout_cache_entries", "gauge", "Venue layout cache entries", None, stats["entries"]),
+            ("bowling_layout_cache_lookups_total", "counter", "Venue layout cache lookups",
+             {"result": "hit"}, stats["hits"]),
+            ("bowling_layout_cache_lookups_total", "counter", "Venue layout cache lookups",
+             {"result": "miss"}, stats["misses"]),
+            ("bowling_layout_cache_rejected_total", "counter",
+             "Cached layouts that failed template or result validation", None, stats["rejected"]),
+            ("bowling_layout_cache_evicted_total", "counter", "Venue layouts aged out or replaced",
+             None, stats["evicted"]),
+        ]
+
+
+layout_cache = LayoutCache() if os.getenv("BOWLING_LAYOUT_CACHE", "1") == "1" else None
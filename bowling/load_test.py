@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+볼링 인식 API 부하 테스트
+/recognize-scoreboard, /recognize-base64에 정해진 도착률(open-loop, 응답을 기다리지 않고 발송)로 요청을 보내고
+단계별 처리량, p50/p95/p99 지연, 오류율, 포화 지점을 측정합니다.
+
+기본으로 서버를 임시 디렉토리에서 직접 띄우고 OCR은 재생 모드(가짜 Vision, 지연 분포 지정)로 돌립니다.
+결과 JSON에는 커밋 해시와 설정이 함께 저장되므로 커밋 간 비교가 가능합니다.
+
+사용법:
+  python load_test.py --rates 1,2,4,8,16 --duration 30 --ocr-latency "lognormal:300,0.5,7"
+  python load_test.py --url http://localhost:8091 --images ../uploads --rates 2,4
+  python load_test.py --save results_new.json --compare results_old.json
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import base64
+import socket
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import http.client
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+BOWLING_DIR = os.path.dirname(os.path.abspath(__file__))
+ENDPOINTS = ("scoreboard", "base64")
+
+
+# ---------------------------------------------------------------------------
+# 입력 이미지
+# ---------------------------------------------------------------------------
+
+def load_images(image_dir: str, limit: int) -> List[bytes]:
+    names = sorted(name for name in os.listdir(image_dir) if name.lower().endswith((".jpg", ".jpeg", ".png")))
+    images = []
+    for name in names[:limit]:
+        with open(os.path.join(image_dir, name), "rb") as f:
+            images.append(f.read())
+    return images
+
+
+def synthetic_images(count: int, work_dir: str) -> List[bytes]:
+    """합성 점수판 생성기로 입력 이미지 준비"""
+    from scoreboard_generator import generate_dataset
+    out_dir = os.path.join(work_dir, "synthetic")
+    generate_dataset(count, out_dir, options={"width": 1600})
+    return load_images(out_dir, count)
+
+
+# ---------------------------------------------------------------------------
+# 서버 (가짜 OCR 백엔드)
+# ---------------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(work_dir: str, ocr_latency: str, cassette_dir: Optional[str], extra_env: Dict[str, str]):
+    """임시 디렉토리를 작업 디렉토리로 서버 실행 (OCR 재생 모드)"""
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        "BOWLING_OCR_MODE": "replay",
+        "BOWLING_OCR_REPLAY_LATENCY_MS": ocr_latency,
+        "BOWLING_OCR_CASSETTE_DIR": cassette_dir or os.path.join(work_dir, "cassettes"),
+        "BOWLING_OCR_REPLAY_STRICT": "0",
+        "BOWLING_LOG_LEVEL": "WARNING",
+    })
+    env.update(extra_env)
+    command = [sys.executable, "-m", "uvicorn", "bowling:app", "--app-dir", BOWLING_DIR,
+               "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    log_file = open(os.path.join(work_dir, "server.log"), "wb")
+    process = subprocess.Popen(command, cwd=work_dir, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버 시작 실패 (로그: {log_file.name})")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            connection.request("GET", "/ready")
+            if connection.getresponse().status == 200:
+                return process, url
+        except OSError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("서버가 60초 안에 준비되지 않았습니다 (/ready).")
+
+
+# ---------------------------------------------------------------------------
+# 요청
+# ---------------------------------------------------------------------------
+
+class RequestBuilder:
+    """엔드포인트별 요청 본문 (미리 만들어 두어 부하 발생기 비용 최소화)"""
+
+    def __init__(self, images: List[bytes]):
+        self.multipart = []
+        self.base64 = []
+        for image in images:
+            boundary = uuid.uuid4().hex
+            body = (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="file"; filename="load.jpg"\r\n'
+                f"Content-Type: image/jpeg\r\n\r\n"
+            ).encode() + image + f"\r\n--{boundary}--\r\n".encode()
+            self.multipart.append((body, f"multipart/form-data; boundary={boundary}"))
+            payload = json.dumps({"image_data": base64.b64encode(image).decode("ascii")}).encode()
+            self.base64.append((payload, "application/json"))
+
+    def build(self, endpoint: str, index: int):
+        if endpoint == "scoreboard":
+            body, content_type = self.multipart[index % len(self.multipart)]
+            return "/recognize-scoreboard", body, content_type
+        body, content_type = self.base64[index % len(self.base64)]
+        return "/recognize-base64", body, content_type
+
+
+class HTTPWorker:
+    """스레드별 keep-alive 연결"""
+
+    def __init__(self, url: str, timeout: float):
+        parsed = urlparse(url)
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.https = parsed.scheme == "https"
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            connection = cls(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def post(self, path: str, body: bytes, content_type: str) -> int:
+        connection = self._connection()
+        try:
+            connection.request("POST", path, body=body, headers={"Content-Type": content_type})
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        except Exception:
+            connection.close()
+            self._local.connection = None
+            raise
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_stage(worker: HTTPWorker, builder: RequestBuilder, rate: float, duration: float, endpoints: List[str],
+              arrival: str, max_inflight: int, seed: int) -> Dict[str, Any]:
+    """한 도착률 단계 실행
+
+    도착 시각은 미리 정해진 일정(포아송 또는 고정 간격)을 따르며, 지연은 예정 발송 시각부터 잽니다.
+    서버가 밀려도 발송을 늦추지 않으므로(open-loop) 대기 시간이 지연에 그대로 포함됩니다.
+    """
+    rng = random.Random(seed)
+    results: List[Dict[str, Any]] = []
+    results_lock = threading.Lock()
+    inflight = [0]
+
+    def send(scheduled: float, endpoint: str, index: int):
+        path, body, content_type = builder.build(endpoint, index)
+        error = None
+        try:
+            status = worker.post(path, body, content_type)
+            if status != 200:
+                error = f"http_{status}"
+        except socket.timeout:
+            error = "timeout"
+        except Exception as e:
+            error = type(e).__name__
+        finished = time.perf_counter()
+        with results_lock:
+            inflight[0] -= 1
+            results.append({"endpoint": endpoint, "latency": finished - scheduled, "error": error,
+                            "finished": finished})
+
+    executor = ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix="load")
+    started = time.perf_counter()
+    next_at = started
+    index = 0
+    dropped = 0
+    while True:
+        next_at += rng.expovariate(rate) if arrival == "poisson" else 1.0 / rate
+        if next_at - started >= duration:
+            break
+        delay = next_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        with results_lock:
+            overloaded = inflight[0] >= max_inflight
+            if not overloaded:
+                inflight[0] += 1
+        if overloaded:
+            # 부하 발생기 한계: 보내지 못한 요청은 오류로 집계
+            dropped += 1
+            continue
+        executor.submit(send, next_at, endpoints[index % len(endpoints)], index)
+        index += 1
+    executor.shutdown(wait=True)
+    finished = time.perf_counter()
+
+    ok_latencies = sorted(r["latency"] for r in results if r["error"] is None)
+    errors: Dict[str, int] = {}
+    for r in results:
+        if r["error"]:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+    if dropped:
+        errors["client_overload"] = dropped
+    total = len(results) + dropped
+    per_endpoint = {}
+    for endpoint in endpoints:
+        latencies = sorted(r["latency"] for r in results if r["endpoint"] == endpoint and r["error"] is None)
+        per_endpoint[endpoint] = {
+            "ok": len(latencies),
+            "p50_ms": _ms(percentile(latencies, 0.50)),
+            "p95_ms": _ms(percentile(latencies, 0.95)),
+            "p99_ms": _ms(percentile(latencies, 0.99)),
+        }
+    return {
+        "offered_rps": rate,
+        "sent": total,
+        "ok": len(ok_latencies),
+        "throughput_rps": round(len(ok_latencies) / (finished - started), 3),
+        "error_rate": round((total - len(ok_latencies)) / total, 4) if total else 0.0,
+        "errors": errors,
+        "p50_ms": _ms(percentile(ok_latencies, 0.50)),
+        "p95_ms": _ms(percentile(ok_latencies, 0.95)),
+        "p99_ms": _ms(percentile(ok_latencies, 0.99)),
+        "max_ms": _ms(ok_latencies[-1] if ok_latencies else None),
+        "endpoints": per_endpoint,
+    }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def is_saturated(stage: Dict[str, Any], slo_ms: float, max_error_rate: float) -> bool:
+    """처리량이 도착률의 90% 미만이거나, p99가 SLO 초과이거나, 오류율 초과면 포화"""
+    if stage["error_rate"] > max_error_rate:
+        return True
+    if stage["throughput_rps"] < 0.9 * stage["offered_rps"]:
+        return True
+    return stage["p99_ms"] is None or stage["p99_ms"] > slo_ms
+
+
+# ---------------------------------------------------------------------------
+# 결과
+# ---------------------------------------------------------------------------
+
+def git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BOWLING_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BOWLING_DIR,
+                                    capture_output=True, text=True).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except Exception:
+        return {"commit": None, "dirty": None}
+
+
+def print_stages(stages: List[Dict[str, Any]]):
+    print(f"{'도착률':>8} {'처리량':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'오류율':>7}  상태")
+    for stage in stages:
+        print(f"{stage['offered_rps']:>8.1f} {stage['throughput_rps']:>8.2f} "
+              f"{_fmt(stage['p50_ms'])} {_fmt(stage['p95_ms'])} {_fmt(stage['p99_ms'])} "
+              f"{stage['error_rate'] * 100:>6.1f}%  {'포화' if stage['saturated'] else 'OK'}")
+
+
+def _fmt(value: Optional[float]) -> str:
+    return f"{value:>7.0f}ms" if value is not None else f"{'-':>9}"
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]):
+    """같은 도착률 단계끼리 p99/처리량 비교 + 최대 지속 가능 도착률 비교"""
+    print(f"\n비교: {baseline['meta'].get('commit')} -> {current['meta'].get('commit')}")
+    if baseline["config"] != current["config"]:
+        print("⚠️ 설정이 다릅니다. 수치를 직접 비교하기 어렵습니다.")
+    base_by_rate = {stage["offered_rps"]: stage for stage in baseline["stages"]}
+    for stage in current["stages"]:
+        base = base_by_rate.get(stage["offered_rps"])
+        if not base:
+            continue
+        print(f"  {stage['offered_rps']:>6.1f} rps: 처리량 {base['throughput_rps']:.2f} -> {stage['throughput_rps']:.2f}, "
+              f"p99 {_fmt(base['p99_ms']).strip()} -> {_fmt(stage['p99_ms']).strip()}, "
+              f"오류율 {base['error_rate'] * 100:.1f}% -> {stage['error_rate'] * 100:.1f}%")
+    print(f"  최대 지속 가능 도착률: {baseline['max_sustainable_rps']} -> {current['max_sustainable_rps']} rps")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="볼링 인식 API 부하 테스트 (open-loop)")
+    parser.add_argument("--url", default=None, help="대상 서버 (기본: 임시 서버를 재생 모드로 실행)")
+    parser.add_argument("--images", default=None, help="입력 이미지 디렉토리 (기본: 합성 이미지)")
+    parser.add_argument("--image-count", type=int, default=20)
+    parser.add_argument("--rates", default="1,2,4,8,16", help="단계별 도착률 (요청/초)")
+    parser.add_argument("--duration", type=float, default=30, help="단계별 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=5, help="측정 전 예열 시간 (초, 첫 단계 도착률)")
+    parser.add_argument("--arrival", choices=("poisson", "constant"), default="poisson")
+    parser.add_argument("--endpoints", default="scoreboard,base64")
+    parser.add_argument("--ocr-latency", default="lognormal:300,0.5,7",
+                        help="가짜 OCR 지연 분포 (BOWLING_OCR_REPLAY_LATENCY_MS 형식)")
+    parser.add_argument("--cassettes", default=None, help="재생할 카세트 디렉토리 (없으면 빈 OCR 응답)")
+    parser.add_argument("--slo-ms", type=float, default=10000, help="포화 판정 p99 기준 (ms)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--max-inflight", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=60, help="요청 타임아웃 (nginx proxy_read_timeout과 동일)")
+    parser.add_argument("--stop-at-saturation", action="store_true", help="포화 단계 이후 단계는 건너뜀")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    rates = [float(rate) for rate in args.rates.split(",") if rate.strip()]
+    endpoints = [endpoint.strip() for endpoint in args.endpoints.split(",") if endpoint.strip()]
+    for endpoint in endpoints:
+        if endpoint not in ENDPOINTS:
+            parser.error(f"알 수 없는 엔드포인트: {endpoint}")
+
+    work_dir = tempfile.mkdtemp(prefix="bowling_load_")
+    images = load_images(args.images, args.image_count) if args.images else synthetic_images(args.image_count, work_dir)
+    if not images:
+        parser.error("입력 이미지가 없습니다.")
+    builder = RequestBuilder(images)
+
+    process = None
+    url = args.url
+    if url is None:
+        cassette_dir = os.path.abspath(args.cassettes) if args.cassettes else None
+        process, url = start_server(work_dir, args.ocr_latency, cassette_dir, {})
+        print(f"임시 서버: {url} (작업 디렉토리 {work_dir})")
+
+    try:
+        worker = HTTPWorker(url, args.timeout)
+        if args.warmup > 0:
+            run_stage(worker, builder, rates[0], args.warmup, endpoints, args.arrival, args.max_inflight, args.seed)
+
+        stages = []
+        for offset, rate in enumerate(rates):
+            print(f"▶ {rate:.1f} 요청/초 x {args.duration:.0f}초 ...", flush=True)
+            stage = run_stage(worker, builder, rate, args.duration, endpoints, args.arrival,
+                              args.max_inflight, args.seed + offset + 1)
+            stage["saturated"] = is_saturated(stage, args.slo_ms, args.max_error_rate)
+            stages.append(stage)
+            if stage["saturated"] and args.stop_at_saturation:
+                break
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+
+    sustainable = [stage["offered_rps"] for stage in stages if not stage["saturated"]]
+    saturated = [stage["offered_rps"] for stage in stages if stage["saturated"]]
+    result = {
+        "meta": {
+            **git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "target": args.url or "local-replay",
+        },
+        "config": {
+            "rates": rates, "duration": args.duration, "arrival": args.arrival, "endpoints": endpoints,
+            "ocr_latency": args.ocr_latency if args.url is None else None,
+            "images": args.images or f"synthetic:{args.image_count}",
+            "slo_ms": args.slo_ms, "max_error_rate": args.max_error_rate,
+        },
+        "stages": stages,
+        "max_sustainable_rps": max(sustainable) if sustainable else None,
+        "saturation_rps": min(saturated) if saturated else None,
+    }
+
+    print()
+    print_stages(stages)
+    print(f"\n최대 지속 가능 도착률: {result['max_sustainable_rps']} rps, 포화 시작: {result['saturation_rps']} rps")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
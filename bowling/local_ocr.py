@@ -0,0 +1,136 @@
+import logging
+import os
+import threading
+from typing import Optional, List, Tuple
+
+from startup import lazy_import
+
+logger = logging.getLogger(__name__)
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+vision = lazy_import("google.cloud.vision")
+
+# PaddleOCR 결과 중 이 신뢰도 미만은 버림 (ocr_extractor.py의 MultiLanguageOCR과 동일 기준)
+MIN_CONFIDENCE = 0.5
+
+
+class LocalOCRClient:
+    """PaddleOCR을 Vision ImageAnnotatorClient처럼 쓰는 로컬 OCR 엔진
+
+    ocr_extractor.py의 MultiLanguageOCR과 같은 설정(한글, 각도 보정)을 쓰고,
+    결과를 AnnotateImageResponse(text_annotations, full_text_annotation)로 바꿔서
+    ImageAnalyzer의 파싱 코드를 그대로 사용할 수 있게 합니다.
+    PaddleOCR은 줄 단위로 인식하므로 공백으로 나뉜 단어는 글자 수 비율로 박스를 나눕니다.
+    """
+
+    def __init__(self, use_gpu: bool = False):
+        from paddleocr import PaddleOCR
+        self.ocr = PaddleOCR(use_angle_cls=True, lang='korean', use_gpu=use_gpu, show_log=False)
+        # PaddleOCR 예측기는 스레드 안전하지 않음
+        self._lock = threading.Lock()
+
+    def _recognize(self, content: bytes) -> Tuple[List[Tuple[str, float, List[Tuple[int, int]]]], Tuple[int, int]]:
+        image = cv2.imdecode(np.frombuffer(content, np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("이미지를 디코딩할 수 없습니다.")
+        with self._lock:
+            result = self.ocr.ocr(image, cls=True)
+        words = []
+        for line in (result[0] or []) if result else []:
+            if not line or len(line) < 2:
+                continue
+            points, (text, confidence) = line[0], line[1]
+            text = text.strip()
+            if not text or confidence < MIN_CONFIDENCE:
+                continue
+            words.extend(self._split_words(text, float(confidence), points))
+        height, width = image.shape[:2]
+        return words, (width, height)
+
+    @staticmethod
+    def _split_words(text: str, confidence: float, points) -> List[Tuple[str, float, List[Tuple[int, int]]]]:
+        """줄 박스를 공백 기준 단어 박스로 분할 (글자 수 비율)"""
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        x1, y1, x2, y2 = min(xs), min(ys), max(xs), max(ys)
+        parts = text.split()
+        if len(parts) == 1:
+            return [(text, confidence, [(int(x1), int(y1)), (int(x2), int(y1)), (int(x2), int(y2)), (int(x1), int(y2))])]
+        total_chars = len(text)
+        words = []
+        offset = 0
+        for part in parts:
+            start = text.index(part, offset)
+            end = start + len(part)
+            offset = end
+            wx1 = x1 + (x2 - x1) * start / total_chars
+            wx2 = x1 + (x2 - x1) * end / total_chars
+            words.append((part, confidence, [(int(wx1), int(y1)), (int(wx2), int(y1)), (int(wx2), int(y2)), (int(wx1), int(y2))]))
+        return words
+
+    def _response(self, content: bytes, document: bool):
+        words, (width, height) = self._recognize(content)
+        full_text = "\n".join(text for text, _, _ in words)
+
+        def poly(corners):
+            return vision.BoundingPoly(vertices=[vision.Vertex(x=x, y=y) for x, y in corners])
+
+        annotations = [vision.EntityAnnotation(description=full_text)] if words else []
+        annotations.extend(
+            vision.EntityAnnotation(description=text, confidence=confidence, bounding_poly=poly(corners))
+            for text, confidence, corners in words
+        )
+        if not document:
+            return vision.AnnotateImageResponse(text_annotations=annotations)
+
+        blocks = [
+            vision.Block(
+                bounding_box=poly(corners),
+                confidence=confidence,
+                paragraphs=[vision.Paragraph(
+                    bounding_box=poly(corners),
+                    words=[vision.Word(
+                        bounding_box=poly(corners),
+                        confidence=confidence,
+                        symbols=[vision.Symbol(text=char, confidence=confidence) for char in text],
+                    )],
+                )],
+            )
+            for text, confidence, corners in words
+        ]
+        page = vision.Page(width=width, height=height, blocks=blocks)
+        return vision.AnnotateImageResponse(
+            text_annotations=annotations,
+            full_text_annotation=vision.TextAnnotation(text=full_text, pages=[page]),
+        )
+
+    def text_detection(self, image, **kwargs):
+        return self._response(image.content, document=False)
+
+    def document_text_detection(self, image, **kwargs):
+        return self._response(image.content, document=True)
+
+
+_engine_lock = threading.Lock()
+_engine: Optional[LocalOCRClient] = None
+_engine_failed = False
+
+
+def get_local_engine() -> Optional[LocalOCRClient]:
+    """로컬 OCR 엔진 (최초 1회 생성, paddleocr 미설치 또는 BOWLING_LOCAL_OCR=0이면 None)"""
+    global _engine, _engine_failed
+    if _engine is not None or _engine_failed:
+        return _engine
+    with _engine_lock:
+        if _engine is None and not _engine_failed:
+            if os.getenv("BOWLING_LOCAL_OCR", "1") != "1":
+                _engine_failed = True
+                return None
+            try:
+                _engine = LocalOCRClient(use_gpu=os.getenv("BOWLING_LOCAL_OCR_GPU", "0") == "1")
+                logger.info("로컬 OCR 엔진(PaddleOCR) 준비 완료")
+            except Exception as e:
+                _engine_failed = True
+                logger.warning("로컬 OCR 엔진을 사용할 수 없습니다: %s", e)
+    return _engine
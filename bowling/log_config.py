@@ -0,0 +1,117 @@
+import logging
+import logging.handlers
+import os
+import queue
+import atexit
+import itertools
+from typing import Dict, Optional
+
+# 디버그 페이로드(전체 OCR 텍스트, 블록 목록 등)에 붙이는 extra: N건 중 1건만 출력
+SAMPLED = {"sampled": True}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# logfmt 출력 시 LogRecord 기본 속성은 제외
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "sampled"}
+
+
+class StructuredFormatter(logging.Formatter):
+    """key=value (logfmt) 형식 포매터. extra로 넘긴 필드도 함께 출력"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = [
+            ("ts", self.formatTime(record, "%Y-%m-%dT%H:%M:%S")),
+            ("level", record.levelname),
+            ("logger", record.name),
+            ("msg", record.getMessage()),
+        ]
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                fields.append((key, value))
+        line = " ".join(f"{key}={self._quote(value)}" for key, value in fields)
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+    @staticmethod
+    def _quote(value) -> str:
+        text = str(value)
+        if text == "" or any(c in text for c in ' ="\n'):
+            return '"' + text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        return text
+
+
+class SamplingFilter(logging.Filter):
+    """extra=SAMPLED 로 표시된 레코드는 every건 중 1건만 통과"""
+
+    def __init__(self, every: int = 20):
+        super().__init__()
+        self.every = max(1, every)
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "sampled", False):
+            return next(self._counter) % self.every == 0
+        return True
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """"image_analyzer.ocr=DEBUG,bowling=WARNING" -> {이름: 레벨}"""
+    levels = {}
+    for item in spec.split(","):
+        name, sep, level = item.strip().partition("=")
+        if sep and name and level:
+            levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return levels
+
+
+def setup_logging(level: str = None, levels: str = None, sample_every: int = None,
+                  structured: bool = None) -> logging.Logger:
+    """로깅 설정 (한 번만 적용)
+
+    - 요청 처리 스레드는 QueueHandler에 넣기만 하고, 실제 포매팅/출력은 QueueListener 스레드가 담당
+    - BOWLING_LOG_LEVEL: 기본 레벨 (기본 INFO)
+    - BOWLING_LOG_LEVELS: 단계(로거)별 레벨, 예) "image_analyzer.ocr=DEBUG,image_analyzer.region=WARNING"
+    - BOWLING_LOG_SAMPLE_EVERY: 디버그 페이로드 샘플링 간격 (기본 20)
+    - BOWLING_LOG_FORMAT: "logfmt"(기본) 또는 "plain"
+    """
+    global _listener
+    root = logging.getLogger()
+    if _listener is not None:
+        return root
+
+    level = level or os.getenv("BOWLING_LOG_LEVEL", "INFO")
+    levels = levels if levels is not None else os.getenv("BOWLING_LOG_LEVELS", "")
+    sample_every = sample_every or int(os.getenv("BOWLING_LOG_SAMPLE_EVERY", "20"))
+    if structured is None:
+        structured = os.getenv("BOWLING_LOG_FORMAT", "logfmt") != "plain"
+
+    stream_handler = logging.StreamHandler()
+    if structured:
+        stream_handler.setFormatter(StructuredFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_every))
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+    for name, name_level in parse_levels(levels).items():
+        logging.getLogger(name).setLevel(name_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return root
+
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 출력하고 리스너 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
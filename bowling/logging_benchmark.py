@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+로깅 방식 처리량 비교 벤치마크
+기존 방식(즉시 포매팅 f-string + 동기 StreamHandler, 모든 블록 INFO 출력)과
+새 방식(지연 포매팅 + 디버그 페이로드 DEBUG/샘플링 + QueueHandler)을 같은 인식 1건 분량의 로그로 비교합니다.
+
+사용법: python logging_benchmark.py [반복 횟수]
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from typing import List, Dict
+
+from log_config import StructuredFormatter, SamplingFilter, SAMPLED
+
+
+def make_blocks(count: int = 120) -> List[Dict]:
+    """인식 1건에서 나오는 정도의 OCR 블록 (이름 + 프레임 점수 + 총점)"""
+    blocks = []
+    for i in range(count):
+        blocks.append({
+            'text': str(i % 300) if i % 12 else "김환규",
+            'confidence': 0.9,
+            'bbox': [i * 13 % 1200, i * 7 % 900, i * 13 % 1200 + 40, i * 7 % 900 + 25]
+        })
+    return blocks
+
+
+def run_eager(logger: logging.Logger, blocks: List[Dict], full_text: str):
+    """기존 방식: 모든 페이로드를 f-string으로 즉시 포매팅하여 INFO 출력"""
+    logger.info(f"OCR 텍스트: {full_text}")
+    logger.info(f"OCR 블록 수: {len(blocks)}")
+    for block in blocks:
+        logger.info(f"데이터 블록: {block['text']} at Y={block['bbox'][1]}")
+        print(f"숫자 감지: {block['text']} at ({block['bbox'][0]}, {block['bbox'][1]}, {block['bbox'][2]}, {block['bbox'][3]})")
+    logger.info(f"부분 인식 결과: {blocks}")
+
+
+def run_lazy(logger: logging.Logger, blocks: List[Dict], full_text: str):
+    """새 방식: 지연 포매팅, 블록 단위는 DEBUG, 큰 페이로드는 샘플링"""
+    logger.debug("OCR 텍스트: %s", full_text, extra=SAMPLED)
+    logger.info("OCR 블록 수: %s", len(blocks))
+    for block in blocks:
+        logger.debug("데이터 블록: %s at Y=%s", block['text'], block['bbox'][1])
+        logger.debug("숫자 감지: %s at %s", block['text'], block['bbox'])
+    logger.debug("부분 인식 결과: %s", blocks, extra=SAMPLED)
+
+
+def measure(name: str, func, logger: logging.Logger, iterations: int, blocks, full_text) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func(logger, blocks, full_text)
+    elapsed = time.perf_counter() - started
+    rate = iterations / elapsed
+    print(f"{name:<40} {elapsed:8.3f}s  {rate:10.1f} 요청/초", file=sys.__stdout__)
+    return rate
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    blocks = make_blocks()
+    full_text = "\n".join(block['text'] for block in blocks)
+    devnull = open(os.devnull, "w")
+
+    # 기존 방식: basicConfig 스타일 동기 핸들러, print도 같은 출력으로
+    eager_logger = logging.getLogger("bench.eager")
+    eager_logger.propagate = False
+    eager_handler = logging.StreamHandler(devnull)
+    eager_handler.setFormatter(logging.Formatter('%(levelname)s:%(name)s:%(message)s'))
+    eager_logger.addHandler(eager_handler)
+    eager_logger.setLevel(logging.INFO)
+
+    # 새 방식: QueueHandler -> QueueListener(logfmt)
+    lazy_logger = logging.getLogger("bench.lazy")
+    lazy_logger.propagate = False
+    log_queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(20))
+    lazy_logger.addHandler(queue_handler)
+    lazy_logger.setLevel(logging.INFO)
+    stream_handler = logging.StreamHandler(devnull)
+    stream_handler.setFormatter(StructuredFormatter())
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+
+    print(f"블록 {len(blocks)}개 x {iterations}회", file=sys.__stdout__)
+    stdout = sys.stdout
+    sys.stdout = devnull
+    try:
+        eager_rate = measure("기존 (f-string, 동기 출력)", run_eager, eager_logger, iterations, blocks, full_text)
+        lazy_rate = measure("새 방식 (지연 포매팅, 큐, 샘플링)", run_lazy, lazy_logger, iterations, blocks, full_text)
+    finally:
+        sys.stdout = stdout
+        listener.stop()
+        devnull.close()
+
+    print(f"처리량 향상: {lazy_rate / eager_rate:.1f}배 (요청 스레드 기준)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+import bisect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# BOWLING_METRICS=0 이면 span()이 아무 일도 하지 않는 공용 컨텍스트를 반환
+METRICS_ENABLED = os.getenv("BOWLING_METRICS", "1") != "0"
+
+# 지연 시간 히스토그램 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20)
+
+
+class Histogram:
+    """Prometheus 형식 히스토그램 (라벨 값 조합별 누적 버킷)"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # 라벨 값 튜플 -> [버킷별 개수..., 합계, 전체 개수]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = [0] * (len(self.buckets) + 2)
+                self._series[label_values] = series
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for label_values, series in sorted(items):
+            base = ",".join(f'{name}="{value}"' for name, value in zip(self.label_names, label_values))
+            prefix = base + "," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {int(series[-1])}')
+            suffix = f"{{{base}}}" if base else ""
+            lines.append(f"{self.name}_sum{suffix} {series[-2]}")
+            lines.append(f"{self.name}_count{suffix} {int(series[-1])}")
+        return lines
+
+
+class Registry:
+    """히스토그램 및 추가 수집 함수 모음 (/metrics 출력)"""
+
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str, label_names: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = Histogram(name, help_text, label_names, buckets)
+            return self._histograms[name]
+
+    def register_collector(self, collector):
+        """collector() -> [(이름, 타입, 도움말, {라벨: 값} 또는 None, 값), ...]"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for histogram in list(self._histograms.values()):
+            lines.extend(histogram.render())
+        for collector in self._collectors:
+            described = set()
+            for name, metric_type, help_text, labels, value in collector():
+                if name not in described:
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    described.add(name)
+                label_text = ",".join(f'{k}="{v}"' for k, v in (labels or {}).items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+stage_duration = registry.histogram(
+    "bowling_stage_duration_seconds", "Recognition pipeline stage duration", ("stage",))
+ocr_call_duration = registry.histogram(
+    "bowling_ocr_call_duration_seconds", "OCR backend call duration", ("method",))
+ocr_calls_per_request = registry.histogram(
+    "bowling_ocr_calls_per_request", "OCR backend calls per HTTP request", (), COUNT_BUCKETS)
+request_duration = registry.histogram(
+    "bowling_request_duration_seconds", "HTTP request duration", ("path",))
+
+
+class RequestTrace:
+    """요청 1건의 단계별 누적 시간 (Server-Timing 헤더용, 배치 작업 스레드가 동시에 기록)"""
+
+    def __init__(self):
+        self.spans: Dict[str, List[float]] = {}  # 이름 -> [누적 시간, 호출 수]
+        self.ocr_calls = 0
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float, ocr_call: bool = False):
+        with self._lock:
+            entry = self.spans.get(name)
+            if entry is None:
+                self.spans[name] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+            if ocr_call:
+                self.ocr_calls += 1
+
+    def server_timing(self) -> str:
+        with self._lock:
+            spans = [(name, seconds, count) for name, (seconds, count) in self.spans.items()]
+        parts = []
+        for name, seconds, count in spans:
+            metric = name.replace(".", "_")
+            parts.append(f'{metric};dur={seconds * 1000:.1f};desc="{name} x{count}"')
+        return ", ".join(parts)
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("bowling_request_trace", default=None)
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+@contextmanager
+def _timed_span(name: str, histogram: Histogram, label: str, is_ocr_call: bool):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        histogram.observe(elapsed, label)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(name, elapsed, ocr_call=is_ocr_call)
+
+
+def span(stage: str):
+    """파이프라인 단계 시간 측정"""
+    if not METRICS_ENABLED:
+        return _NOOP_SPAN
+    return _timed_span(stage, stage_duration, stage, False)
+
+
+def ocr_span(method: str):
+    """OCR 백엔드 호출 시간 측정 (요청당 호출 수 포함)"""
+    if not METRICS_ENABLED:
+        return _NOOP_SPAN
+    return _timed_span(f"ocr.{method}", ocr_call_duration, method, True)
+
+
+def start_request_trace() -> Optional[RequestTrace]:
+    """요청 시작 시 호출 (비활성화 시 None)"""
+    if not METRICS_ENABLED:
+        return None
+    trace = RequestTrace()
+    _current_trace.set(trace)
+    return trace
+
+
+def finish_request_trace(trace: Optional[RequestTrace], path: str, seconds: float):
+    """요청 종료 시 호출: 요청 단위 히스토그램 기록"""
+    if trace is None:
+        return
+    request_duration.observe(seconds, path)
+    ocr_calls_per_request.observe(trace.ocr_calls)
@@ -0,0 +1,377 @@
+import logging
+import os
+import sys
+import threading
+from typing import List, Dict, Any, Iterable, Tuple, Optional
+
+from hangul_utils import jamo_codes
+from startup import lazy_import
+
+logger = logging.getLogger(__name__)
+
+np = lazy_import("numpy")
+
+# 비트 병렬 편집 거리는 질의 길이가 워드 크기(64비트) 미만이어야 함
+MAX_QUERY_SYMBOLS = 63
+# 기존 find_best_name_match와 같은 가중치 (글자 단위 0.6, 자모 단위 0.4)와 최소 신뢰도
+CHAR_WEIGHT = 0.6
+JAMO_WEIGHT = 0.4
+MIN_CONFIDENCE = 0.3
+# 회원이 이보다 많으면 자모 n-gram 색인으로 후보만 골라 전체 점수 계산
+CANDIDATE_LIMIT = int(os.getenv("BOWLING_NAME_CANDIDATES", "200"))
+# 회원의 이 비율 이상에 나오는 n-gram(흔한 성씨 등)은 후보 검색에서 제외
+MAX_GRAM_RATIO = 0.2
+
+
+class _SequenceTable:
+    """회원 이름의 정수 코드 시퀀스를 (행=회원, 열=위치) 배열로 보관. 추가는 용량을 두 배씩 늘림"""
+
+    def __init__(self):
+        self.symbols: Dict[Any, int] = {}  # 기호 -> 1부터 시작하는 ID (0은 패딩)
+        self.codes = np.zeros((16, 8), dtype=np.int32)
+        self.lengths = np.zeros(16, dtype=np.int32)
+        self.count = 0
+
+    def _symbol_id(self, symbol) -> int:
+        symbol_id = self.symbols.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self.symbols) + 1
+            self.symbols[symbol] = symbol_id
+        return symbol_id
+
+    def append(self, sequence: List[Any]):
+        ids = [self._symbol_id(symbol) for symbol in sequence]
+        rows, width = self.codes.shape
+        if self.count == rows or len(ids) > width:
+            new_rows = rows * 2 if self.count == rows else rows
+            new_width = max(width, len(ids))
+            codes = np.zeros((new_rows, new_width), dtype=np.int32)
+            codes[:self.count, :width] = self.codes[:self.count]
+            lengths = np.zeros(new_rows, dtype=np.int32)
+            lengths[:self.count] = self.lengths[:self.count]
+            self.codes, self.lengths = codes, lengths
+        self.codes[self.count, :len(ids)] = ids
+        self.codes[self.count, len(ids):] = 0
+        self.lengths[self.count] = len(ids)
+        self.count += 1
+
+    def query_masks(self, sequences: List[List[Any]]):
+        """질의별 Peq 비트마스크 표 (질의 수, 기호 수 + 1). 회원에 없는 기호는 어떤 위치와도 일치하지 않음"""
+        table = np.zeros((len(sequences), len(self.symbols) + 1), dtype=np.uint64)
+        lengths = np.zeros(len(sequences), dtype=np.int64)
+        for row, sequence in enumerate(sequences):
+            sequence = sequence[:MAX_QUERY_SYMBOLS]
+            lengths[row] = len(sequence)
+            for position, symbol in enumerate(sequence):
+                symbol_id = self.symbols.get(symbol)
+                if symbol_id is not None:
+                    table[row, symbol_id] |= np.uint64(1 << position)
+        return table, lengths
+
+
+def bit_parallel_distances(peq, query_lengths, codes, lengths, rows=None):
+    """Myers/Hyyrö 비트 병렬 레벤슈타인 거리: 모든 질의 x 모든 회원을 한 번에 계산
+
+    peq: (Q, A) uint64, query_lengths: (Q,), codes: (M, L) int32 (0 = 패딩), lengths: (M,)
+    rows를 주면 해당 회원 행만 계산합니다. 반환: (Q, M) int32
+    """
+    if rows is not None:
+        codes, lengths = codes[rows], lengths[rows]
+    query_count = peq.shape[0]
+    member_count, width = codes.shape
+    if member_count == 0 or query_count == 0:
+        return np.zeros((query_count, member_count), dtype=np.int32)
+
+    safe_lengths = np.maximum(query_lengths, 1).astype(np.uint64)
+    mask = ((np.uint64(1) << safe_lengths) - np.uint64(1))[:, None]
+    high = (np.uint64(1) << (safe_lengths - np.uint64(1)))[:, None]
+    one = np.uint64(1)
+
+    pv = np.broadcast_to(mask, (query_count, member_count)).copy()
+    mv = np.zeros((query_count, member_count), dtype=np.uint64)
+    score = np.broadcast_to(query_lengths.astype(np.int32)[:, None], (query_count, member_count)).copy()
+    for j in range(int(lengths.max())):
+        active = (j < lengths)[None, :]
+        eq = peq[:, codes[:, j]]
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        score += (active & ((ph & high) != 0)).astype(np.int32)
+        score -= (active & ((mh & high) != 0)).astype(np.int32)
+        ph = ((ph << one) | one) & mask
+        mh = (mh << one) & mask
+        pv = np.where(active, (mh | ~(xv | ph)) & mask, pv)
+        mv = np.where(active, ph & xv, mv)
+
+    # 빈 질의는 거리 = 회원 이름 길이
+    empty = query_lengths == 0
+    if empty.any():
+        score[empty] = lengths[None, :]
+    return score
+
+
+def bit_parallel_distance(query: List[Any], member: List[Any]) -> int:
+    """한 쌍의 레벤슈타인 거리 (bit_parallel_distances와 같은 계산을 파이썬 정수 비트 연산으로)"""
+    query = query[:MAX_QUERY_SYMBOLS]
+    if not query:
+        return len(member)
+    peq: Dict[Any, int] = {}
+    for position, symbol in enumerate(query):
+        peq[symbol] = peq.get(symbol, 0) | (1 << position)
+    mask = (1 << len(query)) - 1
+    high = 1 << (len(query) - 1)
+    pv, mv, score = mask, 0, len(query)
+    for symbol in member:
+        eq = peq.get(symbol, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score
+
+
+def pair_similarity(query: str, member: str) -> float:
+    """한 쌍의 유사도 (NameMatcher.similarity_matrix와 같은 공식, 배열/색인 없이)"""
+    similarity = 0.0
+    for weight, query_codes, member_codes in ((CHAR_WEIGHT, list(query), list(member)),
+                                               (JAMO_WEIGHT, jamo_codes(query), jamo_codes(member))):
+        query_length = min(len(query_codes), MAX_QUERY_SYMBOLS)
+        longest = max(query_length, len(member_codes), 1)
+        similarity += weight * (1.0 - bit_parallel_distance(query_codes, member_codes) / longest)
+    return similarity
+
+
+def hungarian(cost: List[List[float]]) -> List[int]:
+    """헝가리안 알고리즘 (행 수 <= 열 수인 비용 행렬의 최소 비용 일대일 배정). 반환: 행별 열 번호"""
+    rows = len(cost)
+    if rows == 0:
+        return []
+    columns = len(cost[0])
+    inf = float("inf")
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (columns + 1)
+    owner = [0] * (columns + 1)  # 열 -> 배정된 행 (1부터, 0은 미배정)
+    way = [0] * (columns + 1)
+    for row in range(1, rows + 1):
+        owner[0] = row
+        column0 = 0
+        min_values = [inf] * (columns + 1)
+        used = [False] * (columns + 1)
+        while True:
+            used[column0] = True
+            row0 = owner[column0]
+            delta, column1 = inf, 0
+            cost_row = cost[row0 - 1]
+            for column in range(1, columns + 1):
+                if used[column]:
+                    continue
+                current = cost_row[column - 1] - u[row0] - v[column]
+                if current < min_values[column]:
+                    min_values[column] = current
+                    way[column] = column0
+                if min_values[column] < delta:
+                    delta, column1 = min_values[column], column
+            for column in range(columns + 1):
+                if used[column]:
+                    u[owner[column]] += delta
+                    v[column] -= delta
+                else:
+                    min_values[column] -= delta
+            column0 = column1
+            if owner[column0] == 0:
+                break
+        while column0:
+            column1 = way[column0]
+            owner[column0] = owner[column1]
+            column0 = column1
+    assignment = [0] * rows
+    for column in range(1, columns + 1):
+        if owner[column]:
+            assignment[owner[column] - 1] = column - 1
+    return assignment
+
+
+class JamoNgramIndex:
+    """자모 bigram 역색인 (bigram -> 회원 행 번호 목록)
+
+    이름 앞뒤에 경계 기호를 붙여 bigram을 만들고, 질의와 공유하는 bigram 수가 많은 회원을 후보로 고릅니다.
+    자모 하나가 잘못 인식되어도 bigram 두 개만 달라지므로 대부분의 bigram이 그대로 남습니다.
+    """
+
+    BOUNDARY = 0
+
+    def __init__(self):
+        self._postings: Dict[Tuple[int, int], List[int]] = {}
+        self._arrays: Dict[Tuple[int, int], Any] = {}  # 조회용 배열 캐시 (추가 시 해당 bigram만 무효화)
+        self.count = 0
+        self.postings = 0
+
+    @classmethod
+    def grams(cls, codes: List[int]) -> set:
+        padded = [cls.BOUNDARY] + codes + [cls.BOUNDARY]
+        return set(zip(padded, padded[1:]))
+
+    def add(self, row: int, codes: List[int]):
+        for gram in self.grams(codes):
+            self._postings.setdefault(gram, []).append(row)
+            self._arrays.pop(gram, None)
+            self.postings += 1
+        self.count = max(self.count, row + 1)
+
+    def memory_bytes(self) -> int:
+        """대략적인 메모리 사용량 (목록 항목 + 배열 캐시 + bigram별 dict/list 오버헤드)"""
+        return self.postings * 12 + len(self._postings) * 200
+
+    def _posting_array(self, gram):
+        array = self._arrays.get(gram)
+        if array is None:
+            array = np.asarray(self._postings[gram], dtype=np.int32)
+            self._arrays[gram] = array
+        return array
+
+    def search(self, codes: List[int], limit: int) -> Optional[Any]:
+        """공유 bigram 수 상위 limit명의 행 번호 (흔한 bigram만 있어 후보를 못 고르면 None)"""
+        max_postings = max(1, int(self.count * MAX_GRAM_RATIO))
+        postings = [self._posting_array(gram) for gram in self.grams(codes)
+                    if 0 < len(self._postings.get(gram, ())) <= max_postings]
+        if not postings:
+            return None
+        rows, shared = np.unique(np.concatenate(postings), return_counts=True)
+        if len(rows) > limit:
+            rows = rows[np.argpartition(-shared, limit - 1)[:limit]]
+        return rows
+
+
+class NameMatcher:
+    """회원 이름 일괄 매칭 엔진
+
+    회원 이름을 글자 단위/자모 단위 정수 배열로 한 번만 변환해 두고,
+    OCR 이름 여러 개와 전체 회원의 편집 거리를 비트 병렬 연산으로 한 번에 계산합니다.
+    유사도 = 0.6 x 글자 단위 + 0.4 x 자모 단위 (각각 1 - 거리 / 긴 쪽 길이)
+    회원이 candidate_limit명보다 많으면 자모 bigram 색인으로 고른 후보만 계산합니다.
+    """
+
+    def __init__(self, members: Iterable[str] = (), candidate_limit: int = CANDIDATE_LIMIT):
+        self.members: List[str] = []
+        self.candidate_limit = candidate_limit
+        self._chars = _SequenceTable()
+        self._jamo = _SequenceTable()
+        self._index = JamoNgramIndex()
+        self._lock = threading.Lock()
+        for name in members:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def add(self, name: str):
+        """회원 추가 (배열 끝에 덧붙임)"""
+        codes = jamo_codes(name)
+        with self._lock:
+            self._index.add(len(self.members), codes)
+            self.members.append(name)
+            self._chars.append(list(name))
+            self._jamo.append(codes)
+
+    def memory_bytes(self) -> int:
+        """배열, 기호표, 색인의 대략적인 메모리 사용량"""
+        with self._lock:
+            size = sys.getsizeof(self.members)
+            for table in (self._chars, self._jamo):
+                size += table.codes.nbytes + table.lengths.nbytes + len(table.symbols) * 100
+            return size + self._index.memory_bytes()
+
+    def candidates(self, queries: List[str]) -> Optional[Any]:
+        """질의들의 후보 회원 행 번호 합집합 (전체 계산이 필요하면 None)"""
+        with self._lock:
+            if len(self.members) <= self.candidate_limit:
+                return None
+            found = []
+            for query in queries:
+                rows = self._index.search(jamo_codes(query), self.candidate_limit)
+                if rows is None:
+                    return None
+                found.append(rows)
+        return np.unique(np.concatenate(found))
+
+    def similarity_matrix(self, queries: List[str], rows=None):
+        """(질의 수, 회원 수) 유사도 행렬 (rows를 주면 해당 회원 열만)"""
+        with self._lock:
+            count = self._chars.count
+            char_codes, char_lengths = self._chars.codes[:count], self._chars.lengths[:count]
+            jamo_table, jamo_lengths = self._jamo.codes[:count], self._jamo.lengths[:count]
+            char_peq, char_query_lengths = self._chars.query_masks([list(query) for query in queries])
+            jamo_peq, jamo_query_lengths = self._jamo.query_masks([jamo_codes(query) for query in queries])
+        similarity = None
+        for weight, peq, query_lengths, codes, lengths in (
+            (CHAR_WEIGHT, char_peq, char_query_lengths, char_codes, char_lengths),
+            (JAMO_WEIGHT, jamo_peq, jamo_query_lengths, jamo_table, jamo_lengths),
+        ):
+            distances = bit_parallel_distances(peq, query_lengths, codes, lengths, rows)
+            member_lengths = lengths if rows is None else lengths[rows]
+            longest = np.maximum(query_lengths[:, None], member_lengths[None, :]).astype(np.float64)
+            part = 1.0 - distances / np.maximum(longest, 1.0)
+            similarity = weight * part if similarity is None else similarity + weight * part
+        return similarity
+
+    def top_k(self, queries: List[str], k: int = 5) -> List[List[Tuple[str, float]]]:
+        """질의별 상위 k명 (이름, 유사도)"""
+        if not queries:
+            return []
+        if not self.members:
+            return [[] for _ in queries]
+        rows = self.candidates(queries)
+        similarity = self.similarity_matrix(queries, rows)
+        k = min(k, similarity.shape[1])
+        results = []
+        for scores in similarity:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            members = top if rows is None else rows[top]
+            results.append([(self.members[member], float(scores[column])) for member, column in zip(members, top)])
+        return results
+
+    def best_matches(self, queries: List[str], min_confidence: float = MIN_CONFIDENCE) -> List[Dict[str, Any]]:
+        """질의별 최고 일치 회원 (신뢰도가 min_confidence 미만이면 원본 이름, 신뢰도 0)"""
+        results = []
+        for query, candidates in zip(queries, self.top_k(queries, 1)):
+            if candidates and candidates[0][1] >= min_confidence:
+                results.append({'name': candidates[0][0], 'confidence': candidates[0][1]})
+            else:
+                results.append({'name': query, 'confidence': 0.0})
+        return results
+
+    def assign(self, queries: List[str], min_confidence: float = MIN_CONFIDENCE) -> List[Dict[str, Any]]:
+        """스코어보드의 이름 전체를 회원과 일대일로 배정 (유사도 합 최대, 헝가리안 알고리즘)
+
+        한 질의가 배정받는 회원은 그 질의의 상위 (질의 수)명 안에 있으므로 그 합집합 열만 남겨 풉니다.
+        min_confidence 미만인 쌍은 배정하지 않고 원본 이름(신뢰도 0)으로 둡니다.
+        """
+        unmatched = [{'name': query, 'confidence': 0.0} for query in queries]
+        if not queries or not self.members:
+            return unmatched
+        rows = self.candidates(queries)
+        similarity = self.similarity_matrix(queries, rows)
+        k = min(len(queries), similarity.shape[1])
+        keep = np.unique(np.concatenate([np.argpartition(-scores, k - 1)[:k] for scores in similarity]))
+        pruned = similarity[:, keep].tolist()
+        # 기준 미만 쌍과 "배정 안 함"(질의 수만큼의 가상 열)은 비용 0
+        cost = [[-score if score >= min_confidence else 0.0 for score in scores] + [0.0] * len(queries)
+                for scores in pruned]
+        members = keep if rows is None else rows[keep]
+        results = []
+        for query_index, column in enumerate(hungarian(cost)):
+            if column < len(keep) and pruned[query_index][column] >= min_confidence:
+                results.append({'name': self.members[members[column]], 'confidence': pruned[query_index][column]})
+            else:
+                results.append(unmatched[query_index])
+        return results
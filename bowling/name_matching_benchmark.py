@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+이름 매칭 벤치마크: 기존 difflib 방식 vs NameMatcher(비트 병렬 일괄 계산, 자모 bigram 후보 검색)
+
+회원 15명 / 1,000명 / 100,000명에 대해 OCR 이름 6개(스코어보드 한 장)를 매칭하는 시간과
+원래 이름을 찾은 비율(정확도)을 출력합니다. "전체"는 후보 검색 없이 모든 회원을 계산한 경우입니다. 기존 방식은 느려서 --legacy-limit 이하 회원 수에서만 측정합니다.
+
+사용법:
+  python name_matching_benchmark.py
+  python name_matching_benchmark.py --members 15 1000 100000 --queries 6 --top-k 5
+"""
+
+import time
+import random
+import difflib
+import argparse
+import statistics
+from typing import Callable, List, Dict, Any
+
+from pipeline_benchmark import SEED, make_member_names, make_ocr_variant
+from name_matcher import NameMatcher, MIN_CONFIDENCE
+
+
+def legacy_best_match(target_name: str, member_list: List[str]) -> Dict[str, Any]:
+    """기존 find_best_name_match (difflib 두 번: 글자 단위 0.6 + "초_중_종" 문자열 0.4)"""
+    def decompose(text):
+        parts = []
+        for char in text:
+            if '가' <= char <= '힣':
+                code = ord(char) - ord('가')
+                parts.append(f"{code // 588}_{(code % 588) // 28}_{code % 28}")
+            else:
+                parts.append(char)
+        return ''.join(parts)
+
+    best = {'name': target_name, 'confidence': 0.0}
+    for member_name in member_list:
+        similarity = difflib.SequenceMatcher(None, target_name, member_name).ratio()
+        jamo_similarity = difflib.SequenceMatcher(None, decompose(target_name), decompose(member_name)).ratio()
+        final_similarity = similarity * 0.6 + jamo_similarity * 0.4
+        if final_similarity > best['confidence']:
+            best = {'name': member_name, 'confidence': final_similarity}
+    if best['confidence'] < MIN_CONFIDENCE:
+        best = {'name': target_name, 'confidence': 0.0}
+    return best
+
+
+def median_seconds(func: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def run(member_count: int, query_count: int, top_k: int, repeat: int, legacy_limit: int) -> Dict[str, Any]:
+    members = make_member_names(member_count)
+    rng = random.Random(SEED)
+    truths = [rng.choice(members) for _ in range(query_count)]
+    queries = [make_ocr_variant(name, rng) for name in truths]
+
+    started = time.perf_counter()
+    matcher = NameMatcher(members)
+    build_seconds = time.perf_counter() - started
+
+    # 후보 검색 없이 전체 회원을 계산하는 경우와 비교
+    full_scan = NameMatcher(members, candidate_limit=member_count)
+
+    matcher.best_matches(queries)  # 워밍업
+    result: Dict[str, Any] = {
+        "members": member_count,
+        "build_ms": build_seconds * 1000,
+        "match_ms": median_seconds(lambda: matcher.best_matches(queries), repeat) * 1000,
+        "full_scan_ms": median_seconds(lambda: full_scan.best_matches(queries), repeat) * 1000,
+        "full_scan_accuracy": sum(m['name'] == t for m, t in zip(full_scan.best_matches(queries), truths)) / query_count,
+        "top_k_ms": median_seconds(lambda: matcher.top_k(queries, top_k), repeat) * 1000,
+        "accuracy": sum(m['name'] == t for m, t in zip(matcher.best_matches(queries), truths)) / query_count,
+        "top_k_recall": sum(t in [name for name, _ in c] for c, t in zip(matcher.top_k(queries, top_k), truths)) / query_count,
+        "legacy_ms": None,
+        "legacy_accuracy": None,
+    }
+    if member_count <= legacy_limit:
+        legacy_repeat = max(1, min(repeat, 3)) if member_count > 1000 else repeat
+        result["legacy_ms"] = median_seconds(lambda: [legacy_best_match(q, members) for q in queries], legacy_repeat) * 1000
+        legacy = [legacy_best_match(q, members) for q in queries]
+        result["legacy_accuracy"] = sum(m['name'] == t for m, t in zip(legacy, truths)) / query_count
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이름 매칭 벤치마크")
+    parser.add_argument("--members", type=int, nargs="+", default=[15, 1000, 100000])
+    parser.add_argument("--queries", type=int, default=6, help="OCR 이름 수 (스코어보드 한 장)")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy-limit", type=int, default=10000, help="기존 방식을 측정할 최대 회원 수")
+    args = parser.parse_args()
+
+    print(f"{'회원 수':>8} {'구축(ms)':>10} {'매칭(ms)':>10} {'전체(ms)':>10} {'top-k(ms)':>10} {'기존(ms)':>10} {'배속':>8} "
+          f"{'정확도':>7} {'전체 정확도':>10} {'기존 정확도':>10} {'top-k 재현율':>12}")
+    for member_count in args.members:
+        r = run(member_count, args.queries, args.top_k, args.repeat, args.legacy_limit)
+        legacy = f"{r['legacy_ms']:10.2f}" if r['legacy_ms'] is not None else f"{'-':>10}"
+        speedup = f"{r['legacy_ms'] / r['match_ms']:7.1f}x" if r['legacy_ms'] is not None and r['match_ms'] else f"{'-':>8}"
+        legacy_accuracy = f"{r['legacy_accuracy']:10.0%}" if r['legacy_accuracy'] is not None else f"{'-':>10}"
+        print(f"{r['members']:>8} {r['build_ms']:10.2f} {r['match_ms']:10.2f} {r['full_scan_ms']:10.2f} {r['top_k_ms']:10.2f} "
+              f"{legacy} {speedup} {r['accuracy']:7.0%} {r['full_scan_accuracy']:10.0%} {legacy_accuracy} "
+              f"{r['top_k_recall']:12.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+이름 유사도 계산기 평가
+
+OCR 오인식 이름(라벨 = 실제 회원)으로 계산기별 정확도, 쌍당 시간, 최대 메모리를 측정하고
+정확도 기준을 넘는 계산기 중 가장 빠른 것을 추천합니다 (BOWLING_NAME_SCORER로 지정).
+
+평가 세트:
+  - name_similarity_test.py의 회원목록과 확인된 오인식 사례 (김한규 -> 김환규 등)
+  - 고정 시드 회원 목록에 자주 나오는 한글 OCR 혼동(모음 획, 비슷한 초성, 받침 누락/추가)을 적용한 이름
+
+사용법:
+  python name_scorer_evaluation.py
+  python name_scorer_evaluation.py --members 15 1000 --per-size 200 --min-accuracy 0.9
+"""
+
+import time
+import random
+import argparse
+import tracemalloc
+from typing import List, Tuple, Dict, Any
+
+from hangul_utils import decompose_syllable, compose_syllable
+from pipeline_benchmark import SEED, make_member_names, make_ocr_variant
+from name_scorers import available_scorers, create_scorer
+
+# name_similarity_test.py의 회원목록과 사례
+SAMPLE_MEMBERS = ["김경희", "김환규", "박철수", "이영희", "최민수", "정수진", "한지영", "윤성호", "임태현", "송미영"]
+SAMPLE_CASES = [
+    ("김한규", "김환규"), ("김경이", "김경희"), ("이영이", "이영희"), ("김경희", "김경희"),
+    ("박철수", "박철수"), ("최민수", "최민수"), ("정수진", "정수진"), ("한지영", "한지영"),
+    ("윤성호", "윤성호"), ("임태현", "임태현"), ("송미영", "송미영"),
+]
+
+# 자주 혼동되는 자모 (인덱스: 초성 ㄱ0 ㄴ2 ㄷ3 ㅂ7 ㅅ9 ㅇ11 ㅈ12 ㅊ14 ㅋ15 ㅌ16 ㅍ17 ㅎ18,
+# 중성 ㅏ0 ㅐ1 ㅑ2 ㅓ4 ㅔ5 ㅕ6 ㅗ8 ㅘ9 ㅚ11 ㅛ12 ㅜ13 ㅝ14 ㅠ17 ㅢ19 ㅣ20)
+CHO_CONFUSIONS = [(11, 18), (0, 15), (3, 16), (7, 17), (12, 14), (9, 12)]
+JUNG_CONFUSIONS = [(0, 2), (4, 6), (8, 12), (13, 17), (9, 0), (14, 4), (1, 5), (19, 20), (11, 8)]
+JONG_CONFUSIONS = [4, 8, 16, 21]  # 받침 추가 후보: ㄴ ㄹ ㅁ ㅇ
+
+
+def make_ocr_confusion(name: str, rng: random.Random) -> str:
+    """한 글자에 OCR 혼동 하나를 적용 (해당 혼동이 없는 글자면 make_ocr_variant)"""
+    chars = list(name)
+    i = rng.randrange(len(chars))
+    syllable = decompose_syllable(chars[i])
+    if syllable is None:
+        return make_ocr_variant(name, rng)
+    cho, jung, jong = syllable
+    kind = rng.choice(("cho", "jung", "jong"))
+    if kind == "cho":
+        swaps = [b if a == cho else a for a, b in CHO_CONFUSIONS if cho in (a, b)]
+        if not swaps:
+            return make_ocr_variant(name, rng)
+        cho = rng.choice(swaps)
+    elif kind == "jung":
+        swaps = [b if a == jung else a for a, b in JUNG_CONFUSIONS if jung in (a, b)]
+        if not swaps:
+            return make_ocr_variant(name, rng)
+        jung = rng.choice(swaps)
+    else:
+        jong = 0 if jong else rng.choice(JONG_CONFUSIONS)
+    chars[i] = compose_syllable(cho, jung, jong)
+    return "".join(chars)
+
+
+def labeled_set(member_count: int, size: int) -> Tuple[List[str], List[Tuple[str, str]]]:
+    members = make_member_names(member_count)
+    rng = random.Random(SEED + member_count)
+    cases = []
+    for _ in range(size):
+        truth = rng.choice(members)
+        cases.append((make_ocr_confusion(truth, rng), truth))
+    return members, cases
+
+
+def evaluate(scorer_name: str, members: List[str], cases: List[Tuple[str, str]], batch: int) -> Dict[str, Any]:
+    """스코어보드 한 장(batch명)씩 best_matches로 매칭"""
+    scorer = create_scorer(scorer_name)
+    scorer.memo.max_entries = 0  # 계산 시간만 측정 (반복 이름 메모 끔)
+    queries = [query for query, _ in cases]
+    tracemalloc.start()
+    started = time.perf_counter()
+    scorer.prepare(members)
+    matches = []
+    for start in range(0, len(queries), batch):
+        matches.extend(scorer.best_matches(queries[start:start + batch], members))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    correct = sum(match['name'] == truth for match, (_, truth) in zip(matches, cases))
+    return {
+        "accuracy": correct / len(cases),
+        "pair_us": elapsed / (len(cases) * len(members)) * 1e6,
+        "query_ms": elapsed / len(cases) * 1000,
+        "peak_kb": peak / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이름 유사도 계산기 평가")
+    parser.add_argument("--members", type=int, nargs="+", default=[15, 1000])
+    parser.add_argument("--per-size", type=int, default=120, help="회원 수별 평가 이름 수")
+    parser.add_argument("--batch", type=int, default=6, help="한 번에 매칭하는 이름 수 (스코어보드 한 장)")
+    parser.add_argument("--min-accuracy", type=float, default=0.9, help="추천 기준 정확도")
+    parser.add_argument("--scorers", nargs="+", default=None, help="평가할 계산기 (기본: 사용 가능한 전체)")
+    args = parser.parse_args()
+
+    scorers = args.scorers or available_scorers()
+    datasets = [("sample", SAMPLE_MEMBERS, SAMPLE_CASES)]
+    for member_count in args.members:
+        members, cases = labeled_set(member_count, args.per_size)
+        datasets.append((f"{member_count}명", members, cases))
+
+    summary: Dict[str, Dict[str, float]] = {name: {"min_accuracy": 1.0, "query_ms": 0.0} for name in scorers}
+    print(f"{'세트':<8} {'계산기':<16} {'정확도':>7} {'쌍당(µs)':>10} {'이름당(ms)':>11} {'최대 메모리(KB)':>15}")
+    for label, members, cases in datasets:
+        for scorer_name in scorers:
+            result = evaluate(scorer_name, members, cases, args.batch)
+            summary[scorer_name]["min_accuracy"] = min(summary[scorer_name]["min_accuracy"], result["accuracy"])
+            summary[scorer_name]["query_ms"] = result["query_ms"]  # 가장 큰 회원 수 기준
+            print(f"{label:<8} {scorer_name:<16} {result['accuracy']:7.1%} {result['pair_us']:10.2f} "
+                  f"{result['query_ms']:11.3f} {result['peak_kb']:15.1f}")
+
+    passing = [name for name in scorers if summary[name]["min_accuracy"] >= args.min_accuracy]
+    if passing:
+        best = min(passing, key=lambda name: summary[name]["query_ms"])
+        print(f"\n✅ 정확도 {args.min_accuracy:.0%} 이상 중 가장 빠른 계산기: {best} (BOWLING_NAME_SCORER={best})")
+    else:
+        print(f"\n❌ 정확도 {args.min_accuracy:.0%}를 넘는 계산기가 없습니다")
+
+
+if __name__ == "__main__":
+    main()
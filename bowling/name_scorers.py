@@ -0,0 +1,329 @@
+import difflib
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Tuple, Optional
+
+from hangul_utils import decompose_syllable, to_jamo_string, normalize_name
+from name_matcher import NameMatcher, hungarian, pair_similarity, MIN_CONFIDENCE
+
+logger = logging.getLogger(__name__)
+
+try:
+    from fuzzywuzzy import fuzz
+    FUZZYWUZZY_AVAILABLE = True
+except ImportError:
+    fuzz = None
+    FUZZYWUZZY_AVAILABLE = False
+
+DEFAULT_SCORER = os.getenv("BOWLING_NAME_SCORER", "edit_distance")
+# 메모에는 질의별 상위 MEMO_TOP_K명을 저장 (일대일 배정은 질의 수 이하의 후보만 있으면 충분)
+MEMO_TOP_K = 8
+
+
+class MatchMemo:
+    """(정규화한 OCR 이름, 회원 목록 버전) -> 상위 후보 목록 LRU
+
+    같은 클럽 회원들이 매주 같은 화면을 찍어 같은 오인식("김한규", "김환구")이 반복되므로
+    계산 결과를 재사용합니다. 메모리는 키/값 객체 크기의 근사치입니다.
+    """
+
+    def __init__(self, max_entries: int = int(os.getenv("BOWLING_NAME_MEMO_SIZE", "10000"))):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[List[Tuple[str, float]], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _entry_size(key, candidates) -> int:
+        size = sys.getsizeof(key) + sys.getsizeof(key[0]) + sys.getsizeof(candidates)
+        return size + sum(sys.getsizeof(candidate) + sys.getsizeof(candidate[1]) for candidate in candidates)
+
+    def get(self, key) -> Optional[List[Tuple[str, float]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, candidates: List[Tuple[str, float]]):
+        if self.max_entries <= 0:
+            return
+        size = self._entry_size(key, candidates)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (candidates, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self._entries), "bytes": self.bytes, "hits": self.hits, "misses": self.misses,
+                    "hit_ratio": self.hits / lookups if lookups else 0.0}
+
+    def collect_metrics(self):
+        """/metrics 수집기"""
+        return memo_metrics(self.stats())
+
+
+def memo_metrics(stats: Dict[str, Any]):
+    """메모 통계 -> /metrics 항목 (클럽별 메모는 합산해서 전달)"""
+    return [
+        ("bowling_name_memo_entries", "gauge", "Memoized name-match entries", None, stats["entries"]),
+        ("bowling_name_memo_bytes", "gauge", "Approximate memory held by the name-match memo", None, stats["bytes"]),
+        ("bowling_name_memo_lookups_total", "counter", "Name-match memo lookups", {"result": "hit"}, stats["hits"]),
+        ("bowling_name_memo_lookups_total", "counter", "Name-match memo lookups", {"result": "miss"}, stats["misses"]),
+        ("bowling_name_memo_hit_ratio", "gauge", "Name-match memo hit ratio since start", None, stats["hit_ratio"]),
+    ]
+
+
+class NameScorer:
+    """이름 유사도 계산기 공통 인터페이스 (유사도는 0~1)
+
+    score(질의, 회원)만 구현하면 일괄 매칭(best_matches), 상위 후보(candidates),
+    일대일 배정(assign)을 쓸 수 있습니다. 질의별 상위 후보는 (정규화한 이름, 회원 목록 버전)으로 메모해 두고,
+    다른 회원 목록 객체가 들어오거나 members_updated()로 목록 변경을 알리면 버전을 올리고 메모를 비웁니다
+    (요청마다 목록 내용을 비교하지 않음). 회원 목록을 미리 변환해 두는 계산기는 members_changed를 구현합니다.
+    """
+
+    name = ""
+
+    def __init__(self):
+        self.memo = MatchMemo()
+        self.version = 0
+        self.members_version = 0  # 회원 목록 변경 번호 (members_updated()로 증가)
+        self._source = None  # 마지막으로 본 회원 목록 객체
+        self._synced_members_version = 0  # 그때의 변경 번호
+        self._sync_lock = threading.Lock()
+
+    def score(self, query: str, member: str) -> float:
+        raise NotImplementedError
+
+    def members_changed(self, member_list: List[str]):
+        """회원 목록 변경 반영 (기본: 할 일 없음)"""
+
+    def members_updated(self):
+        """회원 목록을 제자리에서 바꾼 뒤 호출 (ClubDirectory.add_member, 다음 sync에서 반영)"""
+        with self._sync_lock:
+            self.members_version += 1
+
+    def sync(self, member_list: List[str]) -> int:
+        """회원 목록 버전 (목록 객체가 바뀌거나 변경 번호가 오르면 증가, O(1))"""
+        with self._sync_lock:
+            if member_list is not self._source or self.members_version != self._synced_members_version:
+                self._source = member_list
+                self._synced_members_version = self.members_version
+                self.version += 1
+                self.memo.clear()
+                self.members_changed(member_list)
+            return self.version
+
+    def prepare(self, member_list: List[str]):
+        """회원 목록 변경을 미리 반영 (POST /members)"""
+        self.sync(member_list)
+
+    def memory_bytes(self) -> int:
+        """메모의 대략적인 메모리 사용량"""
+        return self.memo.bytes
+
+    def similarity_matrix(self, queries: List[str], member_list: List[str]) -> List[List[float]]:
+        return [[self.score(query, member) for member in member_list] for query in queries]
+
+    def top_k(self, queries: List[str], member_list: List[str], k: int = 5) -> List[List[Tuple[str, float]]]:
+        """질의별 상위 k명 계산 (메모 없이)"""
+        results = []
+        for scores in self.similarity_matrix(queries, member_list):
+            ranked = sorted(range(len(scores)), key=lambda i: -scores[i])[:k]
+            results.append([(member_list[i], scores[i]) for i in ranked])
+        return results
+
+    def candidates(self, queries: List[str], member_list: List[str], k: int = 5) -> List[List[Tuple[str, float]]]:
+        """질의별 상위 k명 (정규화한 이름 기준, 메모 사용)"""
+        version = self.sync(member_list)
+        names = [normalize_name(query) for query in queries]
+        if k > MEMO_TOP_K:
+            return self.top_k(names, member_list, k)
+        results: List[Optional[List[Tuple[str, float]]]] = []
+        missing = []
+        for name in names:
+            cached = self.memo.get((name, version))
+            results.append(cached)
+            if cached is None:
+                missing.append(name)
+        if missing:
+            unique = list(dict.fromkeys(missing))
+            computed = dict(zip(unique, self.top_k(unique, member_list, MEMO_TOP_K)))
+            for name, found in computed.items():
+                self.memo.put((name, version), found)
+            results = [found if found is not None else computed[name] for name, found in zip(names, results)]
+        return [found[:k] for found in results]
+
+    def best_matches(self, queries: List[str], member_list: List[str],
+                     min_confidence: float = MIN_CONFIDENCE) -> List[Dict[str, Any]]:
+        """질의별 최고 일치 회원 (신뢰도가 min_confidence 미만이면 원본 이름, 신뢰도 0)"""
+        results = []
+        for query, found in zip(queries, self.candidates(queries, member_list, 1)):
+            if found and found[0][1] >= min_confidence:
+                results.append({'name': found[0][0], 'confidence': found[0][1]})
+            else:
+                results.append({'name': query, 'confidence': 0.0})
+        return results
+
+    def assign(self, queries: List[str], member_list: List[str],
+               min_confidence: float = MIN_CONFIDENCE) -> List[Dict[str, Any]]:
+        """일대일 배정 (유사도 합 최대, 헝가리안 알고리즘)
+
+        최적 배정에서 각 질의의 회원은 그 질의의 상위 (질의 수)명 안에 있으므로 질의별 후보만으로 풉니다.
+        min_confidence 미만인 쌍은 배정하지 않고 원본 이름(신뢰도 0)으로 둡니다.
+        """
+        unmatched = [{'name': query, 'confidence': 0.0} for query in queries]
+        if not queries or not member_list:
+            return unmatched
+        found = self.candidates(queries, member_list, len(queries))
+        columns = list(dict.fromkeys(name for candidates in found for name, _ in candidates))
+        position = {name: column for column, name in enumerate(columns)}
+        # 후보가 아닌 쌍, 기준 미만 쌍, "배정 안 함"(질의 수만큼의 가상 열)은 비용 0
+        cost = [[0.0] * (len(columns) + len(queries)) for _ in queries]
+        scores = [dict(candidates) for candidates in found]
+        for row, candidates in enumerate(found):
+            for name, score in candidates:
+                if score >= min_confidence:
+                    cost[row][position[name]] = -score
+        results = []
+        for row, column in enumerate(hungarian(cost)):
+            score = scores[row].get(columns[column], 0.0) if column < len(columns) else 0.0
+            if score >= min_confidence and column < len(columns):
+                results.append({'name': columns[column], 'confidence': score})
+            else:
+                results.append(unmatched[row])
+        return results
+
+
+class DifflibScorer(NameScorer):
+    """기존 운영 공식: difflib 글자 비율 x 0.6 + "초_중_종" 문자열 difflib 비율 x 0.4"""
+
+    name = "difflib"
+
+    @staticmethod
+    def _decompose(text: str) -> str:
+        parts = []
+        for char in text:
+            syllable = decompose_syllable(char)
+            parts.append(f"{syllable[0]}_{syllable[1]}_{syllable[2]}" if syllable else char)
+        return "".join(parts)
+
+    def score(self, query: str, member: str) -> float:
+        similarity = difflib.SequenceMatcher(None, query, member).ratio()
+        jamo_similarity = difflib.SequenceMatcher(None, self._decompose(query), self._decompose(member)).ratio()
+        return similarity * 0.6 + jamo_similarity * 0.4
+
+
+class FuzzyScorer(NameScorer):
+    """fuzzywuzzy ratio, partial_ratio, token_sort_ratio, token_set_ratio 평균 (name_similarity_test.py)"""
+
+    name = "fuzzywuzzy"
+
+    def __init__(self):
+        if not FUZZYWUZZY_AVAILABLE:
+            raise RuntimeError("fuzzywuzzy 라이브러리가 설치되지 않았습니다. (pip install fuzzywuzzy python-Levenshtein)")
+        super().__init__()
+
+    def score(self, query: str, member: str) -> float:
+        return (fuzz.ratio(query, member) + fuzz.partial_ratio(query, member)
+                + fuzz.token_sort_ratio(query, member) + fuzz.token_set_ratio(query, member)) / 400
+
+
+class PositionalJamoScorer(NameScorer):
+    """위치별 자모 일치율 x 0.8 + 글자 비율 x 0.2 (name_similarity_test.py, jamo_correct_test.py)"""
+
+    name = "positional_jamo"
+
+    def __init__(self):
+        super().__init__()
+        self._jamo_cache: Dict[str, str] = {}
+
+    def _jamo(self, text: str) -> str:
+        jamo = self._jamo_cache.get(text)
+        if jamo is None:
+            jamo = to_jamo_string(text)
+            if len(self._jamo_cache) < 100_000:
+                self._jamo_cache[text] = jamo
+        return jamo
+
+    def score(self, query: str, member: str) -> float:
+        query_jamo, member_jamo = self._jamo(query), self._jamo(member)
+        if not query_jamo or not member_jamo:
+            return 0.0
+        matches = sum(1 for a, b in zip(query_jamo, member_jamo) if a == b)
+        positional = matches / len(query_jamo)
+        if FUZZYWUZZY_AVAILABLE:
+            char_similarity = fuzz.ratio(query, member) / 100
+        else:
+            char_similarity = difflib.SequenceMatcher(None, query, member).ratio()
+        return positional * 0.8 + char_similarity * 0.2
+
+
+class EditDistanceScorer(NameScorer):
+    """NameMatcher(비트 병렬 편집 거리, 자모 bigram 후보 검색) 기반 계산기. 회원이 뒤에 추가되면 새 이름만 반영"""
+
+    name = "edit_distance"
+
+    def __init__(self):
+        super().__init__()
+        self._matcher = NameMatcher()
+
+    def members_changed(self, member_list: List[str]):
+        if len(self._matcher) <= len(member_list) and self._matcher.members == member_list[:len(self._matcher)]:
+            for member_name in member_list[len(self._matcher):]:
+                self._matcher.add(member_name)
+        else:
+            self._matcher = NameMatcher(member_list)
+
+    def matcher(self, member_list: List[str]) -> NameMatcher:
+        self.sync(member_list)
+        return self._matcher
+
+    def memory_bytes(self) -> int:
+        return super().memory_bytes() + self._matcher.memory_bytes()
+
+    def score(self, query: str, member: str) -> float:
+        return pair_similarity(query, member)
+
+    def similarity_matrix(self, queries: List[str], member_list: List[str]) -> List[List[float]]:
+        return self.matcher(member_list).similarity_matrix(queries).tolist()
+
+    def top_k(self, queries: List[str], member_list: List[str], k: int = 5) -> List[List[Tuple[str, float]]]:
+        return self.matcher(member_list).top_k(queries, k)
+
+
+SCORERS = {scorer.name: scorer for scorer in (EditDistanceScorer, DifflibScorer, PositionalJamoScorer, FuzzyScorer)}
+
+
+def available_scorers() -> List[str]:
+    return [name for name in SCORERS if name != FuzzyScorer.name or FUZZYWUZZY_AVAILABLE]
+
+
+def create_scorer(name: str = DEFAULT_SCORER) -> NameScorer:
+    """설정 이름으로 계산기 생성 (없거나 사용할 수 없으면 edit_distance)"""
+    try:
+        return SCORERS[name]()
+    except (KeyError, RuntimeError) as e:
+        logger.warning("이름 유사도 계산기 '%s'를 사용할 수 없어 edit_distance를 사용합니다: %s", name, e)
+        return EditDistanceScorer()
@@ -0,0 +1,114 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, List, Tuple
+from startup import lazy_import
+
+logger = logging.getLogger(__name__)
+
+vision = lazy_import("google.cloud.vision")
+
+# Vision API 한 번의 batch_annotate_images 요청에 넣을 수 있는 최대 이미지 수
+MAX_BATCH_SIZE = 16
+
+
+def feature_type(method: str):
+    """Vision 메서드 이름 -> Feature.Type"""
+    if method == "document_text_detection":
+        return vision.Feature.Type.DOCUMENT_TEXT_DETECTION
+    return vision.Feature.Type.TEXT_DETECTION
+
+
+_current_batcher: ContextVar[Optional["OCRBatcher"]] = ContextVar("bowling_ocr_batcher", default=None)
+
+
+class OCRBatcher:
+    """여러 스레드의 Vision 요청을 모아 batch_annotate_images 한 번으로 보냄
+
+    배치 인식에서 이미지별 파이프라인이 병렬로 돌 때, 같은 단계(헤더 스캔, 영역 OCR 등)의
+    요청이 짧은 시간 안에 몰려 들어오므로 max_wait 동안 모아서 한 번에 호출합니다.
+    응답(AnnotateImageResponse)은 text_detection/document_text_detection 응답과 같은 필드를 가집니다.
+    """
+
+    def __init__(self, client, max_batch_size: int = MAX_BATCH_SIZE, max_wait: float = 0.05):
+        self.client = client
+        self.max_batch_size = min(max_batch_size, MAX_BATCH_SIZE)
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[Optional[Tuple[str, vision.Image, Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="ocr-batcher", daemon=True)
+        self._thread.start()
+        self.batches_sent = 0
+        self.requests_sent = 0
+
+    def call(self, method: str, image_vision, timeout: Optional[float] = None):
+        """요청을 배치 큐에 넣고 응답을 기다림 (text_detection 등과 같은 응답 객체 반환)"""
+        future: Future = Future()
+        future.deadline = time.monotonic() + timeout if timeout is not None else None
+        self._queue.put((method, image_vision, future))
+        return future.result(timeout=timeout)
+
+    def _collect(self) -> List[Tuple[str, "vision.Image", Future]]:
+        first = self._queue.get()
+        if first is None:
+            return []
+        items = [first]
+        while len(items) < self.max_batch_size:
+            try:
+                item = self._queue.get(timeout=self.max_wait)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            items.append(item)
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            if not items:
+                return
+            requests = [
+                vision.AnnotateImageRequest(image=image_vision, features=[vision.Feature(type_=feature_type(method))])
+                for method, image_vision, _ in items
+            ]
+            # 배치 마감은 가장 늦은 요청 기준 (각 호출자는 자기 마감까지만 기다림)
+            deadlines = [future.deadline for _, _, future in items]
+            timeout = None if None in deadlines else max(0.1, max(deadlines) - time.monotonic())
+            try:
+                batch_response = self.client.batch_annotate_images(requests=requests, timeout=timeout)
+                self.batches_sent += 1
+                self.requests_sent += len(items)
+                logger.debug("Vision 배치 호출: %s건", len(items))
+                for (_, _, future), response in zip(items, batch_response.responses):
+                    if response.error and response.error.message:
+                        future.set_exception(RuntimeError(response.error.message))
+                    else:
+                        future.set_result(response)
+            except Exception as e:
+                logger.error("Vision 배치 호출 오류: %s", e)
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+def current_batcher() -> Optional[OCRBatcher]:
+    return _current_batcher.get()
+
+
+@contextmanager
+def use_batcher(batcher: Optional[OCRBatcher]):
+    """현재 스레드(컨텍스트)의 Vision 호출을 batcher로 보냄"""
+    token = _current_batcher.set(batcher)
+    try:
+        yield
+    finally:
+        _current_batcher.reset(token)
@@ -0,0 +1,179 @@
+import re
+import sys
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
+
+from startup import lazy_import
+
+np = lazy_import("numpy")
+
+_FRAME_DIGIT = re.compile(r"[1-9]")
+
+
+@lru_cache(maxsize=4096)
+def _number_value(text: str) -> int:
+    """'7' -> 7, 정규형 정수 표기가 아니면 ('07', '7a', ' 7') -1"""
+    return int(text) if text.isdigit() and str(int(text)) == text else -1
+
+
+@lru_cache(maxsize=4096)
+def _has_frame_digit(text: str) -> bool:
+    return bool(_FRAME_DIGIT.search(text))
+
+
+class BlockTable:
+    """OCR 블록 열 단위 컨테이너
+
+    블록마다 dict를 만드는 대신 박스(N x 4: x1, y1, x2, y2)와 신뢰도를 NumPy 배열로,
+    텍스트는 intern한 문자열 목록으로 보관합니다. 행 그룹화, 영역 필터링, 기울기 회귀는 배열 연산으로 처리합니다.
+    기존 코드와 호환되도록 인덱싱/순회 시에는 {'text', 'bbox', 'confidence'} dict를 돌려줍니다.
+    """
+
+    __slots__ = ("texts", "boxes", "confidences", "_values")
+
+    def __init__(self, texts: List[str], boxes, confidences):
+        self.texts = texts
+        self.boxes = boxes
+        self.confidences = confidences
+        self._values = None
+
+    @classmethod
+    def empty(cls) -> "BlockTable":
+        return cls([], np.zeros((0, 4), dtype=np.float64), np.zeros(0, dtype=np.float64))
+
+    @classmethod
+    def from_dicts(cls, blocks: Iterable[Dict[str, Any]]) -> "BlockTable":
+        blocks = list(blocks)
+        if not blocks:
+            return cls.empty()
+        return cls([sys.intern(block['text']) for block in blocks],
+                   np.asarray([block['bbox'] for block in blocks], dtype=np.float64).reshape(-1, 4),
+                   np.asarray([block.get('confidence', 0.8) for block in blocks], dtype=np.float64))
+
+    @classmethod
+    def coerce(cls, blocks: Union["BlockTable", Iterable[Dict[str, Any]]]) -> "BlockTable":
+        """BlockTable이면 그대로, dict 목록이면 변환"""
+        return blocks if isinstance(blocks, cls) else cls.from_dicts(blocks)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        box = self.boxes[index]
+        return {'text': self.texts[index], 'bbox': [int(v) if float(v).is_integer() else float(v) for v in box],
+                'confidence': float(self.confidences[index])}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self.texts)):
+            yield self[index]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def take(self, indices) -> "BlockTable":
+        """인덱스 배열(또는 bool 마스크) 순서대로 부분 테이블"""
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        return BlockTable([self.texts[i] for i in indices.tolist()], self.boxes[indices], self.confidences[indices])
+
+    def slice(self, start: int, stop: int) -> "BlockTable":
+        """연속 구간 부분 테이블 (배열은 복사하지 않는 뷰)"""
+        return BlockTable(self.texts[start:stop], self.boxes[start:stop], self.confidences[start:stop])
+
+    # ---- 열 ----
+    @property
+    def x1(self):
+        return self.boxes[:, 0]
+
+    @property
+    def y1(self):
+        return self.boxes[:, 1]
+
+    @property
+    def x2(self):
+        return self.boxes[:, 2]
+
+    @property
+    def y2(self):
+        return self.boxes[:, 3]
+
+    @property
+    def centers(self):
+        """(N, 2) 박스 중심"""
+        return np.column_stack(((self.boxes[:, 0] + self.boxes[:, 2]) / 2, (self.boxes[:, 1] + self.boxes[:, 3]) / 2))
+
+    @property
+    def values(self):
+        """텍스트의 정수 값 (text == str(value)일 때만, 아니면 -1)"""
+        if self._values is None:
+            self._values = np.fromiter((_number_value(text) for text in self.texts), dtype=np.int64, count=len(self.texts))
+        return self._values
+
+    def frame_digit_mask(self):
+        """1-9 숫자가 들어 있는 블록 (프레임 헤더 후보: '1'~'10' 포함)"""
+        return np.fromiter((_has_frame_digit(text) for text in self.texts), dtype=bool, count=len(self.texts))
+
+    # ---- 기하 연산 ----
+    def sorted_by(self, column: int) -> "BlockTable":
+        """박스 열(0=x1, 1=y1) 기준 안정 정렬"""
+        return self.take(np.argsort(self.boxes[:, column], kind="stable"))
+
+    def group_rows(self, y_tolerance: float = 20) -> List["BlockTable"]:
+        """y1 순으로 정렬한 뒤, 행 첫 블록의 세로 중심에서 y_tolerance 이내인 블록을 같은 행으로 묶음"""
+        if not len(self):
+            return []
+        table = self.sorted_by(1)
+        centers = ((table.boxes[:, 1] + table.boxes[:, 3]) / 2).tolist()
+        rows = []
+        start = 0
+        anchor = centers[0]
+        for index, center in enumerate(centers):
+            if abs(center - anchor) > y_tolerance:
+                rows.append(table.slice(start, index))
+                start, anchor = index, center
+        rows.append(table.slice(start, len(centers)))
+        return rows
+
+    def line_fit(self) -> Optional[Dict[str, float]]:
+        """박스 중심의 최소제곱 직선 (slope)과 첫/마지막 블록 높이"""
+        if len(self) < 2:
+            return None
+        centers = self.centers
+        x, y = centers[:, 0], centers[:, 1]
+        n = len(x)
+        denominator = n * float(np.dot(x, x)) - float(x.sum()) ** 2
+        slope = (n * float(np.dot(x, y)) - float(x.sum()) * float(y.sum())) / denominator
+        heights = self.boxes[:, 3] - self.boxes[:, 1]
+        return {"slope": slope, "first_height": float(heights[0]), "last_height": float(heights[-1]),
+                "width": float(x[-1] - x[0])}
+
+
+class BlockTableBuilder:
+    """Vision 응답에서 BlockTable 만들기 (꼭짓점 좌표를 한 배열에 모아 한 번에 min/max)"""
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.confidences: List[float] = []
+        self.coordinates: List[int] = []  # 블록당 x0, y0, x1, y1, ... (꼭짓점 4개)
+
+    def append(self, text: str, confidence: float, vertices) -> bool:
+        """꼭짓점이 4개 미만이면 추가하지 않고 False"""
+        if len(vertices) < 4:
+            return False
+        for vertex in vertices[:4]:
+            self.coordinates.append(vertex.x)
+            self.coordinates.append(vertex.y)
+        self.texts.append(sys.intern(text))
+        self.confidences.append(confidence)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def build(self) -> BlockTable:
+        if not self.texts:
+            return BlockTable.empty()
+        points = np.asarray(self.coordinates, dtype=np.float64).reshape(-1, 4, 2)
+        boxes = np.concatenate((points.min(axis=1), points.max(axis=1)), axis=1)
+        return BlockTable(self.texts, boxes, np.asarray(self.confidences, dtype=np.float64))
@@ -0,0 +1,135 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """원격 OCR 회로 차단기 (최근 호출의 오류율, 느린 호출 비율 기준)
+
+    - closed: 원격 호출. 최근 window초 동안 min_calls건 이상에서 오류율 또는 느린 호출 비율이 기준을 넘으면 open
+    - open: 원격 호출 없이 바로 대체 엔진 사용. open_seconds가 지나면 half_open
+    - half_open: 한 건만 원격으로 시험 호출(probe). 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(self, name: str = "vision",
+                 window_seconds: float = float(os.getenv("BOWLING_BREAKER_WINDOW_SECONDS", "60")),
+                 min_calls: int = int(os.getenv("BOWLING_BREAKER_MIN_CALLS", "5")),
+                 error_rate: float = float(os.getenv("BOWLING_BREAKER_ERROR_RATE", "0.5")),
+                 slow_call_seconds: float = float(os.getenv("BOWLING_BREAKER_SLOW_SECONDS", "10")),
+                 slow_rate: float = float(os.getenv("BOWLING_BREAKER_SLOW_RATE", "0.5")),
+                 open_seconds: float = float(os.getenv("BOWLING_BREAKER_OPEN_SECONDS", "30"))):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self._calls: deque = deque()  # (시각, 실패 여부, 느림 여부)
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.opened_at = None
+        self.last_reason = None
+        self.probe_in_flight = False
+        self.transitions = 0
+        self.fallback_calls = 0
+
+    def _trim(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _open(self, now: float, reason: str):
+        self.state = OPEN
+        self.opened_at = now
+        self.last_reason = reason
+        self.probe_in_flight = False
+        self.transitions += 1
+        logger.warning("OCR 회로 차단기 open (%s): %s", self.name, reason)
+
+    def allow_request(self) -> bool:
+        """원격 호출 허용 여부 (half_open에서는 probe 한 건만 허용)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                self.transitions += 1
+                logger.info("OCR 회로 차단기 half_open (%s): 시험 호출", self.name)
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def record_fallback(self):
+        with self._lock:
+            self.fallback_calls += 1
+
+    def record(self, success: bool, seconds: float):
+        """원격 호출 결과 기록"""
+        now = time.monotonic()
+        slow = seconds > self.slow_call_seconds
+        with self._lock:
+            if self.state == HALF_OPEN and self.probe_in_flight:
+                self.probe_in_flight = False
+                if success and not slow:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    self.transitions += 1
+                    logger.info("OCR 회로 차단기 closed (%s): 복구됨", self.name)
+                else:
+                    self._open(now, "시험 호출 실패" if not success else f"시험 호출 느림 {seconds:.1f}s")
+                return
+            if self.state != CLOSED:
+                return
+            self._calls.append((now, not success, slow))
+            self._trim(now)
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, failed, _ in self._calls if failed)
+            slow_calls = sum(1 for _, _, is_slow in self._calls if is_slow)
+            if failures / total >= self.error_rate:
+                self._open(now, f"오류율 {failures}/{total}")
+            elif slow_calls / total >= self.slow_rate:
+                self._open(now, f"느린 호출 {slow_calls}/{total} (>{self.slow_call_seconds:.0f}s)")
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            total = len(self._calls)
+            failures = sum(1 for _, failed, _ in self._calls if failed)
+            return {
+                "state": self.state,
+                "recent_calls": total,
+                "recent_error_rate": round(failures / total, 3) if total else 0.0,
+                "open_for_seconds": round(now - self.opened_at, 1) if self.state != CLOSED and self.opened_at else None,
+                "reason": self.last_reason,
+                "fallback_calls": self.fallback_calls,
+            }
+
+    def collect_metrics(self):
+        """/metrics 수집기"""
+        return [
+            ("bowling_ocr_breaker_state", "gauge", "OCR circuit breaker state (0=closed, 1=half_open, 2=open)",
+             {"backend": self.name}, STATE_VALUES[self.state]),
+            ("bowling_ocr_breaker_transitions_total", "counter", "OCR circuit breaker state transitions",
+             {"backend": self.name}, self.transitions),
+            ("bowling_ocr_fallback_calls_total", "counter", "OCR calls served by the local fallback engine",
+             {"backend": self.name}, self.fallback_calls),
+        ]
+
+
+vision_breaker = CircuitBreaker("vision")
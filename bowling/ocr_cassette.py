@@ -0,0 +1,216 @@
+import logging
+import os
+import json
+import hashlib
+import random
+import time
+import threading
+from typing import Optional, Tuple
+from startup import lazy_import
+
+logger = logging.getLogger(__name__)
+
+vision = lazy_import("google.cloud.vision")
+
+
+def request_key(method: str, content: bytes) -> str:
+    """요청 해시 (메서드 + 이미지 바이트)"""
+    digest = hashlib.sha256()
+    digest.update(method.encode("utf-8"))
+    digest.update(b":")
+    digest.update(content)
+    return digest.hexdigest()
+
+
+class LatencyModel:
+    """재생 시 주입할 지연 시간 (시드 고정으로 재현 가능)
+
+    분포:
+    - uniform: 평균 ± 지터 (기본)
+    - lognormal: 중앙값 mean_ms, 로그 표준편차 jitter (긴 꼬리)
+    - exp: 최소 jitter_ms + 평균 mean_ms 지수 분포
+    - fixed: 항상 mean_ms
+    """
+
+    DISTRIBUTIONS = ("uniform", "lognormal", "exp", "fixed")
+
+    def __init__(self, mean_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0, distribution: str = "uniform"):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"지원하지 않는 지연 분포: {distribution}")
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "LatencyModel":
+        """"200" / "200,50" / "200,50,7" (평균, 지터, 시드), 분포 지정은 "lognormal:200,0.5,7" """
+        distribution = "uniform"
+        if spec and ":" in spec:
+            distribution, spec = spec.split(":", 1)
+            distribution = distribution.strip()
+        parts = [float(part) for part in spec.split(",") if part.strip()] if spec else []
+        mean_ms = parts[0] if len(parts) > 0 else 0.0
+        jitter_ms = parts[1] if len(parts) > 1 else 0.0
+        seed = int(parts[2]) if len(parts) > 2 else 0
+        return cls(mean_ms, jitter_ms, seed, distribution)
+
+    def sample_seconds(self) -> float:
+        with self._lock:
+            if self.distribution == "lognormal":
+                value = self.mean_ms * self._random.lognormvariate(0.0, self.jitter_ms) if self.mean_ms else 0.0
+            elif self.distribution == "exp":
+                value = self.jitter_ms + (self._random.expovariate(1.0 / self.mean_ms) if self.mean_ms else 0.0)
+            elif self.distribution == "fixed":
+                value = self.mean_ms
+            else:
+                jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+                value = self.mean_ms + jitter
+        return max(0.0, value) / 1000.0
+
+    def sleep(self):
+        seconds = self.sample_seconds()
+        if seconds:
+            time.sleep(seconds)
+
+
+class CassetteStore:
+    """요청 해시별 응답 픽스처 파일 ({cassette_dir}/{key}.json)"""
+
+    def __init__(self, cassette_dir: str = "cassettes"):
+        self.cassette_dir = cassette_dir
+        os.makedirs(cassette_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cassette_dir, f"{key}.json")
+
+    def save(self, key: str, method: str, response):
+        payload = {
+            "method": method,
+            "response": json.loads(vision.AnnotateImageResponse.to_json(response)),
+        }
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+
+    def load(self, key: str):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        return vision.AnnotateImageResponse.from_json(json.dumps(payload["response"]), ignore_unknown_fields=True)
+
+
+def _request_method_and_content(request) -> Tuple[str, bytes]:
+    feature_type = request.features[0].type_ if request.features else vision.Feature.Type.TEXT_DETECTION
+    if feature_type == vision.Feature.Type.DOCUMENT_TEXT_DETECTION:
+        return "document_text_detection", request.image.content
+    return "text_detection", request.image.content
+
+
+class RecordingClient:
+    """실제 ImageAnnotatorClient를 감싸 모든 요청/응답을 카세트로 기록"""
+
+    def __init__(self, client, store: CassetteStore):
+        self.client = client
+        self.store = store
+
+    def _record(self, method: str, image, response):
+        try:
+            self.store.save(request_key(method, image.content), method, response)
+        except Exception as e:
+            logger.error("카세트 기록 오류: %s", e)
+        return response
+
+    def text_detection(self, image, **kwargs):
+        return self._record("text_detection", image, self.client.text_detection(image=image, **kwargs))
+
+    def document_text_detection(self, image, **kwargs):
+        return self._record("document_text_detection", image,
+                            self.client.document_text_detection(image=image, **kwargs))
+
+    def batch_annotate_images(self, requests, **kwargs):
+        batch_response = self.client.batch_annotate_images(requests=requests, **kwargs)
+        for request, response in zip(requests, batch_response.responses):
+            method, _ = _request_method_and_content(request)
+            self._record(method, request.image, response)
+        return batch_response
+
+
+class ReplayClient:
+    """카세트로 응답하는 가짜 ImageAnnotatorClient (네트워크/인증 불필요)
+
+    strict=True면 기록에 없는 요청은 KeyError, False면 빈 응답을 반환합니다.
+    """
+
+    # 네트워크 채널이 없으므로 시작 단계의 OCR 예열 호출 불필요
+    requires_warmup = False
+
+    def __init__(self, store: CassetteStore, latency: Optional[LatencyModel] = None, strict: bool = False):
+        self.store = store
+        self.latency = latency or LatencyModel()
+        self.strict = strict
+        self.hits = 0
+        self.misses = 0
+
+    def _replay(self, method: str, image):
+        self.latency.sleep()
+        key = request_key(method, image.content)
+        response = self.store.load(key)
+        if response is None:
+            self.misses += 1
+            if self.strict:
+                raise KeyError(f"카세트에 없는 요청: {method} {key}")
+            logger.warning("카세트에 없는 요청 (빈 응답 반환): %s %s", method, key[:12])
+            return vision.AnnotateImageResponse()
+        self.hits += 1
+        return response
+
+    def text_detection(self, image, **kwargs):
+        return self._replay("text_detection", image)
+
+    def document_text_detection(self, image, **kwargs):
+        return self._replay("document_text_detection", image)
+
+    def batch_annotate_images(self, requests, **kwargs):
+        # 배치도 한 번의 왕복으로 취급: 지연은 1회만 적용
+        self.latency.sleep()
+        responses = []
+        for request in requests:
+            method, content = _request_method_and_content(request)
+            response = self.store.load(request_key(method, content))
+            if response is None:
+                self.misses += 1
+                if self.strict:
+                    raise KeyError(f"카세트에 없는 요청: {method}")
+                response = vision.AnnotateImageResponse()
+            else:
+                self.hits += 1
+            responses.append(response)
+        return vision.BatchAnnotateImagesResponse(responses=responses)
+
+
+def wrap_client(client, mode: str = None, cassette_dir: str = None, latency_spec: str = None):
+    """BOWLING_OCR_MODE에 따라 클라이언트 구성
+
+    - live (기본): 그대로 사용
+    - record: 실제 호출 + 카세트 기록
+    - replay: 카세트만 사용 (실제 클라이언트 불필요), BOWLING_OCR_REPLAY_LATENCY_MS="평균,지터,시드"
+    """
+    mode = mode or os.getenv("BOWLING_OCR_MODE", "live")
+    cassette_dir = cassette_dir or os.getenv("BOWLING_OCR_CASSETTE_DIR", "cassettes")
+    if mode == "record":
+        if client is None:
+            logger.warning("record 모드지만 Vision 클라이언트가 없습니다.")
+            return None
+        logger.info("OCR 기록 모드: %s", cassette_dir)
+        return RecordingClient(client, CassetteStore(cassette_dir))
+    if mode == "replay":
+        latency_spec = latency_spec if latency_spec is not None else os.getenv("BOWLING_OCR_REPLAY_LATENCY_MS", "")
+        logger.info("OCR 재생 모드: %s (지연 %s)", cassette_dir, latency_spec or "0")
+        return ReplayClient(CassetteStore(cassette_dir), LatencyModel.from_spec(latency_spec),
+                            strict=os.getenv("BOWLING_OCR_REPLAY_STRICT", "0") == "1")
+    return client
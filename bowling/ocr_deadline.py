@@ -0,0 +1,194 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Optional, Callable, Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# nginx proxy_read_timeout(60초)보다 먼저 응답하도록 요청 전체 예산 기본 50초
+DEFAULT_BUDGET_SECONDS = float(os.getenv("BOWLING_REQUEST_BUDGET_SECONDS", "50"))
+# Vision 호출 1회 최대 시간 (남은 예산이 더 짧으면 남은 예산까지)
+CALL_TIMEOUT_SECONDS = float(os.getenv("BOWLING_OCR_CALL_TIMEOUT_SECONDS", "20"))
+MAX_ATTEMPTS = int(os.getenv("BOWLING_OCR_MAX_ATTEMPTS", "3"))
+BACKOFF_BASE_SECONDS = float(os.getenv("BOWLING_OCR_BACKOFF_BASE_SECONDS", "0.2"))
+BACKOFF_MAX_SECONDS = float(os.getenv("BOWLING_OCR_BACKOFF_MAX_SECONDS", "2"))
+# 남은 예산이 이보다 짧으면 재시도하지 않음
+MIN_ATTEMPT_SECONDS = 0.5
+HEDGE_ENABLED = os.getenv("BOWLING_OCR_HEDGE", "0") == "1"
+HEDGE_MIN_SAMPLES = 20
+
+_deadline: ContextVar[Optional[float]] = ContextVar("bowling_request_deadline", default=None)
+
+
+class OCRDeadlineExceeded(TimeoutError):
+    """요청 예산 안에 Vision 응답을 받지 못함"""
+
+
+@contextmanager
+def request_deadline(budget_seconds: Optional[float] = None):
+    """현재 요청(컨텍스트)의 마감 시각 설정. 중첩되면 더 이른 마감을 유지"""
+    budget = DEFAULT_BUDGET_SECONDS if budget_seconds is None else budget_seconds
+    deadline = time.monotonic() + budget
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 예산 (초), 마감이 없으면 None"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_timeout() -> float:
+    """이번 호출에 줄 타임아웃 (호출 상한과 남은 예산 중 짧은 쪽)"""
+    left = remaining()
+    return CALL_TIMEOUT_SECONDS if left is None else min(CALL_TIMEOUT_SECONDS, left)
+
+
+def is_retryable(error: Exception) -> bool:
+    """일시적 오류만 재시도 (잘못된 요청/인증 오류는 즉시 실패)"""
+    if isinstance(error, (TimeoutError, ConnectionError, FutureTimeoutError)):
+        return True
+    try:
+        from google.api_core import exceptions as api_exceptions
+    except ImportError:
+        return False
+    return isinstance(error, (
+        api_exceptions.DeadlineExceeded,
+        api_exceptions.ServiceUnavailable,
+        api_exceptions.InternalServerError,
+        api_exceptions.TooManyRequests,
+        api_exceptions.ResourceExhausted,
+    ))
+
+
+class LatencyTracker:
+    """메서드별 최근 호출 시간 (헤지 지연 = p95)"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Dict[str, deque] = {}
+        self._p95: Dict[str, Optional[float]] = {}
+        self._lock = threading.Lock()
+        self.window = window
+
+    def record(self, method: str, seconds: float):
+        with self._lock:
+            samples = self._samples.setdefault(method, deque(maxlen=self.window))
+            samples.append(seconds)
+            # 정렬 비용을 줄이기 위해 일정 간격으로만 다시 계산
+            if len(samples) >= HEDGE_MIN_SAMPLES and len(samples) % 10 == 0:
+                ordered = sorted(samples)
+                self._p95[method] = ordered[int(len(ordered) * 0.95) - 1]
+
+    def p95(self, method: str) -> Optional[float]:
+        return self._p95.get(method)
+
+    def methods(self):
+        with self._lock:
+            return list(self._p95)
+
+
+latency_tracker = LatencyTracker()
+_hedge_executor = ThreadPoolExecutor(max_workers=int(os.getenv("BOWLING_OCR_HEDGE_WORKERS", "16")),
+                                     thread_name_prefix="ocr-hedge")
+hedge_stats = {"hedged": 0, "hedge_won": 0}
+
+
+def _hedged_call(method: str, attempt: Callable[[float], Any], timeout: float):
+    """p95 지연이 지나도 응답이 없으면 같은 요청을 한 번 더 보내고 먼저 온 성공 응답 사용"""
+    delay = latency_tracker.p95(method)
+    primary = _hedge_executor.submit(copy_context().run, attempt, timeout)
+    if delay is None or delay >= timeout:
+        return primary.result(timeout=timeout)
+    try:
+        return primary.result(timeout=delay)
+    except FutureTimeoutError:
+        pass
+    left = timeout - delay
+    hedge_stats["hedged"] += 1
+    logger.debug("Vision 헤지 요청: %s (p95 %.2fs 초과)", method, delay)
+    hedge = _hedge_executor.submit(copy_context().run, attempt, left)
+    pending = {primary, hedge}
+    error: Optional[BaseException] = None
+    end = time.monotonic() + left
+    while pending:
+        done, pending = wait(pending, timeout=max(0.0, end - time.monotonic()), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    hedge_stats["hedge_won"] += 1
+                return future.result()
+            error = future.exception()
+    raise error or FutureTimeoutError()
+
+
+def call_with_deadline(method: str, attempt: Callable[[float], Any], hedge: bool = None):
+    """예산 안에서 attempt(timeout) 호출 + 지수 백오프 재시도 (+ 선택적 헤지)
+
+    attempt는 넘겨받은 timeout(초)을 실제 백엔드 호출 마감으로 사용해야 합니다.
+    """
+    hedge = HEDGE_ENABLED if hedge is None else hedge
+    last_error: Optional[Exception] = None
+    for attempt_index in range(MAX_ATTEMPTS):
+        timeout = call_timeout()
+        if timeout <= 0:
+            break
+        started = time.monotonic()
+        try:
+            if hedge:
+                result = _hedged_call(method, attempt, timeout)
+            else:
+                result = attempt(timeout)
+            latency_tracker.record(method, time.monotonic() - started)
+            return result
+        except Exception as e:
+            last_error = e
+            if not is_retryable(e):
+                raise
+            if attempt_index == MAX_ATTEMPTS - 1:
+                break
+            # 전체 지터를 준 지수 백오프, 남은 예산 안에서만
+            backoff = random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt_index)))
+            left = remaining()
+            if left is not None and left - backoff < MIN_ATTEMPT_SECONDS:
+                break
+            logger.warning("Vision %s 재시도 %s/%s (%.2fs 후): %s", method, attempt_index + 1, MAX_ATTEMPTS - 1,
+                           backoff, e)
+            time.sleep(backoff)
+    raise OCRDeadlineExceeded(f"Vision {method} 예산 또는 재시도 한도 초과: {last_error}")
+
+
+def collect_metrics():
+    """/metrics 수집기: 헤지 횟수, 메서드별 헤지 지연(p95)"""
+    samples = [
+        ("bowling_ocr_hedged_total", "counter", "Hedged duplicate OCR requests", None, hedge_stats["hedged"]),
+        ("bowling_ocr_hedge_won_total", "counter", "Hedged OCR requests that answered first", None, hedge_stats["hedge_won"]),
+    ]
+    for method in latency_tracker.methods():
+        samples.append(("bowling_ocr_hedge_delay_seconds", "gauge", "OCR hedge delay (recent p95)",
+                        {"method": method}, latency_tracker.p95(method)))
+    return samples
+
+
+def keepalive_channel_options():
+    """gRPC 채널 keepalive (유휴 중에도 연결 유지, 끊긴 연결은 빨리 감지)"""
+    return [
+        ("grpc.keepalive_time_ms", int(os.getenv("BOWLING_OCR_KEEPALIVE_MS", "30000"))),
+        ("grpc.keepalive_timeout_ms", 10000),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.max_pings_without_data", 0),
+    ]
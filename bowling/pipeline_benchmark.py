@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+볼링 인식 파이프라인 핫패스 마이크로 벤치마크
+
+고정 시드로 만든 입력(이미지, OCR 블록, 회원 목록)으로 각 함수를 반복 실행해 중앙값을 측정하고,
+기준값(JSON)과 비교해 임계값 이상 느려진 항목을 표시합니다. 네트워크/인증 없이 실행됩니다.
+
+사용법:
+  python pipeline_benchmark.py                      # 측정만
+  python pipeline_benchmark.py --save-baseline      # 기준값 저장
+  python pipeline_benchmark.py --compare            # 기준값과 비교 (회귀 시 종료 코드 1)
+  python pipeline_benchmark.py --filter name_match --threshold 0.15
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import statistics
+from typing import Callable, Dict, List, Any, Tuple
+
+# CI 환경에서 결과가 흔들리지 않도록 단일 스레드 + 로그 최소화
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("BOWLING_LOG_LEVEL", "WARNING")
+os.environ.setdefault("BOWLING_OCR_MODE", "live")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "benchmark_baseline.json")
+sys.path.insert(0, BENCH_DIR)
+
+SEED = 20250805
+HANGUL_SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+HANGUL_SYLLABLES = "환규영범희조정원경현동서연호민지태준수빈우진소재성철미혜"
+
+
+# ---------------------------------------------------------------------------
+# 고정 입력 생성
+# ---------------------------------------------------------------------------
+
+def make_member_names(count: int, seed: int = SEED) -> List[str]:
+    rng = random.Random(seed + count)
+    # 세 글자 이름은 성 20 x 30 x 30 = 18,000개까지라 그보다 많으면 네 글자 이름을 섞음
+    three_syllable_capacity = len(HANGUL_SURNAMES) * len(HANGUL_SYLLABLES) ** 2
+    names = set()
+    while len(names) < count:
+        given = 2 if count <= three_syllable_capacity else rng.choice((2, 3))
+        names.add(rng.choice(HANGUL_SURNAMES) + "".join(rng.choice(HANGUL_SYLLABLES) for _ in range(given)))
+    return sorted(names)
+
+
+def make_ocr_variant(name: str, rng: random.Random) -> str:
+    """OCR 오인식 흉내: 한 글자의 중성/종성을 바꿈"""
+    chars = list(name)
+    i = rng.randrange(len(chars))
+    code = ord(chars[i]) - 0xAC00
+    cho, jung, jong = code // 588, (code % 588) // 28, code % 28
+    if rng.random() < 0.5:
+        jung = (jung + rng.choice((1, 20))) % 21
+    else:
+        jong = rng.randrange(28)
+    chars[i] = chr(0xAC00 + cho * 588 + jung * 28 + jong)
+    return "".join(chars)
+
+
+def make_header_blocks(distractors: int, seed: int = SEED) -> List[Dict]:
+    """1-10 프레임 헤더 + 점수판의 다른 숫자 블록 (인식 순서 섞임)"""
+    rng = random.Random(seed + distractors)
+    header = []
+    x, y = 180, 120
+    for frame in range(1, 11):
+        header.append({'text': str(frame), 'bbox': [x, y + frame, x + 14, y + 22 + frame], 'confidence': 0.95})
+        x += 62
+    others = []
+    for _ in range(distractors):
+        bx, by = rng.randrange(0, 1100), rng.randrange(150, 800)
+        others.append({'text': str(rng.randrange(1, 11)), 'bbox': [bx, by, bx + 14, by + 22], 'confidence': 0.8})
+    # 헤더 앞뒤로 다른 숫자가 섞여 인식되는 상황
+    split = len(others) // 4
+    return others[:split] + header + others[split:]
+
+
+def make_scoreboard_ocr(players: int, seed: int = SEED) -> Dict[str, Any]:
+    """parse_scoreboard_data 입력: 헤더 행 + 선수별 (이름, 프레임 점수 10개, 총점) 행"""
+    rng = random.Random(seed + players)
+    names = make_member_names(max(players, 15))
+    blocks = []
+    for frame in range(1, 11):
+        x = 180 + frame * 62
+        blocks.append({'text': str(frame), 'bbox': [x, 100, x + 14, 122], 'confidence': 0.95})
+    for row in range(players):
+        y = 140 + row * 45
+        blocks.append({'text': names[row], 'bbox': [40, y, 150, y + 28], 'confidence': 0.9})
+        total = 0
+        for frame in range(1, 11):
+            total += rng.randrange(5, 30)
+            x = 180 + frame * 62
+            blocks.append({'text': str(total), 'bbox': [x, y + rng.randrange(-3, 4), x + 30, y + 26], 'confidence': 0.9})
+        blocks.append({'text': str(total), 'bbox': [880, y, 920, y + 28], 'confidence': 0.9})
+    rng.shuffle(blocks)
+    return {'full_text': " ".join(block['text'] for block in blocks), 'blocks': blocks, 'method': 'document_detection'}
+
+
+def make_row_blocks(count: int, seed: int = SEED) -> List[Dict]:
+    rng = random.Random(seed + count)
+    blocks = []
+    for i in range(count):
+        row = i // 12
+        x = (i % 12) * 70
+        y = row * 40 + rng.randrange(-6, 7)
+        blocks.append({'text': str(i), 'bbox': [x, y, x + 30, y + 24], 'confidence': 0.9})
+    rng.shuffle(blocks)
+    return blocks
+
+
+def make_scoreboard_image(width: int, height: int, seed: int = SEED):
+    """파란 배경 + 흰 숫자 + 노이즈의 점수판 비슷한 이미지"""
+    import numpy as np
+    from PIL import Image, ImageDraw
+    rng = np.random.default_rng(seed)
+    base = np.zeros((height, width, 3), dtype=np.uint8)
+    base[..., 2] = 120
+    base[..., 1] = 40
+    image = Image.fromarray(base)
+    draw = ImageDraw.Draw(image)
+    cell = width // 14
+    for frame in range(1, 11):
+        draw.text((cell * (frame + 2), height // 10), str(frame), fill=(255, 255, 255))
+    for row in range(6):
+        for col in range(12):
+            draw.text((cell * (col + 2), height // 5 + row * height // 9), str((row * 37 + col * 11) % 300),
+                      fill=(255, 255, 255))
+    noisy = np.asarray(image, dtype=np.int16) + rng.integers(-12, 12, size=(height, width, 3))
+    return Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8))
+
+
+# ---------------------------------------------------------------------------
+# 측정
+# ---------------------------------------------------------------------------
+
+def time_case(func: Callable[[], Any], min_time: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+    """1회 실행 시간이 min_time 정도가 되도록 반복 횟수를 정하고 repeat번 측정"""
+    func()  # 워밍업
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) / loops)
+    return {"median": statistics.median(samples), "min": min(samples), "loops": loops}
+
+
+def build_cases() -> List[Tuple[str, Callable[[], Any]]]:
+    """벤치마크 케이스 (이름, 호출 함수)"""
+    from image_analyzer import ImageAnalyzer
+    from ocr_blocks import BlockTable
+    import bowling
+    from name_scorers import create_scorer, DEFAULT_SCORER
+
+    analyzer = ImageAnalyzer("uploads")
+    recognizer = bowling.recognizer
+    cases: List[Tuple[str, Callable[[], Any]]] = []
+
+    for width, height in ((1200, 900), (4000, 3000)):
+        image = make_scoreboard_image(width, height)
+        cases.append((f"preprocess_image[{width}x{height}]", lambda image=image: analyzer.preprocess_image(image)))
+
+    score_crop = make_scoreboard_image(1200, 900).convert('L').crop((800, 150, 880, 600))
+    cases.append(("apply_score_postprocess[80x450]", lambda: analyzer.apply_score_postprocess(score_crop)))
+
+    # OCR 단계가 돌려주는 것과 같은 열 단위 BlockTable로 측정
+    for distractors in (10, 60, 200):
+        blocks = BlockTable.from_dicts(make_header_blocks(distractors))
+        cases.append((f"find_consecutive_1_to_10[{len(blocks)}]", lambda b=blocks: analyzer._find_consecutive_1_to_10(b)))
+        cases.append((f"identify_scoreboard_region[{len(blocks)}]",
+                      lambda b=blocks: analyzer._identify_scoreboard_region(b, (1200, 900))))
+
+    for count in (120, 1200):
+        blocks = BlockTable.from_dicts(make_row_blocks(count))
+        cases.append((f"group_blocks_into_rows[{count}]", lambda b=blocks: recognizer._group_blocks_into_rows(b)))
+
+    for players in (6, 30):
+        ocr_result = make_scoreboard_ocr(players)
+        ocr_result['blocks'] = BlockTable.from_dicts(ocr_result['blocks'])
+        cases.append((f"parse_scoreboard_data[{players}p]", lambda r=ocr_result: recognizer.parse_scoreboard_data(r)))
+
+    rng = random.Random(SEED)
+    scorer = create_scorer(DEFAULT_SCORER)
+    scorer.memo.max_entries = 0  # 계산 시간만 측정 (반복 실행이 메모 조회만 재지 않도록)
+    for member_count in (15, 1000, 100000):
+        members = make_member_names(member_count)
+        queries = [make_ocr_variant(rng.choice(members), rng) for _ in range(6)]
+        cases.append((f"find_best_name_match[6x{member_count}]",
+                      lambda q=queries, m=members: [recognizer.find_best_name_match(name, m, scorer) for name in q]))
+
+    return cases
+
+
+def environment_info() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """기준 대비 비교표 출력, 회귀 항목 이름 반환"""
+    regressions = []
+    print(f"\n{'케이스':<45} {'기준(ms)':>10} {'현재(ms)':>10} {'변화':>8}")
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        current_ms = result["median"] * 1000
+        if base is None:
+            print(f"{name:<45} {'-':>10} {current_ms:>10.3f} {'new':>8}")
+            continue
+        base_ms = base["median"] * 1000
+        change = (current_ms - base_ms) / base_ms if base_ms else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  ⚠️ 회귀"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  ✅ 개선"
+        print(f"{name:<45} {base_ms:>10.3f} {current_ms:>10.3f} {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="볼링 파이프라인 마이크로 벤치마크")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="현재 결과를 기준값으로 저장")
+    parser.add_argument("--compare", action="store_true", help="기준값과 비교 (회귀 시 종료 코드 1)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀 판정 임계값 (기본 10%%)")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 포함된 케이스만 실행")
+    parser.add_argument("--min-time", type=float, default=0.2, help="반복 1회당 최소 측정 시간(초)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 측정 횟수")
+    args = parser.parse_args()
+
+    # 분석기/인식기가 만드는 uploads, analyzed 등은 임시 디렉토리에 생성
+    os.chdir(tempfile.mkdtemp(prefix="bowling_bench_"))
+    try:
+        import cv2
+        cv2.setNumThreads(1)
+    except ImportError:
+        pass
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, func in build_cases():
+        if args.filter and args.filter not in name:
+            continue
+        result = time_case(func, min_time=args.min_time, repeat=args.repeat)
+        results[name] = result
+        print(f"{name:<45} 중앙값 {result['median'] * 1000:10.3f} ms  최소 {result['min'] * 1000:10.3f} ms  ({result['loops']}회)")
+
+    exit_code = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"❌ 기준값 파일이 없습니다: {args.baseline}")
+            exit_code = 2
+        else:
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+            regressions = compare(results, baseline, args.threshold)
+            if regressions:
+                print(f"\n❌ 임계값 {args.threshold:.0%} 초과 회귀: {', '.join(regressions)}")
+                exit_code = 1
+            else:
+                print(f"\n✅ 임계값 {args.threshold:.0%} 이내")
+
+    if args.save_baseline:
+        baseline = {"environment": environment_info(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+        if args.filter and os.path.exists(args.baseline):
+            # 일부 케이스만 실행한 경우 기존 기준값과 병합
+            with open(args.baseline, encoding="utf-8") as f:
+                existing = json.load(f)
+            existing.get("results", {}).update(results)
+            baseline["results"] = existing.get("results", results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장됨: {args.baseline}")
+
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
+from PIL import Image
+
+from startup import lazy_import
+
+logger = logging.getLogger(__name__)
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+# 총점 칸 폭을 이 픽셀 수로 맞춰 글자를 비교 (사진 해상도와 무관하게)
+SCORE_COLUMN_WIDTH = 96
+# 재촬영으로 생기는 글자 두께/번짐 차이로 허용하는 거리 (픽셀, SCORE_COLUMN_WIDTH 기준)
+GLYPH_TOLERANCE = 2.0
+# 이름 덩어리는 재촬영 때 획 끝이 조금씩 달라지므로, 잉크 중 이 비율까지는 먼 픽셀을 허용
+# (같은 점수판 재촬영 0~0.002, 한 음절만 다른 이름 0.02 이상, 다른 이름 0.13 이상)
+NAME_FAR_RATIO = 0.01
+# 평균 획 두께(넓이 / 긴 변, 픽셀)가 이보다 얇은 조각은 흐린 표 선이 끊긴 것으로 보고 이름 덩어리에서 뺌
+# (표 선 조각 2.2 이하, 가장 얇은 한글 가로획 2.8 이상)
+NAME_STROKE_WIDTH = 2.5
+
+
+def _dct_matrix(size: int):
+    """DCT-II 변환 행렬 (scipy 없이 pHash 계산용)"""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * math.sqrt(2.0 / size)
+    matrix[0, :] = math.sqrt(1.0 / size)
+    return matrix
+
+
+_dct_32 = None
+
+
+def perceptual_hash(image: Image.Image) -> int:
+    """64비트 pHash (32x32 DCT의 저주파 8x8, 중앙값 기준)"""
+    global _dct_32
+    if _dct_32 is None:
+        _dct_32 = _dct_matrix(32)
+    pixels = np.asarray(image.convert("L").resize((32, 32), Image.BILINEAR), dtype=np.float64)
+    coefficients = (_dct_32 @ pixels @ _dct_32.T)[:8, :8].flatten()
+    # DC 성분은 밝기만 반영하므로 중앙값 계산에서 제외
+    bits = coefficients > np.median(coefficients[1:])
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def rectify_region(image: Image.Image, region: Dict) -> Image.Image:
+    """스코어보드 영역(이름~총점)을 잘라 헤더 기울기만큼 되돌림"""
+    top = min(region['y1'], region['total_y1'])
+    bottom = max(region['y2'], region['total_y2'])
+    crop = image.crop((region['x1'], top, region['x2'], bottom))
+    angle = math.degrees(math.atan(region.get('slope', 0.0)))
+    if abs(angle) > 0.2:
+        crop = crop.rotate(angle, resample=Image.BILINEAR)
+    return crop
+
+
+def _column_mask(image: Image.Image, region: Dict, x1: float, x2: float):
+    """x1~x2 칸(스코어보드 영역 높이) 주변을 총점 칸 폭이 SCORE_COLUMN_WIDTH가 되도록 맞춘 글자 마스크
+
+    칸 주변을 총점 칸 폭의 절반만큼 여백을 더 잘라 이진화합니다.
+    반환: (마스크, 마스크 안의 칸 영역) 또는 None
+    """
+    column = region['total_x2'] - region['total_x1']
+    if column <= 0 or x2 <= x1:
+        return None
+    scale = SCORE_COLUMN_WIDTH / column
+    inner = (x1, min(region['y1'], region['total_y1']), x2, max(region['y2'], region['total_y2']))
+    width, height = image.size
+    margin = column * 0.5
+    left, top = max(0, int(inner[0] - margin)), max(0, int(inner[1] - margin))
+    right, bottom = min(width, int(inner[2] + margin)), min(height, int(inner[3] + margin))
+    if right <= left or bottom <= top:
+        return None
+    gray = np.asarray(image.crop((left, top, right, bottom)).convert("L"))
+    gray = cv2.resize(gray, (max(1, round(gray.shape[1] * scale)), max(1, round(gray.shape[0] * scale))),
+                      interpolation=cv2.INTER_AREA)
+    mask = gray > 127
+    # 글자가 적은 쪽 (밝은 글자/어두운 글자 모두)
+    if mask.mean() > 0.5:
+        mask = ~mask
+    rect = tuple(round(value) for value in ((inner[0] - left) * scale, (inner[1] - top) * scale,
+                                             (inner[2] - left) * scale, (inner[3] - top) * scale))
+    return mask.astype(np.uint8), rect
+
+
+def column_glyphs(image: Image.Image, region: Dict, x1: float, x2: float) -> Dict[str, Any]:
+    """x1~x2 칸 주변의 글자 크기 마스크 (숫자 검증용)
+
+    표 선 조각, 반사광 덩어리처럼 글자 크기가 아닌 연결 요소는 뺍니다.
+    반환: rect (안쪽 영역), size (마스크 높이, 폭), glyphs [(x, y, w, h, 글자 상자 안 마스크)]
+    """
+    cropped = _column_mask(image, region, x1, x2)
+    if cropped is None:
+        return {'rect': (0, 0, 0, 0), 'size': (0, 0), 'glyphs': []}
+    mask, rect = cropped
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    x, y, w, h, area = (stats[1:, i] for i in range(5))
+    glyph = ((h >= SCORE_COLUMN_WIDTH * 0.1) & (h <= SCORE_COLUMN_WIDTH * 0.4) & (w * 5 >= h) & (w <= h * 4)
+             & (area >= w * h * 0.2))
+    # 글자 상자 안의 잉크 전체 (0의 가운데 점처럼 떨어진 조각 포함)
+    glyphs = [(int(x[i]), int(y[i]), int(w[i]), int(h[i]), mask[y[i]:y[i] + h[i], x[i]:x[i] + w[i]].copy())
+              for i in np.flatnonzero(glyph).tolist()]
+    return {'rect': rect, 'size': mask.shape, 'glyphs': glyphs}
+
+
+def name_tokens(image: Image.Image, region: Dict) -> Dict[str, Any]:
+    """이름 칸의 글자 덩어리 마스크 (이름 검증용, column_glyphs와 같은 형식)
+
+    한글은 자모가 여러 연결 요소로 떨어지고 글자 사이 간격도 좁아 음절 단위로 나누기 어려우므로,
+    가까운 조각을 묶은 덩어리(대개 이름 전체)를 비교 단위로 씁니다.
+    오른쪽 끝은 1프레임 숫자가 들어오지 않도록 총점 칸 폭의 0.3만큼 줄이고,
+    두께가 글자 획보다 얇은 조각(흐린 표 선이 끊긴 것)은 덩어리에 넣지 않습니다.
+    """
+    column = region['total_x2'] - region['total_x1']
+    cropped = _column_mask(image, region, region['name_x1'], region['name_x2'] - column * 0.3)
+    if cropped is None:
+        return {'rect': (0, 0, 0, 0), 'size': (0, 0), 'glyphs': []}
+    mask, rect = cropped
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    x, y, w, h, area = (stats[1:, i] for i in range(5))
+    center = x + w / 2
+    inside = (center >= rect[0]) & (center <= rect[2])
+    thick = area >= np.maximum(w, h) * NAME_STROKE_WIDTH
+    size = SCORE_COLUMN_WIDTH
+    seed = ((h >= size * 0.1) & (h <= size * 0.6) & (w * 5 >= h) & (w <= h * 4) & (area >= w * h * 0.2)
+            & inside & thick)
+    piece = ((h <= size * 0.6) & (w <= (rect[2] - rect[0]) * 0.75) & (np.maximum(w, h) >= size * 0.05)
+             & inside & thick)
+
+    # 가로 0.35, 세로 0.1 (총점 칸 폭 기준) 안에 있는 조각끼리 묶음
+    indices = np.flatnonzero(piece).tolist()
+    parent = {i: i for i in indices}
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    gap_x, gap_y = size * 0.35, size * 0.1
+    for position, i in enumerate(indices):
+        for j in indices[position + 1:]:
+            if (x[i] - gap_x <= x[j] + w[j] and x[j] - gap_x <= x[i] + w[i]
+                    and y[i] - gap_y <= y[j] + h[j] and y[j] - gap_y <= y[i] + h[i]):
+                parent[find(i)] = find(j)
+    groups: Dict[int, List[int]] = {}
+    for i in indices:
+        groups.setdefault(find(i), []).append(i)
+
+    tokens = []
+    for members in groups.values():
+        members = np.array(members)
+        if not seed[members].any():
+            continue
+        left, top = int(x[members].min()), int(y[members].min())
+        right, bottom = int((x[members] + w[members]).max()), int((y[members] + h[members]).max())
+        token = np.isin(labels[top:bottom, left:right], members + 1).astype(np.uint8)
+        tokens.append((left, top, right - left, bottom - top, token))
+    return {'rect': rect, 'size': mask.shape, 'glyphs': tokens}
+
+
+def _far_pixels(a, b, radius: int = 2) -> int:
+    """두 글자 마스크를 ±radius 픽셀 안에서 맞춰 본 뒤, 상대 잉크에서 GLYPH_TOLERANCE보다 먼 잉크 픽셀 수의 최솟값
+
+    두께/번짐 차이는 0이고, 다른 숫자(6과 8, 9와 0 등)는 획 하나만큼 남습니다.
+    """
+    height = max(a.shape[0], b.shape[0]) + 2 * radius
+    width = max(a.shape[1], b.shape[1]) + 2 * radius
+    canvas_a = np.zeros((height, width), np.uint8)
+    canvas_a[radius:radius + a.shape[0], radius:radius + a.shape[1]] = a
+    canvas_b = np.zeros((height, width), np.uint8)
+    canvas_b[radius:radius + b.shape[0], radius:radius + b.shape[1]] = b
+    far_a = cv2.distanceTransform(1 - canvas_a, cv2.DIST_L2, 3) >= GLYPH_TOLERANCE
+    far_b = cv2.distanceTransform(1 - canvas_b, cv2.DIST_L2, 3) >= GLYPH_TOLERANCE
+    ink_a = canvas_a > 0
+    best = None
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            # 이동 폭이 여백 이하라 np.roll로 넘어오는 부분에는 a의 잉크가 없음
+            shifted_b = np.roll(canvas_b, (dy, dx), axis=(0, 1)) > 0
+            shifted_far_b = np.roll(far_b, (dy, dx), axis=(0, 1))
+            count = int(np.count_nonzero(ink_a & shifted_far_b) + np.count_nonzero(shifted_b & far_a))
+            if best is None or count < best:
+                best = count
+    return best
+
+
+def _glyphs_covered(source: Dict[str, Any], target: Dict[str, Any], far_ratio: float = 0.0) -> Optional[int]:
+    """source 안쪽 영역의 글자가 모두 target의 같은 자리에 같은 모양으로 있으면 비교한 글자 수, 아니면 None
+
+    사진마다 원근이 조금씩 달라 글자 위치가 영역 안에서 몇 픽셀씩 다르게 밀리므로,
+    가장 가까운 글자로 구한 이동량의 주변 글자 중앙값으로 자리를 예측하고 그 자리의 글자와 비교합니다.
+    far_ratio가 있으면 상대 글자를 같은 크기로 맞춘 뒤 먼 픽셀이 잉크의 far_ratio 이하인지 봅니다 (이름 덩어리).
+    """
+    x1, y1, x2, y2 = source['rect']
+    height, width = source['size']
+    selected = [glyph for glyph in source['glyphs']
+                if x1 <= glyph[0] + glyph[2] / 2 <= x2 and y1 <= glyph[1] + glyph[3] / 2 <= y2
+                and glyph[0] > 0 and glyph[1] > 0 and glyph[0] + glyph[2] < width and glyph[1] + glyph[3] < height]
+    if not selected:
+        return 0
+    if not target['glyphs']:
+        return None
+    offset_x, offset_y = target['rect'][0] - x1, target['rect'][1] - y1
+    centers = np.array([(x + w / 2, y + h / 2) for x, y, w, h, _ in selected], dtype=np.float64)
+    target_centers = np.array([(x + w / 2, y + h / 2) for x, y, w, h, _ in target['glyphs']], dtype=np.float64)
+    nearest = [int(np.argmin(((target_centers - center - (offset_x, offset_y)) ** 2).sum(axis=1))) for center in centers]
+    shifts = target_centers[nearest] - centers
+    for index, (x, y, w, h, mask) in enumerate(selected):
+        neighbors = np.argsort(((centers - centers[index]) ** 2).sum(axis=1))[:5]
+        predicted = centers[index] + np.median(shifts[neighbors], axis=0)
+        distances = ((target_centers - predicted) ** 2).sum(axis=1)
+        match = int(np.argmin(distances))
+        if distances[match] > (0.35 * h) ** 2:
+            return None
+        _, _, match_w, match_h, match_mask = target['glyphs'][match]
+        if abs(match_h - h) > 0.25 * h + 1 or abs(match_w - w) > 0.25 * w + 1:
+            return None
+        if not far_ratio:
+            if _far_pixels(mask, match_mask):
+                return None
+            continue
+        resized = cv2.resize(match_mask.astype(np.float32), (w, h), interpolation=cv2.INTER_LINEAR) >= 0.5
+        resized = resized.astype(np.uint8)
+        if _far_pixels(mask, resized, radius=3) > far_ratio * (np.count_nonzero(mask) + np.count_nonzero(resized)):
+            return None
+    return len(selected)
+
+
+def glyphs_match(a: Dict[str, Any], b: Dict[str, Any], allow_empty: bool = False, far_ratio: float = 0.0) -> bool:
+    """두 사진의 칸 주변 글자가 서로 모두 대응하는지 (비교할 글자가 없으면 allow_empty)"""
+    forward = _glyphs_covered(a, b, far_ratio)
+    if forward is None:
+        return False
+    backward = _glyphs_covered(b, a, far_ratio)
+    return backward is not None and (forward + backward > 0 or allow_empty)
+
+
+def region_fingerprint(image: Image.Image, region: Dict) -> Dict[str, Any]:
+    """조회용 pHash(영역 전체) + 검증용 글자 마스크(이름 칸, 총점 칸과 그 오른쪽 칸)"""
+    rectified = rectify_region(image, region)
+    width, height = rectified.size
+    column = region['total_x2'] - region['total_x1']
+    return {
+        'phash': perceptual_hash(rectified),
+        'name_glyphs': name_tokens(image, region),
+        # save_and_analyze_regions가 읽는 score_part(총점 칸)와 score_part2(그 오른쪽 칸)
+        'score_glyphs': column_glyphs(image, region, region['total_x1'], region['total_x2'] + column),
+        'aspect': width / height if height else 0.0,
+    }
+
+
+class BKTree:
+    """해밍 거리 BK-트리 (반경 내 검색). 삭제는 표시만 하고 절반 이상 쌓이면 재구성"""
+
+    def __init__(self):
+        self._root = None  # [hash, {key...}, {distance: child}]
+        self._removed = set()
+        self._size = 0
+
+    def add(self, value: int, key: str):
+        self._removed.discard(key)
+        self._size += 1
+        if self._root is None:
+            self._root = [value, {key}, {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].add(key)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, {key}, {}]
+                return
+            node = child
+
+    def remove(self, key: str):
+        self._removed.add(key)
+
+    def search(self, value: int, radius: int) -> List[Tuple[int, str]]:
+        results = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                results.extend((distance, key) for key in node[1] if key not in self._removed)
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return sorted(results)
+
+    def needs_rebuild(self) -> bool:
+        return self._size > 16 and len(self._removed) * 2 > self._size
+
+    def rebuild(self, items: List[Tuple[int, str]]):
+        self._root = None
+        self._removed = set()
+        self._size = 0
+        for value, key in items:
+            self.add(value, key)
+
+
+class RecognitionCache:
+    """같은 모니터를 몇 초 간격으로 찍은 사진의 인식 결과 재사용
+
+    스코어보드 영역 pHash로 BK-트리에서 후보를 찾고, 영역 비율이 가깝고 총점 칸 글자가 글자 단위로 모두 같은 모양이며
+    이름 칸 덩어리의 먼 픽셀이 NAME_FAR_RATIO 이하일 때만 결과를 돌려줍니다
+    (저해상도 해시로는 총점 한 자리 변화가 구분되지 않으므로 글자 마스크를 직접 비교).
+    TTL과 최대 항목 수(LRU)로 정리합니다.
+    """
+
+    def __init__(self, max_entries: int = int(os.getenv("BOWLING_RESULT_CACHE_SIZE", "500")),
+                 ttl_seconds: float = float(os.getenv("BOWLING_RESULT_CACHE_TTL_SECONDS", "300")),
+                 radius: int = int(os.getenv("BOWLING_RESULT_CACHE_RADIUS", "8")),
+                 aspect_tolerance: float = 0.1):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.radius = radius
+        self.aspect_tolerance = aspect_tolerance
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tree = BKTree()
+        self._lock = threading.Lock()
+        self._counter = 0
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def _validate(self, fingerprint: Dict[str, Any], entry: Dict[str, Any]) -> bool:
+        cached = entry['fingerprint']
+        if not cached['aspect']:
+            return False
+        if abs(fingerprint['aspect'] - cached['aspect']) / cached['aspect'] > self.aspect_tolerance:
+            return False
+        if not glyphs_match(fingerprint['score_glyphs'], cached['score_glyphs']):
+            return False
+        # 이름 칸은 글자를 못 찾는 경우(이진화 실패 등)도 있어 총점 칸이 맞으면 빈 칸끼리는 허용
+        return glyphs_match(fingerprint['name_glyphs'], cached['name_glyphs'], allow_empty=True,
+                            far_ratio=NAME_FAR_RATIO)
+
+    def _evict(self, key: str):
+        self._entries.pop(key, None)
+        self._tree.remove(key)
+
+    def _purge_expired(self, now: float):
+        # 삽입 순서 = 생성 순서 (조회 시 순서 갱신은 LRU용이라 만료 검사는 전체를 봄)
+        expired = [key for key, entry in self._entries.items() if now - entry['created'] > self.ttl_seconds]
+        for key in expired:
+            self._evict(key)
+        if self._tree.needs_rebuild():
+            self._tree.rebuild([(entry['fingerprint']['phash'], key) for key, entry in self._entries.items()])
+
+    def lookup(self, fingerprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            candidates = [(distance, key, self._entries.get(key))
+                          for distance, key in self._tree.search(fingerprint['phash'], self.radius)]
+        # 글자 비교는 후보당 수십 ms라 잠금 밖에서 (항목은 교체되지 않고 추가/삭제만 되므로 안전)
+        rejected = 0
+        for distance, key, entry in candidates:
+            if entry is None or now - entry['created'] > self.ttl_seconds:
+                continue
+            if not self._validate(fingerprint, entry):
+                rejected += 1
+                continue
+            with self._lock:
+                self.rejected += rejected
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                self.hits += 1
+            logger.info("결과 캐시 적중: %s (pHash 거리 %s)", entry['source'], distance)
+            return entry
+        with self._lock:
+            self.rejected += rejected
+            self.misses += 1
+        return None
+
+    def store(self, fingerprint: Dict[str, Any], source: str, ocr_result: Dict[str, Any],
+              region_analysis: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            self._counter += 1
+            key = f"{self._counter}"
+            self._entries[key] = {
+                'fingerprint': fingerprint,
+                'source': source,
+                'created': now,
+                'ocr_result': ocr_result,
+                'region_analysis': region_analysis,
+            }
+            self._tree.add(fingerprint['phash'], key)
+            self._purge_expired(now)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._evict(oldest)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "rejected": self.rejected}
+
+    def collect_metrics(self):
+        """/metrics 수집기"""
+        stats = self.stats()
+        return [
+            ("bowling_result_cache_entries", "gauge", "Near-duplicate result cache entries", None, stats["entries"]),
+            ("bowling_result_cache_lookups_total", "counter", "Near-duplicate result cache lookups",
+             {"result": "hit"}, stats["hits"]),
+            ("bowling_result_cache_lookups_total", "counter", "Near-duplicate result cache lookups",
+             {"result": "miss"}, stats["misses"]),
+            ("bowling_result_cache_rejected_total", "counter",
+             "Hash-radius candidates rejected by validation", None, stats["rejected"]),
+        ]
+
+
+result_cache = RecognitionCache() if os.getenv("BOWLING_RESULT_CACHE", "1") == "1" else None
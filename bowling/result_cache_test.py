@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+결과 캐시 검증 테스트: 같은 점수판을 다시 찍은 사진은 캐시 결과를 재사용하고,
+총점 하나가 몇 점(한 자리)만 바뀐 점수판과 점수는 같고 이름만 다른 점수판은 거부하는지 확인
+
+합성 점수판(scoreboard_generator)을 쓰므로 한글 글꼴이 필요합니다 (BOWLING_FONT_PATH).
+"""
+import copy
+import io
+import random
+
+import cv2
+import numpy as np
+from PIL import Image
+
+import scoreboard_generator as generator
+from image_analyzer import ImageAnalyzer
+from ocr_blocks import BlockTable
+from result_cache import RecognitionCache, region_fingerprint
+
+
+class ResultCacheTester:
+    def __init__(self):
+        self.analyzer = ImageAnalyzer("uploads")
+
+    def make_players(self, seed: int) -> list:
+        rng = random.Random(seed)
+        return [{"name": generator.random_name(rng), **generator.simulate_game(rng, rng.random())}
+                for _ in range(rng.randint(3, 5))]
+
+    def change_total(self, players: list, seed: int) -> list:
+        """한 명의 총점만 1~9점 바꾼 점수판 (누적 점수의 마지막 칸도 함께)"""
+        rng = random.Random(seed)
+        changed = copy.deepcopy(players)
+        player = changed[rng.randrange(len(changed))]
+        delta = rng.randint(1, 9)
+        total = player["total"] + delta if player["total"] + delta <= 300 else player["total"] - delta
+        print(f"  {player['name']}: {player['total']} → {total}")
+        player["total"] = total
+        player["cumulative"][-1] = total
+        return changed
+
+    def change_names(self, players: list, seed: int) -> list:
+        """점수와 구도는 그대로, 이름만 다른 점수판 (같은 배치의 다른 게임)"""
+        rng = random.Random(seed + 1000)
+        changed = copy.deepcopy(players)
+        for player in changed:
+            name = player["name"]
+            while name == player["name"]:
+                name = generator.random_name(rng)
+            player["name"] = name
+        return changed
+
+    def photograph(self, players: list, board_seed: int, shot_seed: int):
+        """같은 점수판(board_seed: 배경/원근)을 shot_seed마다 조금 다른 위치/노이즈로 찍은 사진의 지문"""
+        clean, boxes = generator.render_clean(players, random.Random(board_seed))
+        board, shot = random.Random(board_seed), random.Random(shot_seed)
+        width, height = generator.BASE_WIDTH, generator.BASE_HEIGHT
+        src = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+        dst = src + np.float32([[board.uniform(-0.05, 0.05) * width + shot.uniform(-6, 6),
+                                 board.uniform(-0.05, 0.05) * height + shot.uniform(-6, 6)] for _ in range(4)])
+        dst -= dst.min(axis=0)
+        matrix = cv2.getPerspectiveTransform(src, dst)
+        out_w, out_h = dst.max(axis=0)
+        array = cv2.warpPerspective(cv2.cvtColor(np.asarray(clean), cv2.COLOR_RGB2BGR), matrix,
+                                    (int(out_w), int(out_h)), borderMode=cv2.BORDER_REPLICATE)
+        noise = np.random.default_rng(shot_seed).normal(0, 6, array.shape).astype(np.int16)
+        array = np.clip(array.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+        scale = 1600 / array.shape[1]
+        array = cv2.resize(array, (1600, int(array.shape[0] * scale)), interpolation=cv2.INTER_AREA)
+        ok, encoded = cv2.imencode(".jpg", array, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        image = Image.open(io.BytesIO(encoded.tobytes())).convert("RGB")
+
+        processed = self.analyzer.preprocess_image(image)
+        ratio = processed.width / image.width
+        header = BlockTable.from_dicts([
+            {"text": h["text"], "bbox": [v * ratio for v in generator._transform_box(matrix, h["bbox"], scale)],
+             "confidence": 0.9}
+            for h in boxes["header"]
+        ])
+        region = self.analyzer._identify_scoreboard_region(header, processed.size)
+        return region_fingerprint(processed, region)
+
+    def test_board(self, seed: int) -> bool:
+        print(f"\n=== 점수판 {seed} ===")
+        players = self.make_players(seed)
+        changed = self.change_total(players, seed)
+        cache = RecognitionCache()
+        cache.store(self.photograph(players, seed, 1), f"board_{seed}.jpg", {}, {})
+
+        reshot = cache.lookup(self.photograph(players, seed, 2)) is not None
+        print(f"  같은 점수판 재촬영: {'✅ 적중' if reshot else '❌ 거부'}")
+        same_shot = cache.lookup(self.photograph(changed, seed, 1)) is None
+        print(f"  총점 변경 (같은 구도): {'✅ 거부' if same_shot else '❌ 적중'}")
+        other_shot = cache.lookup(self.photograph(changed, seed, 2)) is None
+        print(f"  총점 변경 (다른 구도): {'✅ 거부' if other_shot else '❌ 적중'}")
+        other_names = cache.lookup(self.photograph(self.change_names(players, seed), seed, 2)) is None
+        print(f"  이름만 다른 점수판: {'✅ 거부' if other_names else '❌ 적중'}")
+        print(f"  캐시 통계: {cache.stats()}")
+        return reshot and same_shot and other_shot and other_names
+
+
+def main():
+    tester = ResultCacheTester()
+    results = [tester.test_board(seed) for seed in range(5)]
+    print(f"\n통과: {sum(results)}/{len(results)}")
+
+
+if __name__ == "__main__":
+    main()
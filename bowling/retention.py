@@ -0,0 +1,251 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+class RetentionPolicy:
+    """보관 정책: 디렉토리별 보관 일수 (환경 변수로 조정)"""
+
+    def __init__(self, uploads_days: float = None, analyzed_days: float = None):
+        self.uploads_days = uploads_days if uploads_days is not None else float(
+            os.getenv("BOWLING_RETENTION_UPLOADS_DAYS", "90"))
+        self.analyzed_days = analyzed_days if analyzed_days is not None else float(
+            os.getenv("BOWLING_RETENTION_ANALYZED_DAYS", "14"))
+
+    def max_age_seconds(self, source: str) -> float:
+        days = self.uploads_days if source == "uploads" else self.analyzed_days
+        return days * DAY_SECONDS
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"uploads_days": self.uploads_days, "analyzed_days": self.analyzed_days}
+
+
+class ArchiveStore:
+    """추가 전용(append-only) 아카이브 샤드 + 오프셋 인덱스
+
+    파일 내용은 shard_XXXXX.bin 뒤에 이어 붙이고, (source, filename) -> (샤드, 오프셋, 길이)를
+    SQLite 인덱스에 기록합니다. 읽을 때는 seek 한 번으로 해당 바이트만 읽습니다.
+    """
+
+    def __init__(self, archive_dir: str = "archive", max_shard_bytes: int = 256 * 1024 * 1024):
+        self.archive_dir = archive_dir
+        self.max_shard_bytes = max_shard_bytes
+        os.makedirs(archive_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(archive_dir, "index.db"), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS archived_files (
+                    source TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    shard INTEGER NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    modified REAL NOT NULL,
+                    archived_at REAL NOT NULL,
+                    PRIMARY KEY (source, filename)
+                )
+            """)
+        self._current_shard = self._find_current_shard()
+
+    def _shard_path(self, shard: int) -> str:
+        return os.path.join(self.archive_dir, f"shard_{shard:05d}.bin")
+
+    def _find_current_shard(self) -> int:
+        row = self._conn.execute("SELECT MAX(shard) FROM archived_files").fetchone()
+        return row[0] if row and row[0] is not None else 1
+
+    def contains(self, source: str, filename: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM archived_files WHERE source = ? AND filename = ?", (source, filename)
+            ).fetchone()
+        return row is not None
+
+    def append(self, source: str, filename: str, data: bytes, modified: float):
+        """파일 내용을 현재 샤드 끝에 추가하고 인덱스 기록 (디스크 동기화 후 커밋)"""
+        with self._lock:
+            shard_path = self._shard_path(self._current_shard)
+            if os.path.exists(shard_path) and os.path.getsize(shard_path) + len(data) > self.max_shard_bytes:
+                self._current_shard += 1
+                shard_path = self._shard_path(self._current_shard)
+
+            with open(shard_path, "ab") as f:
+                offset = f.tell()
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO archived_files (source, filename, shard, offset, length, modified, archived_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (source, filename, self._current_shard, offset, len(data), modified, time.time())
+                )
+
+    def read(self, source: str, filename: str) -> Optional[bytes]:
+        """아카이브된 파일 내용 읽기 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT shard, offset, length FROM archived_files WHERE source = ? AND filename = ?",
+                (source, filename)
+            ).fetchone()
+        if row is None:
+            return None
+        with open(self._shard_path(row["shard"]), "rb") as f:
+            f.seek(row["offset"])
+            return f.read(row["length"])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS files, COALESCE(SUM(length), 0) AS bytes, COUNT(DISTINCT shard) AS shards "
+                "FROM archived_files"
+            ).fetchone()
+        return dict(row)
+
+
+class IOActivityGate:
+    """실시간 인식 요청 수를 세어 백그라운드 작업이 양보할 수 있게 함"""
+
+    def __init__(self):
+        self._active = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._idle.set()
+
+    @contextmanager
+    def busy(self):
+        with self._lock:
+            self._active += 1
+            self._idle.clear()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+                if self._active == 0:
+                    self._idle.set()
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        return self._idle.wait(timeout)
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+
+class RetentionCompactor:
+    """보관 기간이 지난 파일을 아카이브 샤드로 옮기는 백그라운드 작업
+
+    - 초당 바이트 수 제한
+    - 실시간 인식 요청이 처리 중이면 끝날 때까지 대기
+    """
+
+    def __init__(self, source_dirs: Dict[str, str], archive: ArchiveStore, policy: RetentionPolicy = None,
+                 activity: IOActivityGate = None, bytes_per_second: int = 2 * 1024 * 1024,
+                 interval_seconds: float = 3600, on_removed: Callable[[str, str], None] = None):
+        self.source_dirs = source_dirs
+        self.archive = archive
+        self.policy = policy or RetentionPolicy()
+        self.activity = activity or IOActivityGate()
+        self.bytes_per_second = bytes_per_second
+        self.interval_seconds = interval_seconds
+        self.on_removed = on_removed
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_run: Dict[str, Any] = {}
+
+    def find_expired(self, source: str, now: float = None) -> List[os.DirEntry]:
+        """보관 기간이 지난 파일 목록 (오래된 순)"""
+        now = now or time.time()
+        cutoff = now - self.policy.max_age_seconds(source)
+        expired = []
+        with os.scandir(self.source_dirs[source]) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith(".") and entry.stat().st_mtime < cutoff:
+                    expired.append(entry)
+        expired.sort(key=lambda entry: entry.stat().st_mtime)
+        return expired
+
+    def _throttle(self, nbytes: int, started: float, sent: int) -> None:
+        """누적 처리량 기준 속도 제한"""
+        if self.bytes_per_second <= 0:
+            return
+        expected = (sent + nbytes) / self.bytes_per_second
+        elapsed = time.monotonic() - started
+        if expected > elapsed:
+            self._stop.wait(expected - elapsed)
+
+    def _wait_idle(self) -> bool:
+        """실시간 인식 I/O가 없을 때까지 대기 (중지 요청되면 False)"""
+        while not self._stop.is_set():
+            if self.activity.wait_idle(timeout=1.0):
+                return True
+        return False
+
+    def compact_once(self) -> Dict[str, Any]:
+        """한 번의 압축 실행: 만료 파일을 샤드에 추가 후 원본 삭제"""
+        result = {"archived": 0, "bytes": 0, "errors": 0, "started_at": time.time()}
+        started = time.monotonic()
+        for source in self.source_dirs:
+            if self._stop.is_set():
+                break
+            for entry in self.find_expired(source):
+                # 실시간 인식 I/O와 겹치지 않도록 대기, 중지 요청이면 현재 항목부터 처리하지 않음
+                if not self._wait_idle():
+                    break
+                try:
+                    stat = entry.stat()
+                    self._throttle(stat.st_size, started, result["bytes"])
+                    if self._stop.is_set():
+                        break
+                    if not self.archive.contains(source, entry.name):
+                        with open(entry.path, "rb") as f:
+                            data = f.read()
+                        self.archive.append(source, entry.name, data, stat.st_mtime)
+                    os.remove(entry.path)
+                    if self.on_removed:
+                        self.on_removed(source, entry.name)
+                    result["archived"] += 1
+                    result["bytes"] += stat.st_size
+                except Exception as e:
+                    result["errors"] += 1
+                    logger.error(f"아카이브 처리 오류 ({entry.path}): {e}")
+        result["stopped"] = self._stop.is_set()
+        result["duration"] = time.monotonic() - started
+        self.last_run = result
+        if result["archived"]:
+            logger.info(f"보관 정책 적용: {result['archived']}개 파일, {result['bytes']} bytes 아카이브")
+        return result
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.compact_once()
+            except Exception as e:
+                logger.error(f"보관 정책 작업 오류: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="retention-compactor", daemon=True)
+        self._thread.start()
+        logger.info(f"보관 정책 작업 시작: {self.policy.to_dict()}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
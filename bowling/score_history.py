@@ -0,0 +1,266 @@
+import logging
+import sqlite3
+import threading
+import os
+import io
+import csv
+import json
+import time
+import itertools
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+from club_members import DEFAULT_CLUB
+
+logger = logging.getLogger(__name__)
+
+# CSV 내보내기 컬럼 순서
+EXPORT_COLUMNS = ["id", "member", "game_date", "lane", "total", "scores",
+                  "original_name", "match_confidence", "source_file", "created_at"]
+
+
+def validate_game_date(game_date: str) -> str:
+    """YYYY-MM-DD 형식 확인 (집계의 MAX(last_game_date)가 문자열 비교이므로 형식이 다르면 거부)"""
+    try:
+        if datetime.strptime(game_date, "%Y-%m-%d").strftime("%Y-%m-%d") == game_date:
+            return game_date
+    except (TypeError, ValueError):
+        pass
+    raise ValueError(f"게임 날짜는 YYYY-MM-DD 형식이어야 합니다: {game_date!r}")
+
+
+class ScoreHistoryStore:
+    """인식된 게임 기록 저장소 (SQLite)
+
+    games 테이블에 원본 게임을 쌓고, member_stats 테이블에 회원별 집계
+    (게임 수, 총점 합계, 평균, 최고점)를 삽입 시점에 같은 트랜잭션으로 갱신합니다.
+    리더보드/회원 통계 조회는 원본 게임을 스캔하지 않고 집계 테이블 인덱스만 사용합니다.
+    게임과 집계는 클럽별로 나뉘므로 다른 클럽의 같은 이름 회원은 서로 다른 회원입니다.
+
+    인식 결과는 업로드 원본(source_file)의 몇 번째 행(source_row)인지로 한 번만 저장하므로 같은 업로드의 저장이
+    다시 불려도 게임과 집계가 중복되지 않습니다. 같은 회원이 같은 날 같은 레인에서 같은 점수를 두 번 친 게임은
+    서로 다른 게임으로 저장됩니다.
+    """
+
+    def __init__(self, db_path: str = "history/score_history.db"):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_schema()
+        logger.info("ScoreHistoryStore 초기화 완료: %s", db_path)
+
+    def _init_schema(self):
+        """테이블/인덱스 생성"""
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS games (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    club TEXT NOT NULL DEFAULT '{DEFAULT_CLUB}',
+                    member TEXT NOT NULL,
+                    game_date TEXT NOT NULL,
+                    lane INTEGER,
+                    total INTEGER NOT NULL,
+                    scores TEXT NOT NULL DEFAULT '[]',
+                    original_name TEXT NOT NULL DEFAULT '',
+                    match_confidence REAL NOT NULL DEFAULT 0.0,
+                    source_file TEXT NOT NULL DEFAULT '',
+                    source_row INTEGER,
+                    created_at REAL NOT NULL
+                )
+            """)
+            # 클럽 컬럼 추가 전 DB: 기존 게임은 기본 클럽, 클럽 없는 키의 인덱스/집계는 새로 만듦
+            migrated = "club" not in self._columns("games")
+            if migrated:
+                logger.info("게임 기록에 클럽 컬럼 추가 (기존 기록은 기본 클럽)")
+                self._conn.execute(f"ALTER TABLE games ADD COLUMN club TEXT NOT NULL DEFAULT '{DEFAULT_CLUB}'")
+                self._conn.execute("DROP INDEX IF EXISTS idx_games_member_date_lane")
+            if "source_row" not in self._columns("games"):
+                self._conn.execute("ALTER TABLE games ADD COLUMN source_row INTEGER")
+            # (회원, 날짜, 레인, 총점) 중복 방지 키는 실제로 같은 점수를 두 번 친 게임까지 막으므로 제거 (기록은 그대로 둠)
+            self._conn.execute("DROP INDEX IF EXISTS idx_games_unique")
+            self._conn.execute("DROP INDEX IF EXISTS idx_games_club_unique")
+            if self._columns("member_stats") and "club" not in self._columns("member_stats"):
+                self._conn.execute("DROP TABLE member_stats")
+                migrated = True
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_games_club_member_date_lane "
+                "ON games (club, member, game_date, lane)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_games_date_lane ON games (game_date, lane)"
+            )
+            # 업로드 원본의 같은 행은 한 번만 (원본 행이 없는 직접 입력 게임과 이전 기록은 제외)
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_games_source "
+                "ON games (source_file, source_row) WHERE source_row IS NOT NULL"
+            )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS member_stats (
+                    club TEXT NOT NULL,
+                    member TEXT NOT NULL,
+                    games_played INTEGER NOT NULL,
+                    total_pins INTEGER NOT NULL,
+                    average REAL NOT NULL,
+                    high_game INTEGER NOT NULL,
+                    last_game_date TEXT NOT NULL,
+                    PRIMARY KEY (club, member)
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_member_stats_club_average ON member_stats (club, average DESC)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_member_stats_club_high ON member_stats (club, high_game DESC)"
+            )
+            if migrated:
+                logger.info("회원 집계 재계산 (클럽별 집계)")
+                self._conn.execute("DELETE FROM member_stats")
+                self._conn.execute("""
+                    INSERT INTO member_stats (club, member, games_played, total_pins, average, high_game,
+                                              last_game_date)
+                    SELECT club, member, COUNT(*), SUM(total), CAST(SUM(total) AS REAL) / COUNT(*), MAX(total),
+                           MAX(game_date)
+                    FROM games GROUP BY club, member
+                """)
+
+    def _columns(self, table: str) -> List[str]:
+        """테이블 컬럼 이름 (테이블이 없으면 빈 목록)"""
+        return [row["name"] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+
+    def add_game(self, member: str, total: int, game_date: str = None, lane: Optional[int] = None,
+                 scores: List[int] = None, original_name: str = "", match_confidence: float = 0.0,
+                 source_file: str = "", club: str = DEFAULT_CLUB, source_row: Optional[int] = None) -> Optional[int]:
+        """게임 1건 저장 + 회원 집계 갱신 (같은 트랜잭션), 이미 저장된 원본 행이면 None"""
+        if game_date is None:
+            game_date = time.strftime("%Y-%m-%d")
+        validate_game_date(game_date)
+        scores_json = json.dumps(scores or [])
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO games (club, member, game_date, lane, total, scores, original_name, "
+                "match_confidence, source_file, source_row, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (club, member, game_date, lane, total, scores_json, original_name,
+                 match_confidence, source_file, source_row, time.time())
+            )
+            # 중복으로 무시된 게임은 집계에 반영하지 않음
+            if self._conn.execute("SELECT changes()").fetchone()[0] != 1:
+                return None
+            # 증분 집계: 기존 행이 있으면 갱신, 없으면 새로 생성
+            self._conn.execute("""
+                INSERT INTO member_stats (club, member, games_played, total_pins, average, high_game, last_game_date)
+                VALUES (?, ?, 1, ?, ?, ?, ?)
+                ON CONFLICT(club, member) DO UPDATE SET
+                    games_played = games_played + 1,
+                    total_pins = total_pins + excluded.total_pins,
+                    average = CAST(total_pins + excluded.total_pins AS REAL) / (games_played + 1),
+                    high_game = MAX(high_game, excluded.high_game),
+                    last_game_date = MAX(last_game_date, excluded.last_game_date)
+            """, (club, member, total, float(total), total, game_date))
+            return cursor.lastrowid
+
+    def add_recognized_games(self, score_data: List[Any], member_list: List[str], game_date: str = None,
+                             lane: Optional[int] = None, source_file: str = "", club: str = DEFAULT_CLUB) -> int:
+        """인식 결과(ScoreData 목록) 중 회원으로 매칭되고 점수가 유효한 게임만 저장 (새로 저장한 수)
+
+        source_file이 있으면 인식 결과 안의 위치를 원본 행으로 함께 저장합니다.
+        """
+        saved = 0
+        for row, item in enumerate(score_data):
+            if item.matched_name not in member_list:
+                continue
+            if not 0 < item.total <= 300:
+                continue
+            game_id = self.add_game(
+                member=item.matched_name,
+                total=item.total,
+                game_date=game_date,
+                lane=lane,
+                scores=item.scores,
+                original_name=item.original_name,
+                match_confidence=item.match_confidence,
+                source_file=source_file,
+                club=club,
+                source_row=row if source_file else None
+            )
+            if game_id is not None:
+                saved += 1
+        logger.info("게임 기록 저장: %s건", saved)
+        return saved
+
+    def get_member_stats(self, member: str, club: str = DEFAULT_CLUB) -> Optional[Dict[str, Any]]:
+        """회원 집계 조회 (기본키 조회)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM member_stats WHERE club = ? AND member = ?", (club, member)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_leaderboard(self, order_by: str = "average", limit: int = 10, min_games: int = 1,
+                        club: str = DEFAULT_CLUB) -> List[Dict[str, Any]]:
+        """클럽 리더보드 조회 (집계 테이블 인덱스 순회)"""
+        column = "high_game" if order_by == "high_game" else "average"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM member_stats WHERE club = ? AND games_played >= ? ORDER BY {column} DESC LIMIT ?",
+                (club, min_games, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_member_history(self, member: str, limit: int = 20, before_date: str = None,
+                           club: str = DEFAULT_CLUB) -> List[Dict[str, Any]]:
+        """회원별 최근 게임 기록 (club, member, game_date 인덱스 사용)"""
+        query = "SELECT * FROM games WHERE club = ? AND member = ?"
+        params: list = [club, member]
+        if before_date:
+            query += " AND game_date < ?"
+            params.append(before_date)
+        query += " ORDER BY game_date DESC, id DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._game_row_to_dict(row) for row in rows]
+
+    def iter_source_totals(self) -> Iterator[Tuple[str, List[int]]]:
+        """원본 파일별 총점 목록 (저장 순서 = 인식한 총점 순서)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source_file, total FROM games WHERE source_file != '' ORDER BY source_file, id"
+            ).fetchall()
+        for source_file, group in itertools.groupby(rows, key=lambda row: row["source_file"]):
+            yield source_file, [row["total"] for row in group]
+
+    def iter_export_csv(self, batch_size: int = 500, club: str = DEFAULT_CLUB) -> Iterator[str]:
+        """클럽의 전체 게임 기록을 CSV 텍스트 조각으로 스트리밍 (id 기준 키셋 페이지네이션)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT * FROM games WHERE club = ? AND id > ? ORDER BY id LIMIT ?", (club, last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                break
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow([row[column] for column in EXPORT_COLUMNS])
+            last_id = rows[-1]["id"]
+            yield buffer.getvalue()
+
+    def _game_row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        game = dict(row)
+        game["scores"] = json.loads(game["scores"])
+        return game
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
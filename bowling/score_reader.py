@@ -0,0 +1,128 @@
+import logging
+import os
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+from PIL import Image
+
+from startup import lazy_import
+from digit_classifier import DigitClassifier, DIGIT_MODEL_DIR, binarize, find_glyphs, group_glyphs, pixel_features
+
+logger = logging.getLogger(__name__)
+
+np = lazy_import("numpy")
+
+MAX_SCORE = 300
+
+
+class LocalScoreReader:
+    """총점 칸 로컬 숫자 인식기
+
+    총점 칸 이미지에서 숫자 크기의 연결 요소(칸 경계에 걸린 것 제외)를 토큰으로 묶어 위에서 아래로 읽습니다.
+    한 자리만 틀려도 점수가 틀리므로 신뢰도 = 전체 글자 중 가장 낮은 글자 신뢰도.
+
+    글자 샘플은 원격 OCR 결과가 이름 수와 맞은(검증된) 총점 칸에서 학습해 models/score_digits.npz에 저장하고,
+    숫자(0-9)마다 min_samples개가 모이기 전까지는 신뢰도 0 (항상 원격 OCR)입니다.
+    """
+
+    def __init__(self, classifier: Optional[DigitClassifier] = None,
+                 min_confidence: float = float(os.getenv("BOWLING_LOCAL_SCORE_MIN_CONFIDENCE", "0.6")),
+                 min_samples: int = int(os.getenv("BOWLING_LOCAL_SCORE_MIN_SAMPLES", "5"))):
+        self.classifier = classifier or DigitClassifier(os.path.join(DIGIT_MODEL_DIR, "score_digits.npz"))
+        self.min_confidence = min_confidence
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self.local_reads = 0
+        self.remote_reads = 0
+        self.learned = 0
+
+    @staticmethod
+    def _segment(image: Image.Image) -> List[Tuple[Dict[str, Any], List[List[int]]]]:
+        """극성별 (글자, 위에서 아래 순서의 토큰)"""
+        binary = binarize(np.asarray(image.convert("L")))
+        width = binary.shape[1]
+        segments = []
+        # 밝은 글자/어두운 글자 모두 시도
+        for mask in (binary, 255 - binary):
+            glyphs = find_glyphs(mask, max(6, width * 0.12), width * 0.9)
+            # 칸 안에 붙어 버린 글자 덩어리가 있으면 자릿수를 믿을 수 없으므로 이 극성은 포기
+            wide = glyphs["wide"]
+            if ((wide[:, 0] > 0) & (wide[:, 0] + wide[:, 2] < width)).any():
+                segments.append((glyphs, []))
+                continue
+            # 칸 경계에 걸려 잘린 옆 칸 글자는 제외
+            inner = (glyphs["x"] > 0) & (glyphs["x"] + glyphs["w"] < width)
+            tokens = [token for token in group_glyphs(glyphs, inner.tolist()) if len(token) <= 3]
+            tokens.sort(key=lambda token: int(glyphs["y"][token[0]]))
+            segments.append((glyphs, tokens))
+        return segments
+
+    def read(self, image: Image.Image) -> Tuple[List[int], float]:
+        """(위에서 아래 순서의 점수, 신뢰도), 읽을 수 없으면 ([], 0.0)"""
+        if not self.classifier.ready(self.min_samples):
+            return [], 0.0
+        best, best_confidence = [], 0.0
+        for glyphs, tokens in self._segment(image):
+            if not tokens:
+                continue
+            digits, confidences = self.classifier.classify(pixel_features(glyphs["crops"]))
+            digits, confidences = digits.tolist(), confidences.tolist()
+            if any(digits[i] < 0 for token in tokens for i in token):
+                continue
+            scores = [int("".join(str(digits[i]) for i in token)) for token in tokens]
+            if any(score > MAX_SCORE for score in scores):
+                continue
+            confidence = min(confidences[i] for token in tokens for i in token)
+            if confidence > best_confidence:
+                best, best_confidence = scores, confidence
+        return best, best_confidence
+
+    def learn(self, image: Image.Image, numbers: List[int]) -> int:
+        """검증된 점수(위에서 아래 순서)로 글자 샘플 추가 (토큰 수와 자릿수가 모두 맞는 극성만, 추가한 글자 수)"""
+        try:
+            for glyphs, tokens in self._segment(image):
+                if len(tokens) != len(numbers):
+                    continue
+                texts = [str(number) for number in numbers]
+                if any(len(token) != len(text) for token, text in zip(tokens, texts)):
+                    continue
+                crops = [glyphs["crops"][i] for token in tokens for i in token]
+                labels = [int(char) for text in texts for char in text]
+                added = self.classifier.add(pixel_features(crops), labels)
+                with self._lock:
+                    self.learned += added
+                return added
+            return 0
+        except Exception as e:
+            logger.warning("총점 숫자 학습 실패: %s", e)
+            return 0
+
+    def record(self, local: bool):
+        with self._lock:
+            if local:
+                self.local_reads += 1
+            else:
+                self.remote_reads += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {"local_reads": self.local_reads, "remote_reads": self.remote_reads, "learned": self.learned}
+        stats["samples"] = sum(self.classifier.counts())
+        return stats
+
+    def collect_metrics(self):
+        """/metrics 수집기"""
+        stats = self.stats()
+        return [
+            ("bowling_score_reads_total", "counter", "Total-score column reads by reader", {"reader": "local"},
+             stats["local_reads"]),
+            ("bowling_score_reads_total", "counter", "Total-score column reads by reader", {"reader": "remote"},
+             stats["remote_reads"]),
+            ("bowling_score_digit_samples", "gauge", "Stored total-score digit samples for the local reader",
+             None, stats["samples"]),
+            ("bowling_score_digits_learned_total", "counter", "Digit samples learned from validated remote reads",
+             None, stats["learned"]),
+        ]
+
+
+score_reader = LocalScoreReader() if os.getenv("BOWLING_LOCAL_SCORE", "1") == "1" else None
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+총점 칸 로컬 숫자 인식기 학습/평가
+
+게임 기록(history/score_history.db)의 원본 파일별 총점과 analyzed/ 폴더에 저장된 총점 칸 이미지
+({파일명}_score_part2.jpg, {파일명}_score_part.jpg)로 숫자 샘플을 학습합니다.
+토큰 수와 자릿수가 기록과 모두 맞는 이미지만 학습하고 (기록 일부가 빠진 파일은 자동 제외),
+--holdout 비율만큼은 학습하지 않고 로컬 인식 정확도/사용률/시간을 측정합니다.
+
+사용법:
+  python score_reader_training.py
+  python score_reader_training.py --holdout 0.2 --min-confidence 0.6
+  python score_reader_training.py --model /tmp/score_digits.npz --analyzed-dir analyzed
+"""
+
+import os
+import time
+import random
+import argparse
+
+from PIL import Image
+
+from digit_classifier import DigitClassifier, DIGIT_MODEL_DIR
+from score_history import ScoreHistoryStore
+from score_reader import LocalScoreReader
+
+
+def score_images(analyzed_dir: str, source_file: str):
+    for suffix in ("_score_part2.jpg", "_score_part.jpg"):
+        path = os.path.join(analyzed_dir, f"{source_file}{suffix}")
+        if os.path.exists(path):
+            yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="총점 칸 로컬 숫자 인식기 학습/평가")
+    parser.add_argument("--history-db", default="history/score_history.db")
+    parser.add_argument("--analyzed-dir", default="analyzed")
+    parser.add_argument("--model", default=os.path.join(DIGIT_MODEL_DIR, "score_digits.npz"))
+    parser.add_argument("--holdout", type=float, default=0.2, help="평가용으로 남길 파일 비율")
+    parser.add_argument("--min-confidence", type=float, default=None, help="로컬 인식 사용 기준 (기본: 환경 변수)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    store = ScoreHistoryStore(args.history_db)
+    sources = [(source, totals) for source, totals in store.iter_source_totals()
+               if any(True for _ in score_images(args.analyzed_dir, source))]
+    store.close()
+    random.Random(args.seed).shuffle(sources)
+    holdout = int(len(sources) * args.holdout)
+    evaluation, training = sources[:holdout], sources[holdout:]
+
+    reader = LocalScoreReader(DigitClassifier(args.model))
+    if args.min_confidence is not None:
+        reader.min_confidence = args.min_confidence
+
+    learned_files = learned_glyphs = 0
+    for source, totals in training:
+        for path in score_images(args.analyzed_dir, source):
+            added = reader.learn(Image.open(path), totals)
+            if added:
+                learned_files += 1
+                learned_glyphs += added
+    print(f"학습: 파일 {len(training)}개 중 {learned_files}개 이미지, 글자 {learned_glyphs}개")
+    print(f"숫자별 샘플 수: {reader.classifier.counts()} -> {args.model}")
+
+    if not evaluation:
+        return
+    used = correct = 0
+    elapsed = 0.0
+    for source, totals in evaluation:
+        path = next(score_images(args.analyzed_dir, source))
+        image = Image.open(path)
+        started = time.perf_counter()
+        numbers, confidence = reader.read(image)
+        elapsed += time.perf_counter() - started
+        if len(numbers) == len(totals) and confidence >= reader.min_confidence:
+            used += 1
+            correct += numbers == totals
+    print(f"평가: 파일 {len(evaluation)}개, 로컬 사용 {used}개 ({used / len(evaluation):.0%}), "
+          f"사용한 것 중 정확 {correct}개 ({correct / used if used else 0:.0%}), "
+          f"읽기당 {elapsed / len(evaluation) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
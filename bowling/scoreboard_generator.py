@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+합성 볼링 점수판 이미지 생성기
+볼링장 모니터 점수판(한글 이름, 1-10 프레임 헤더, 프레임별 누적 점수, 총점)을 그리고
+원근 기울기, 블러, 반사광, JPEG 압축, 해상도 변화를 적용합니다. 이미지마다 정답(JSON)을 함께 저장합니다.
+
+사용법:
+  python scoreboard_generator.py --count 2000 --out synthetic --workers 8
+  python scoreboard_generator.py --count 10 --tilt 0.08 --blur 1.5 --glare 0.6 --jpeg-quality 60
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from multiprocessing import Pool
+from typing import Dict, Any, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+HANGUL_SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+HANGUL_SYLLABLES = "환규영범희조정원경현동서연호민지태준수빈우진소재성철미혜"
+
+# 한글 글꼴 후보 (BOWLING_FONT_PATH 우선)
+FONT_CANDIDATES = [
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/Library/Fonts/NanumGothicBold.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc",
+]
+
+# 모니터 점수판 기본 배치 (기준 해상도 1600x900)
+BASE_WIDTH, BASE_HEIGHT = 1600, 900
+NAME_COL_X, NAME_COL_W = 40, 220
+FRAME_COL_X, FRAME_COL_W = 280, 110
+TOTAL_COL_W = 130
+HEADER_Y, HEADER_H = 80, 50
+ROW_Y, ROW_H = 150, 110
+
+_font_cache: Dict[int, Any] = {}
+
+
+def find_font_path() -> Optional[str]:
+    """BOWLING_FONT_PATH (지정했는데 없으면 None, 후보로 대신하지 않음) 또는 첫 번째로 있는 후보 글꼴"""
+    path = os.getenv("BOWLING_FONT_PATH")
+    if path:
+        return path if os.path.exists(path) else None
+    for candidate in FONT_CANDIDATES:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def require_font_path() -> str:
+    """한글 글꼴 경로, 없으면 RuntimeError
+
+    기본 비트맵 글꼴(8px, 한글 없음)로 그리면 이름은 깨지고 헤더 숫자는 로컬 헤더 감지기의 최소 글자 높이보다 작아
+    데이터셋 전체를 쓸 수 없으므로 대신 그리지 않음
+    """
+    path = find_font_path()
+    if path is None:
+        configured = os.getenv("BOWLING_FONT_PATH")
+        if configured:
+            raise RuntimeError(f"BOWLING_FONT_PATH 글꼴 파일이 없습니다: {configured}")
+        raise RuntimeError("한글 글꼴을 찾지 못했습니다. BOWLING_FONT_PATH를 설정하세요.")
+    return path
+
+
+def get_font(size: int):
+    if size not in _font_cache:
+        _font_cache[size] = ImageFont.truetype(require_font_path(), size)
+    return _font_cache[size]
+
+
+# ---------------------------------------------------------------------------
+# 점수 생성
+# ---------------------------------------------------------------------------
+
+def simulate_game(rng: random.Random, skill: float) -> Dict[str, List]:
+    """실제 규칙대로 투구를 만들고 프레임별 누적 점수 계산 (skill: 0~1)"""
+    rolls: List[int] = []
+    frames: List[List[int]] = []
+    for frame in range(10):
+        first = min(10, int(rng.betavariate(2 + 6 * skill, 2) * 11))
+        if frame < 9:
+            if first == 10:
+                frames.append([10])
+                rolls.append(10)
+                continue
+            second = min(10 - first, int(rng.betavariate(1 + 4 * skill, 2) * (11 - first)))
+            frames.append([first, second])
+            rolls.extend([first, second])
+        else:
+            tenth = [first]
+            pins = 10 if first == 10 else 10 - first
+            second = min(pins, int(rng.betavariate(1 + 4 * skill, 2) * (pins + 1)))
+            tenth.append(second)
+            if first == 10 or first + second == 10:
+                pins = 10 if (first == 10 and second == 10) or (first != 10) else 10 - second
+                tenth.append(min(pins, int(rng.betavariate(1 + 4 * skill, 2) * (pins + 1))))
+            frames.append(tenth)
+            rolls.extend(tenth)
+
+    cumulative = []
+    total = 0
+    index = 0
+    for frame in range(10):
+        if frame == 9:
+            total += sum(rolls[index:])
+        elif rolls[index] == 10:
+            total += 10 + rolls[index + 1] + rolls[index + 2]
+            index += 1
+        elif rolls[index] + rolls[index + 1] == 10:
+            total += 10 + rolls[index + 2]
+            index += 2
+        else:
+            total += rolls[index] + rolls[index + 1]
+            index += 2
+        cumulative.append(total)
+    return {"frames": frames, "cumulative": cumulative, "total": total}
+
+
+def random_name(rng: random.Random) -> str:
+    return rng.choice(HANGUL_SURNAMES) + rng.choice(HANGUL_SYLLABLES) + rng.choice(HANGUL_SYLLABLES)
+
+
+# ---------------------------------------------------------------------------
+# 렌더링
+# ---------------------------------------------------------------------------
+
+def _text_box(draw: ImageDraw.ImageDraw, xy: Tuple[float, float], text: str, font, fill) -> List[float]:
+    draw.text(xy, text, font=font, fill=fill, anchor="mm")
+    return list(draw.textbbox(xy, text, font=font, anchor="mm"))
+
+
+def render_clean(players: List[Dict[str, Any]], rng: random.Random) -> Tuple[Image.Image, Dict[str, Any]]:
+    """왜곡 없는 점수판 렌더링 + 각 텍스트 박스 좌표"""
+    background = tuple(int(c) for c in (rng.randint(5, 30), rng.randint(25, 60), rng.randint(90, 160)))
+    image = Image.new("RGB", (BASE_WIDTH, BASE_HEIGHT), background)
+    draw = ImageDraw.Draw(image)
+    header_font = get_font(32)
+    name_font = get_font(48)
+    score_font = get_font(40)
+    total_x = FRAME_COL_X + FRAME_COL_W * 10
+
+    header_boxes = []
+    draw.rectangle([FRAME_COL_X, HEADER_Y, total_x + TOTAL_COL_W, HEADER_Y + HEADER_H], fill=(20, 20, 60))
+    for frame in range(10):
+        cx = FRAME_COL_X + FRAME_COL_W * frame + FRAME_COL_W / 2
+        box = _text_box(draw, (cx, HEADER_Y + HEADER_H / 2), str(frame + 1), header_font, (255, 255, 255))
+        header_boxes.append({"text": str(frame + 1), "bbox": box})
+
+    rows = []
+    for row, player in enumerate(players):
+        y = ROW_Y + ROW_H * row
+        draw.rectangle([NAME_COL_X, y, total_x + TOTAL_COL_W, y + ROW_H - 8], outline=(200, 200, 255), width=2)
+        name_box = _text_box(draw, (NAME_COL_X + NAME_COL_W / 2, y + ROW_H / 2), player["name"], name_font, (255, 255, 255))
+        frame_boxes = []
+        for frame in range(10):
+            x = FRAME_COL_X + FRAME_COL_W * frame
+            draw.line([x, y, x, y + ROW_H - 8], fill=(200, 200, 255), width=2)
+            box = _text_box(draw, (x + FRAME_COL_W / 2, y + ROW_H * 0.65), str(player["cumulative"][frame]),
+                            score_font, (255, 255, 255))
+            frame_boxes.append(box)
+        draw.line([total_x, y, total_x, y + ROW_H - 8], fill=(200, 200, 255), width=2)
+        total_box = _text_box(draw, (total_x + TOTAL_COL_W / 2, y + ROW_H / 2), str(player["total"]),
+                              name_font, (255, 255, 120))
+        rows.append({"name_bbox": name_box, "frame_bboxes": frame_boxes, "total_bbox": total_box})
+
+    return image, {"header": header_boxes, "rows": rows}
+
+
+def _perspective_matrix(rng: random.Random, tilt: float, width: int, height: int) -> np.ndarray:
+    """모서리를 무작위로 밀어 원근 변환 행렬 생성 (tilt: 크기 대비 최대 이동 비율)"""
+    src = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    jitter = np.float32([[rng.uniform(-tilt, tilt) * width, rng.uniform(-tilt, tilt) * height] for _ in range(4)])
+    dst = src + jitter
+    dst -= dst.min(axis=0)
+    return cv2.getPerspectiveTransform(src, dst), dst.max(axis=0)
+
+
+def _transform_box(matrix: np.ndarray, box: List[float], scale: float) -> List[int]:
+    x1, y1, x2, y2 = box
+    corners = np.float32([[[x1, y1], [x2, y1], [x2, y2], [x1, y2]]])
+    warped = cv2.perspectiveTransform(corners, matrix)[0] * scale
+    return [int(warped[:, 0].min()), int(warped[:, 1].min()), int(warped[:, 0].max()), int(warped[:, 1].max())]
+
+
+def _apply_glare(array: np.ndarray, rng: random.Random, strength: float) -> np.ndarray:
+    """타원형 반사광 (벡터 연산)"""
+    height, width = array.shape[:2]
+    cx, cy = rng.uniform(0.2, 0.8) * width, rng.uniform(0.2, 0.8) * height
+    rx, ry = rng.uniform(0.1, 0.35) * width, rng.uniform(0.1, 0.35) * height
+    yy, xx = np.ogrid[:height, :width]
+    falloff = np.exp(-(((xx - cx) / rx) ** 2 + ((yy - cy) / ry) ** 2))
+    glare = (falloff * 255 * strength)[..., None].astype(np.float32)
+    return np.clip(array.astype(np.float32) + glare, 0, 255).astype(np.uint8)
+
+
+def generate_one(seed: int, options: Dict[str, Any]) -> Tuple[bytes, Dict[str, Any]]:
+    """시드 하나로 이미지(JPEG 바이트)와 정답 생성"""
+    rng = random.Random(seed)
+    player_count = rng.randint(options.get("min_players", 2), options.get("max_players", 6))
+    names = options.get("names")
+    if names:
+        # 이름 목록의 서로 다른 이름이 인원보다 적으면 있는 이름 수만큼만
+        distinct = list(dict.fromkeys(names))
+        chosen = rng.sample(distinct, min(player_count, len(distinct)))
+    else:
+        chosen = []
+        while len(chosen) < player_count:
+            name = random_name(rng)
+            if name not in chosen:
+                chosen.append(name)
+    players = []
+    for name in chosen:
+        game = simulate_game(rng, rng.random())
+        players.append({"name": name, **game})
+
+    clean, boxes = render_clean(players, rng)
+    array = cv2.cvtColor(np.asarray(clean), cv2.COLOR_RGB2BGR)
+
+    tilt = options.get("tilt", 0.06)
+    matrix, (out_w, out_h) = _perspective_matrix(rng, tilt, BASE_WIDTH, BASE_HEIGHT)
+    array = cv2.warpPerspective(array, matrix, (int(out_w), int(out_h)), borderMode=cv2.BORDER_REPLICATE)
+
+    glare = options.get("glare", 0.4)
+    if glare > 0 and rng.random() < 0.8:
+        array = _apply_glare(array, rng, rng.uniform(0.2, 1.0) * glare)
+
+    blur = options.get("blur", 1.0)
+    if blur > 0:
+        sigma = rng.uniform(0, blur)
+        if sigma > 0.3:
+            array = cv2.GaussianBlur(array, (0, 0), sigma)
+
+    noise = options.get("noise", 6)
+    if noise > 0:
+        np_rng = np.random.default_rng(seed)
+        array = np.clip(array.astype(np.int16) + np_rng.normal(0, noise, array.shape).astype(np.int16),
+                        0, 255).astype(np.uint8)
+
+    target_width = options.get("width") or rng.choice((1024, 1600, 2400, 4000))
+    scale = target_width / array.shape[1]
+    array = cv2.resize(array, (target_width, int(array.shape[0] * scale)),
+                       interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR)
+
+    quality = options.get("jpeg_quality") or rng.randint(50, 95)
+    ok, encoded = cv2.imencode(".jpg", array, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise RuntimeError("JPEG 인코딩 실패")
+
+    truth = {
+        "seed": seed,
+        "image_size": [int(array.shape[1]), int(array.shape[0])],
+        "jpeg_quality": quality,
+        "header": [{"text": h["text"], "bbox": _transform_box(matrix, h["bbox"], scale)} for h in boxes["header"]],
+        "players": [
+            {
+                "name": player["name"],
+                "frames": player["frames"],
+                "cumulative": player["cumulative"],
+                "total": player["total"],
+                "name_bbox": _transform_box(matrix, row["name_bbox"], scale),
+                "total_bbox": _transform_box(matrix, row["total_bbox"], scale),
+                "frame_bboxes": [_transform_box(matrix, b, scale) for b in row["frame_bboxes"]],
+            }
+            for player, row in zip(players, boxes["rows"])
+        ],
+    }
+    return encoded.tobytes(), truth
+
+
+def _write_one(args) -> Dict[str, Any]:
+    seed, out_dir, options = args
+    data, truth = generate_one(seed, options)
+    filename = f"synthetic_{seed:08d}.jpg"
+    with open(os.path.join(out_dir, filename), "wb") as f:
+        f.write(data)
+    truth["filename"] = filename
+    return truth
+
+
+def generate_dataset(count: int, out_dir: str, workers: int = None, start_seed: int = 0,
+                     options: Dict[str, Any] = None) -> str:
+    """이미지 count장 + ground_truth.jsonl 생성 (여러 프로세스)"""
+    # 작업 프로세스를 띄우기 전에 글꼴 확인
+    require_font_path()
+    os.makedirs(out_dir, exist_ok=True)
+    options = options or {}
+    truth_path = os.path.join(out_dir, "ground_truth.jsonl")
+    tasks = [(start_seed + i, out_dir, options) for i in range(count)]
+    workers = workers or os.cpu_count() or 1
+    with open(truth_path, "w", encoding="utf-8") as truth_file:
+        if workers == 1:
+            results = map(_write_one, tasks)
+            for truth in results:
+                truth_file.write(json.dumps(truth, ensure_ascii=False) + "\n")
+        else:
+            with Pool(workers) as pool:
+                for truth in pool.imap_unordered(_write_one, tasks, chunksize=16):
+                    truth_file.write(json.dumps(truth, ensure_ascii=False) + "\n")
+    return truth_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 볼링 점수판 이미지 생성기")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--out", default="synthetic")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--start-seed", type=int, default=0)
+    parser.add_argument("--tilt", type=float, default=0.06, help="원근 기울기 (크기 대비 최대 모서리 이동)")
+    parser.add_argument("--blur", type=float, default=1.0, help="최대 가우시안 블러 sigma")
+    parser.add_argument("--glare", type=float, default=0.4, help="최대 반사광 세기 (0~1)")
+    parser.add_argument("--noise", type=float, default=6, help="센서 노이즈 표준편차")
+    parser.add_argument("--jpeg-quality", type=int, default=None, help="고정 JPEG 품질 (기본: 50~95 무작위)")
+    parser.add_argument("--width", type=int, default=None, help="고정 출력 너비 (기본: 1024~4000 무작위)")
+    parser.add_argument("--min-players", type=int, default=2)
+    parser.add_argument("--max-players", type=int, default=6)
+    parser.add_argument("--names-file", default=None, help="이름 목록 파일 (한 줄에 한 명, 기본: 무작위 한글 이름)")
+    args = parser.parse_args()
+
+    try:
+        print(f"글꼴: {require_font_path()}")
+    except RuntimeError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    options = {
+        "tilt": args.tilt, "blur": args.blur, "glare": args.glare, "noise": args.noise,
+        "jpeg_quality": args.jpeg_quality, "width": args.width,
+        "min_players": args.min_players, "max_players": min(args.max_players, 6),
+    }
+    if args.names_file:
+        with open(args.names_file, encoding="utf-8") as f:
+            options["names"] = [line.strip() for line in f if line.strip()]
+
+    started = time.perf_counter()
+    truth_path = generate_dataset(args.count, args.out, args.workers, args.start_seed, options)
+    elapsed = time.perf_counter() - started
+    print(f"✅ {args.count}장 생성: {elapsed:.1f}초 ({args.count / elapsed * 60:.0f}장/분)")
+    print(f"   정답: {truth_path}")
+
+
+if __name__ == "__main__":
+    main()
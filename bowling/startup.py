@@ -0,0 +1,131 @@
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Optional, Dict, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# 프로세스(이 모듈) 시작 시각: 콜드 스타트 측정 기준
+PROCESS_STARTED = time.monotonic()
+
+_env_lock = threading.Lock()
+_env_loaded = False
+
+
+def load_env() -> bool:
+    """.env 로드 (프로세스당 1회: 현재 디렉토리, 없으면 저장소 루트)"""
+    global _env_loaded
+    with _env_lock:
+        if _env_loaded:
+            return False
+        _env_loaded = True
+        from dotenv import load_dotenv
+        repo_env = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+        return load_dotenv() or load_dotenv(repo_env)
+
+
+def lazy_import(name: str):
+    """첫 속성 접근 시점에 실제로 로드되는 모듈 (cv2, numpy, google.cloud.vision 등 무거운 의존성용)"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"모듈을 찾을 수 없습니다: {name}")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def check_credentials():
+    """GOOGLE_APPLICATION_CREDENTIALS 확인 로그 (시작 단계에서 1회)"""
+    credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+    if credentials_path:
+        # ~ 확장
+        credentials_path = os.path.expanduser(credentials_path)
+        logger.info("Google Cloud 인증 파일 경로: %s", credentials_path)
+        if os.path.exists(credentials_path):
+            logger.info("Google Cloud 인증 파일이 존재합니다.")
+        else:
+            logger.warning("Google Cloud 인증 파일이 존재하지 않습니다.")
+    else:
+        logger.warning("GOOGLE_APPLICATION_CREDENTIALS 환경 변수가 설정되지 않았습니다.")
+
+
+class Readiness:
+    """시작 단계 진행 상태 (무거운 import, OCR 클라이언트 생성/예열)와 콜드 스타트 시간 기록
+
+    /health는 프로세스 생존 여부, /ready는 OCR 예열까지 끝났는지를 알려줍니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phase = "starting"
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self.ready_at: Optional[float] = None
+        self.first_recognition_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    def _step(self, name: str, func: Callable[[], Any]):
+        self.phase = name
+        started = time.perf_counter()
+        result = func()
+        self.timings[name] = round(time.perf_counter() - started, 3)
+        return result
+
+    def run(self, steps, retry_delay: float = 1.0, max_retry_delay: float = 30.0):
+        """(이름, 함수) 단계를 순서대로 실행. 실패하면 지수 백오프로 처음부터 재시도"""
+        delay = retry_delay
+        while True:
+            try:
+                for name, func in steps:
+                    self._step(name, func)
+                with self._lock:
+                    self.phase = "ready"
+                    self.error = None
+                    self.ready_at = time.monotonic()
+                logger.info("서비스 준비 완료: 시작 후 %.2f초 (%s)", self.ready_at - PROCESS_STARTED, self.timings)
+                return
+            except Exception as e:
+                self.error = f"{self.phase}: {e}"
+                logger.error("시작 단계 오류 (%s초 후 재시도): %s", delay, self.error)
+                time.sleep(delay)
+                delay = min(delay * 2, max_retry_delay)
+
+    def start(self, steps):
+        """예열을 백그라운드에서 실행 (요청 수신은 바로 시작, /ready는 완료 후 200)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run, args=(steps,), name="warmup", daemon=True)
+        self._thread.start()
+
+    def mark_recognition(self):
+        """첫 인식 성공 시각 기록 (time-to-first-successful-recognition)"""
+        if self.first_recognition_at is not None:
+            return
+        with self._lock:
+            if self.first_recognition_at is None:
+                self.first_recognition_at = time.monotonic()
+                logger.info("첫 인식 성공: 시작 후 %.2f초", self.first_recognition_at - PROCESS_STARTED)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "phase": self.phase,
+            "error": self.error,
+            "timings": dict(self.timings),
+            "seconds_to_ready": round(self.ready_at - PROCESS_STARTED, 3) if self.ready_at else None,
+            "seconds_to_first_recognition": (round(self.first_recognition_at - PROCESS_STARTED, 3)
+                                             if self.first_recognition_at else None),
+        }
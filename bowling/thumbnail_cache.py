@@ -0,0 +1,184 @@
+import logging
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# 썸네일 크기 단계 (긴 변 기준 px)
+SIZE_BUCKETS = (160, 320, 640, 1280)
+
+# 지원 포맷: 요청 이름 -> (PIL 포맷, 확장자, MIME)
+FORMATS = {
+    "jpeg": ("JPEG", ".jpg", "image/jpeg"),
+    "webp": ("WEBP", ".webp", "image/webp"),
+}
+
+
+def snap_to_bucket(size: int) -> int:
+    """요청 크기를 그 이상인 가장 작은 단계로 맞춤 (캐시 종류 수 제한)"""
+    for bucket in SIZE_BUCKETS:
+        if size <= bucket:
+            return bucket
+    return SIZE_BUCKETS[-1]
+
+
+class ThumbnailCache:
+    """썸네일/WebP 파생 이미지 디스크 캐시
+
+    원본 경로 + mtime + 크기 + 단계 + 포맷으로 키를 만들고, 처음 요청될 때 한 번만 생성합니다.
+    키 해시는 그대로 강한 ETag로 사용하며, 전체 용량이 max_bytes를 넘으면 가장 오래 사용되지
+    않은 파일부터 삭제합니다 (LRU).
+    """
+
+    def __init__(self, source_dirs: Dict[str, str], cache_dir: str = "cache/thumbnails",
+                 max_bytes: int = 512 * 1024 * 1024, quality: int = 80):
+        self.source_dirs = source_dirs
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.quality = quality
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        # 캐시 파일명 -> 크기 (앞쪽이 가장 오래 사용되지 않은 항목)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_existing()
+        logger.info(f"ThumbnailCache 초기화 완료: {cache_dir} ({len(self._entries)}개, {self._total_bytes} bytes)")
+
+    def _load_existing(self):
+        """재시작 시 기존 캐시 파일을 접근 시각 순으로 LRU에 복원"""
+        existing = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    existing.append((stat.st_atime, entry.name, stat.st_size))
+        for _, name, size in sorted(existing):
+            self._entries[name] = size
+            self._total_bytes += size
+
+    def resolve_source(self, source: str, filename: str) -> Optional[str]:
+        """원본 파일 경로 확인 (디렉토리 탈출 방지)"""
+        source_dir = self.source_dirs.get(source)
+        if source_dir is None or os.path.basename(filename) != filename:
+            return None
+        path = os.path.join(source_dir, filename)
+        return path if os.path.isfile(path) else None
+
+    def _cache_key(self, source_path: str, bucket: int, fmt: str) -> str:
+        stat = os.stat(source_path)
+        raw = f"{source_path}|{stat.st_mtime_ns}|{stat.st_size}|{bucket}|{fmt}|{self.quality}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, source: str, filename: str, size: int = 320, fmt: str = "webp") -> Optional[Dict[str, Any]]:
+        """썸네일 파일 정보 반환 (없으면 생성). 원본이 없으면 None"""
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 포맷: {fmt}")
+        source_path = self.resolve_source(source, filename)
+        if source_path is None:
+            return None
+
+        bucket = snap_to_bucket(size)
+        key = self._cache_key(source_path, bucket, fmt)
+        _, ext, media_type = FORMATS[fmt]
+        cache_name = key + ext
+        cache_path = os.path.join(self.cache_dir, cache_name)
+
+        if not self._touch(cache_name):
+            # 같은 키를 동시에 생성하지 않도록 키 단위 잠금
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+            with key_lock:
+                if not self._touch(cache_name):
+                    self._generate(source_path, cache_path, bucket, fmt)
+                    self._register(cache_name, os.path.getsize(cache_path))
+            with self._lock:
+                self._key_locks.pop(key, None)
+
+        return {
+            "path": cache_path,
+            "cache_name": cache_name,
+            "etag": f'"{key}"',
+            "media_type": media_type,
+            "size": self._entries.get(cache_name, 0),
+        }
+
+    def _touch(self, cache_name: str) -> bool:
+        """캐시 적중 시 LRU 순서 갱신"""
+        with self._lock:
+            if cache_name not in self._entries:
+                return False
+            if not os.path.exists(os.path.join(self.cache_dir, cache_name)):
+                self._total_bytes -= self._entries.pop(cache_name)
+                return False
+            self._entries.move_to_end(cache_name)
+        return True
+
+    def _generate(self, source_path: str, cache_path: str, bucket: int, fmt: str):
+        """썸네일 생성 (임시 파일에 쓴 뒤 교체)"""
+        pil_format, _, _ = FORMATS[fmt]
+        with Image.open(source_path) as image:
+            image.draft("RGB", (bucket, bucket))
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.thumbnail((bucket, bucket))
+            tmp_path = cache_path + ".tmp"
+            image.save(tmp_path, pil_format, quality=self.quality)
+        os.replace(tmp_path, cache_path)
+        logger.info(f"썸네일 생성: {source_path} -> {cache_path}")
+
+    def _register(self, cache_name: str, size: int):
+        """새 캐시 항목 등록 후 용량 초과분 삭제"""
+        with self._lock:
+            if cache_name in self._entries:
+                self._entries.move_to_end(cache_name)
+                return
+            self._entries[cache_name] = size
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_name, old_size = self._entries.popitem(last=False)
+                self._total_bytes -= old_size
+                try:
+                    os.remove(os.path.join(self.cache_dir, old_name))
+                except FileNotFoundError:
+                    pass
+                logger.info(f"썸네일 캐시 제거 (LRU): {old_name}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._total_bytes, "max_bytes": self.max_bytes}
+
+
+def parse_range_header(range_header: Optional[str], file_size: int) -> Optional[Tuple[int, int]]:
+    """단일 Range 헤더 파싱 ("bytes=start-end")
+
+    문법이 틀렸거나 처리하지 않는 형식(여러 범위 등)이면 None (RFC 9110: Range 무시 후 전체 응답),
+    문법은 맞지만 파일 범위 밖이면 ValueError (416)
+    """
+    if not range_header:
+        return None
+    match = re.fullmatch(r"bytes=\s*([0-9]*)-([0-9]*)\s*", range_header)
+    if match is None:
+        return None
+    start_text, end_text = match.groups()
+    if start_text == "":
+        if end_text == "":
+            return None
+        # 접미사 범위: 마지막 N 바이트
+        length = int(end_text)
+        if length <= 0:
+            raise ValueError("range not satisfiable")
+        return max(0, file_size - length), file_size - 1
+    start = int(start_text)
+    end = int(end_text) if end_text else file_size - 1
+    if end_text and start > end:
+        return None
+    if start >= file_size:
+        raise ValueError("range not satisfiable")
+    return start, min(end, file_size - 1)